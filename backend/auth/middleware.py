@@ -3,6 +3,7 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional
 
 from auth.jwt import verify_token
+from config import settings
 from crud.user import get_user_by_id
 from models.user import UserInDB
 
@@ -68,4 +69,29 @@ async def get_current_user_optional(
     try:
         return await get_current_user(credentials)
     except HTTPException:
-        return None
\ No newline at end of file
+        return None
+
+
+async def get_current_admin(current_user: UserInDB = Depends(get_current_user)) -> UserInDB:
+    """
+    Dependency to require an administrator.
+    
+    Administrators are the users whose email is listed in ADMIN_EMAILS.
+    Roles are chosen at registration, so they are not used for this check.
+    
+    Args:
+        current_user: Current authenticated user
+        
+    Returns:
+        Current user if they are an administrator
+        
+    Raises:
+        HTTPException: If the user is not an administrator
+    """
+    if current_user.email.lower() not in settings.admin_emails_list:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Administrator access required"
+        )
+    
+    return current_user
\ No newline at end of file
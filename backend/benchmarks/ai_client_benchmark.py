@@ -0,0 +1,89 @@
+"""
+Per-request latency of the AI chat proxy's HTTP client strategies.
+
+Sends the same sequence of chat completion requests with a new AsyncClient
+per request (the old behaviour) and with one pooled keep-alive client, and
+reports the latency of each. By default the local mock completions server is
+started in-process; pass --url to target another endpoint. Against an HTTPS
+endpoint the saving also includes the TLS handshake.
+
+Usage:
+    python benchmarks/ai_client_benchmark.py [--requests 200] [--latency-ms 20]
+    python benchmarks/ai_client_benchmark.py --url https://example.test/v1
+"""
+import argparse
+import asyncio
+import importlib.util
+import statistics
+import time
+
+import httpx
+
+from mock_completions import start_in_thread
+
+PAYLOAD = {
+    "model": "gpt-3.5-turbo",
+    "messages": [{"role": "user", "content": "How do reserve studies work?"}],
+    "max_tokens": 500
+}
+
+
+def summarize(name: str, latencies: list[float]) -> None:
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"{name:<20}{statistics.mean(latencies) * 1000:>10.2f}"
+        f"{statistics.median(latencies) * 1000:>10.2f}{p95 * 1000:>10.2f}"
+    )
+
+
+async def per_request_client(url: str, count: int) -> list[float]:
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        async with httpx.AsyncClient() as client:
+            response = await client.post(f"{url}/chat/completions", json=PAYLOAD, timeout=30.0)
+            response.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def pooled_client(url: str, count: int, http2: bool) -> list[float]:
+    latencies = []
+    limits = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60.0)
+    async with httpx.AsyncClient(base_url=url, http2=http2, limits=limits, timeout=30.0) as client:
+        for _ in range(count):
+            start = time.perf_counter()
+            response = await client.post("/chat/completions", json=PAYLOAD)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def benchmark(url: str, count: int) -> None:
+    http2 = importlib.util.find_spec("h2") is not None
+
+    # Warm up the server before measuring
+    await pooled_client(url, 5, http2)
+
+    header = f"{'client':<20}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}"
+    print(header)
+    print("-" * len(header))
+    summarize("new per request", await per_request_client(url, count))
+    summarize(f"pooled{' (h2)' if http2 else ''}", await pooled_client(url, count, http2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per strategy")
+    parser.add_argument("--url", help="Completions API base URL (default: in-process mock)")
+    parser.add_argument("--port", type=int, default=8089, help="Port for the in-process mock")
+    parser.add_argument("--latency-ms", type=float, default=20, help="Mock server reply delay")
+    args = parser.parse_args()
+
+    url = args.url
+    if url is None:
+        start_in_thread(args.port, args.latency_ms)
+        url = f"http://127.0.0.1:{args.port}/v1"
+
+    asyncio.run(benchmark(url, args.requests))
@@ -0,0 +1,157 @@
+"""
+Load benchmark for the AI chat proxy.
+
+Drives /ai/chat at increasing concurrency and reports p50/p95/p99 latency,
+throughput and error rates, next to the same load sent straight to the
+completions endpoint. The difference between the two is the proxy overhead.
+
+By default both the local mock completions server and the backend are
+started in-process, with the backend pointed at the mock and the response
+cache, retrieval, tool calling and per-client rate limit turned off so every
+request reaches the upstream. The concurrency limiter stays on, so 503s show
+where admission control starts shedding load. Pass --proxy-url to target an
+already running backend instead (configure OPENAI_BASE_URL there yourself).
+
+Usage:
+    python benchmarks/ai_load_benchmark.py [--concurrency 1,4,16,64] [--requests 200]
+        [--latency-ms 200] [--tokens-per-second 0] [--rate-limit-rate 0] [--stream]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+import httpx
+import uvicorn
+
+from mock_completions import add_mock_arguments, get_mock_options, start_in_thread
+
+MESSAGE = "How do reserve studies work?"
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def start_backend(port: int, mock_url: str) -> None:
+    """Start the backend app on a background thread, pointed at the mock server."""
+    os.environ.update({
+        "OPENAI_BASE_URL": mock_url,
+        "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY") or "mock-key",
+        "AI_CACHE_ENABLED": "false",
+        "AI_RETRIEVAL_ENABLED": "false",
+        "AI_TOOLS_ENABLED": "false",
+        "AI_RATE_LIMIT_PER_MINUTE": "0"
+    })
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from main import app
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+
+async def send_request(client: httpx.AsyncClient, url: str, body: dict, stream: bool) -> tuple[float, int]:
+    start = time.perf_counter()
+    try:
+        if stream:
+            async with client.stream("POST", url, json=body) as response:
+                async for _ in response.aiter_bytes():
+                    pass
+        else:
+            response = await client.post(url, json=body)
+        status = response.status_code
+    except httpx.HTTPError:
+        status = 0
+    return time.perf_counter() - start, status
+
+
+async def run_level(url: str, body: dict, concurrency: int, count: int, stream: bool) -> tuple[list[float], Counter, float]:
+    """Send count requests with concurrency workers; return latencies, status counts and wall time."""
+    latencies = []
+    statuses = Counter()
+    remaining = iter(range(count))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=60.0) as client:
+        async def worker():
+            for _ in remaining:
+                latency, status = await send_request(client, url, body, stream)
+                latencies.append(latency)
+                statuses[status] += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return latencies, statuses, elapsed
+
+
+def report(target: str, concurrency: int, latencies: list[float], statuses: Counter, elapsed: float) -> float:
+    ordered = sorted(latencies)
+    errors = sum(count for status, count in statuses.items() if status != 200)
+    breakdown = ", ".join(f"{status or 'conn'}:{count}" for status, count in sorted(statuses.items()) if status != 200)
+    p50 = percentile(ordered, 0.5)
+    print(
+        f"{target:<8}{concurrency:>6}{len(latencies) / elapsed:>10.1f}"
+        f"{p50 * 1000:>10.1f}{percentile(ordered, 0.95) * 1000:>10.1f}{percentile(ordered, 0.99) * 1000:>10.1f}"
+        f"{errors / len(latencies) * 100:>9.1f}%  {breakdown}"
+    )
+    return p50
+
+
+async def benchmark(completions_url: str, proxy_url: str, levels: list[int], count: int, stream: bool) -> None:
+    direct_body = {
+        "model": "gpt-3.5-turbo",
+        "messages": [{"role": "user", "content": MESSAGE}],
+        "stream": stream
+    }
+    proxy_body = {"message": MESSAGE}
+    chat_path = "/ai/chat/stream" if stream else "/ai/chat"
+
+    # Warm up both paths before measuring
+    await run_level(f"{completions_url}/chat/completions", direct_body, 2, 4, stream)
+    await run_level(f"{proxy_url}{chat_path}", proxy_body, 2, 4, stream)
+
+    header = f"{'target':<8}{'conc':>6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>10}"
+    print(header)
+    print("-" * len(header))
+    for concurrency in levels:
+        direct_p50 = report(
+            "direct", concurrency,
+            *await run_level(f"{completions_url}/chat/completions", direct_body, concurrency, count, stream)
+        )
+        proxy_p50 = report(
+            "proxy", concurrency,
+            *await run_level(f"{proxy_url}{chat_path}", proxy_body, concurrency, count, stream)
+        )
+        print(f"{'':<8}{'':>6}  proxy overhead at p50: {(proxy_p50 - direct_p50) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", default="1,4,16,64", help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per level and target")
+    parser.add_argument("--stream", action="store_true", help="Use streamed completions (/ai/chat/stream)")
+    parser.add_argument("--proxy-url", help="Running backend to test (default: start one in-process)")
+    parser.add_argument("--mock-port", type=int, default=8089, help="Port for the in-process mock")
+    parser.add_argument("--backend-port", type=int, default=8090, help="Port for the in-process backend")
+    add_mock_arguments(parser)
+    parser.set_defaults(latency_ms=200)
+    args = parser.parse_args()
+
+    start_in_thread(args.mock_port, args.latency_ms, **get_mock_options(args))
+    completions_url = f"http://127.0.0.1:{args.mock_port}/v1"
+
+    proxy_url = args.proxy_url
+    if proxy_url is None:
+        start_backend(args.backend_port, completions_url)
+        proxy_url = f"http://127.0.0.1:{args.backend_port}"
+
+    levels = [int(level) for level in args.concurrency.split(",")]
+    asyncio.run(benchmark(completions_url, proxy_url.rstrip("/"), levels, args.requests, args.stream))
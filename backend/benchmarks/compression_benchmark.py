@@ -0,0 +1,96 @@
+"""
+Response compression benchmark for the list endpoints.
+
+Encodes a list response of --rows synthetic records for each list endpoint
+(as sent by FastJSONResponse) and compresses it with each response coding
+the app offers, reporting bytes on the wire, compression ratio and the
+time spent compressing one response.
+
+Usage:
+    python benchmarks/compression_benchmark.py [--rows 100] [--repeat 200]
+"""
+import argparse
+import sys
+import time
+import zlib
+from pathlib import Path
+
+from pydantic import TypeAdapter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from serialization_benchmark import ENDPOINTS  # noqa: E402
+from utils.json_response import FastJSONResponse  # noqa: E402
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+GZIP_WBITS = 31
+
+
+def gzip_codec(level: int):
+    def compress(data: bytes) -> bytes:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+        return compressor.compress(data) + compressor.flush()
+    return compress
+
+
+def brotli_codec(quality: int):
+    return lambda data: brotli.compress(data, quality=quality)
+
+
+def zstd_codec(level: int):
+    return zstandard.ZstdCompressor(level=level).compress
+
+
+def get_codecs() -> list[tuple]:
+    # Defaults from config.py first, then a cheaper and a stronger setting
+    codecs = [(f"gzip-{level}", gzip_codec(level)) for level in (6, 1, 9)]
+    if brotli is not None:
+        codecs += [(f"br-{quality}", brotli_codec(quality)) for quality in (4, 1, 9)]
+    else:
+        print("brotli not installed; skipping br")
+    if zstandard is not None:
+        codecs += [(f"zstd-{level}", zstd_codec(level)) for level in (3, 1, 9)]
+    else:
+        print("zstandard not installed; skipping zstd")
+    return codecs
+
+
+def benchmark(rows: int, repeat: int) -> None:
+    codecs = get_codecs()
+    header = f"{'endpoint':<16}{'codec':<9}{'raw KB':>9}{'wire KB':>9}{'ratio':>8}{'us/resp':>10}"
+    print(f"{rows} rows per response, mean of {repeat} runs")
+    print(header)
+    print("-" * len(header))
+
+    for name, build in ENDPOINTS.items():
+        response = build(rows)
+        body = FastJSONResponse(TypeAdapter(type(response)).dump_python(response, mode="json")).body
+
+        for codec_name, compress in codecs:
+            compressed = compress(body)
+            start = time.perf_counter()
+            for _ in range(repeat):
+                compress(body)
+            elapsed = (time.perf_counter() - start) / repeat
+            print(
+                f"{name:<16}{codec_name:<9}{len(body) / 1024:>9.1f}{len(compressed) / 1024:>9.1f}"
+                f"{len(body) / len(compressed):>7.1f}x{elapsed * 1e6:>10.0f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100, help="Records per list response")
+    parser.add_argument("--repeat", type=int, default=200, help="Timed runs per codec")
+    args = parser.parse_args()
+
+    benchmark(args.rows, args.repeat)
@@ -0,0 +1,171 @@
+"""
+Local mock of the OpenAI chat completions endpoint for benchmarks and load tests.
+
+Answers POST /v1/chat/completions with a canned reply, so the chat proxy can
+be exercised without network variance or API cost. The reply takes
+--latency-ms to start, then --reply-tokens words are produced at
+--tokens-per-second (0 means instantly). Requests with "stream": true get
+server-sent event chunks, one per word, ending with [DONE].
+
+A fraction of requests can be failed on purpose: --rate-limit-rate answers
+429 with Retry-After, as the real API does when quota is exceeded, and
+--error-rate answers 500.
+
+Point the backend at it with OPENAI_BASE_URL=http://127.0.0.1:8089/v1.
+
+Usage:
+    python benchmarks/mock_completions.py [--port 8089] [--latency-ms 50]
+        [--tokens-per-second 0] [--reply-tokens 60] [--rate-limit-rate 0] [--error-rate 0]
+"""
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+
+import uvicorn
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+
+MOCK_WORDS = (
+    "Reserve studies estimate the remaining life and replacement cost of common-area components, "
+    "so the board can plan contributions to the reserve fund instead of relying on special assessments."
+).split()
+
+
+@dataclass
+class MockOptions:
+    """Behaviour of the mock server, adjustable while it runs."""
+
+    latency: float = 0.05  # Seconds before the first token
+    tokens_per_second: float = 0  # Token generation rate (0 sends the reply at once)
+    reply_tokens: int = 60  # Words in each reply
+    rate_limit_rate: float = 0  # Fraction of requests answered with 429
+    error_rate: float = 0  # Fraction of requests answered with 500
+
+
+app = FastAPI(title="Mock completions")
+app.state.options = MockOptions()
+
+
+def build_reply_words(count: int) -> list[str]:
+    return [MOCK_WORDS[index % len(MOCK_WORDS)] for index in range(count)]
+
+
+def injected_error(options: MockOptions):
+    """Pick an injected failure response for this request, if any."""
+    roll = random.random()
+    if roll < options.rate_limit_rate:
+        return JSONResponse(
+            status_code=429,
+            content={"error": {"message": "Rate limit reached (mock)", "type": "requests"}},
+            headers={"Retry-After": "1"}
+        )
+    if roll < options.rate_limit_rate + options.error_rate:
+        return JSONResponse(
+            status_code=500,
+            content={"error": {"message": "Internal error (mock)", "type": "server_error"}}
+        )
+    return None
+
+
+def build_chunk(model: str, delta: dict, finish_reason: str = None) -> str:
+    chunk = {
+        "id": "chatcmpl-mock",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+    }
+    return f"data: {json.dumps(chunk)}\n\n"
+
+
+async def stream_reply(model: str, words: list[str], tokens_per_second: float):
+    yield build_chunk(model, {"role": "assistant", "content": ""})
+    for index, word in enumerate(words):
+        if tokens_per_second > 0:
+            await asyncio.sleep(1 / tokens_per_second)
+        yield build_chunk(model, {"content": word if index == 0 else f" {word}"})
+    yield build_chunk(model, {}, finish_reason="stop")
+    yield "data: [DONE]\n\n"
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(body: dict):
+    options: MockOptions = app.state.options
+    model = body.get("model", "mock")
+
+    await asyncio.sleep(options.latency)
+    error = injected_error(options)
+    if error is not None:
+        return error
+
+    words = build_reply_words(options.reply_tokens)
+    if body.get("stream"):
+        return StreamingResponse(
+            stream_reply(model, words, options.tokens_per_second),
+            media_type="text/event-stream"
+        )
+
+    if options.tokens_per_second > 0:
+        await asyncio.sleep(len(words) / options.tokens_per_second)
+    return {
+        "id": "chatcmpl-mock",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": " ".join(words)},
+            "finish_reason": "stop"
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": len(words), "total_tokens": len(words)}
+    }
+
+
+def start_in_thread(port: int, latency_ms: float, **options) -> uvicorn.Server:
+    """
+    Start the mock server on a background thread and wait until it is listening.
+
+    Args:
+        port: Port to listen on (127.0.0.1)
+        latency_ms: Delay before each reply
+        **options: Other MockOptions fields (tokens_per_second, error_rate, ...)
+    """
+    app.state.options = MockOptions(latency=latency_ms / 1000, **options)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def add_mock_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the mock behaviour options to a command-line parser."""
+    parser.add_argument("--latency-ms", type=float, default=50, help="Delay before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=0, help="Token rate (0 sends replies at once)")
+    parser.add_argument("--reply-tokens", type=int, default=60, help="Words per reply")
+    parser.add_argument("--rate-limit-rate", type=float, default=0, help="Fraction of requests answered with 429")
+    parser.add_argument("--error-rate", type=float, default=0, help="Fraction of requests answered with 500")
+
+
+def get_mock_options(args: argparse.Namespace) -> dict:
+    """Collect start_in_thread keyword options from parsed arguments."""
+    return {
+        "tokens_per_second": args.tokens_per_second,
+        "reply_tokens": args.reply_tokens,
+        "rate_limit_rate": args.rate_limit_rate,
+        "error_rate": args.error_rate
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8089)
+    add_mock_arguments(parser)
+    args = parser.parse_args()
+
+    app.state.options = MockOptions(latency=args.latency_ms / 1000, **get_mock_options(args))
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
@@ -0,0 +1,153 @@
+"""
+Per-row cost of the list endpoints' read path, before and after removing
+repeated model validation.
+
+For each list endpoint, a page of synthetic Mongo documents goes through:
+
+- before: validate into the *InDB model, copy field by field into a new
+  *Response model (validated again), then FastAPI dumps the list response
+  and validates it against response_model once more before encoding
+- after: build the *InDB and *Response models with model_construct and
+  encode the list response directly (utils.json_response.model_response)
+
+JSON encoding itself is identical in both paths and left out.
+
+Usage:
+    python benchmarks/read_path_benchmark.py [--rows 100] [--repeat 200]
+"""
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from pydantic import TypeAdapter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models.document import DocumentInDB, DocumentListResponse, DocumentResponse  # noqa: E402
+from models.expense import ExpenseInDB, ExpenseListResponse, ExpenseResponse  # noqa: E402
+from models.income import IncomeInDB, IncomeListResponse, IncomeResponse  # noqa: E402
+from models.project import ProjectInDB, ProjectListResponse, ProjectResponse  # noqa: E402
+from models.proposal import ProposalInDB, ProposalListResponse, ProposalResponse  # noqa: E402
+from utils.json_response import to_response_model  # noqa: E402
+
+NOW = datetime(2024, 6, 1, 12, 30, 15, 123456)
+OBJECT_ID = "665b1f0e9d1c4a2b3c4d5e6f"
+
+
+def expense_doc(index: int) -> dict:
+    return {
+        "_id": OBJECT_ID, "date": "2024-05-01", "amount": 1234.56 + index, "category": "Maintenance",
+        "vendor": "Green Lawn Services", "description": f"Monthly landscaping service #{index}",
+        "projectId": OBJECT_ID, "receiptUrl": f"/uploads/receipts/{index}.jpg",
+        "createdBy": OBJECT_ID, "createdAt": NOW - timedelta(hours=index)
+    }
+
+
+def income_doc(index: int) -> dict:
+    return {
+        "_id": OBJECT_ID, "date": "2024-05-01", "amount": 350.0 + index, "source": "Dues",
+        "description": f"Quarterly dues, unit {index}", "createdBy": OBJECT_ID,
+        "createdAt": NOW - timedelta(hours=index)
+    }
+
+
+def project_doc(index: int) -> dict:
+    return {
+        "_id": OBJECT_ID, "name": f"Pool resurfacing {index}", "description": "Resurface and retile the pool",
+        "status": "Planned", "budget": 45000.0 + index, "startDate": "2024-07-01", "endDate": "2024-08-15",
+        "assignedVendorId": None, "createdBy": OBJECT_ID, "createdAt": NOW, "updatedAt": NOW, "archivedAt": None
+    }
+
+
+def proposal_doc(index: int) -> dict:
+    return {
+        "_id": OBJECT_ID, "projectId": OBJECT_ID, "vendorName": f"Blue Water Pools {index}",
+        "bidAmount": 42000.0 + index, "timeline": "6 weeks", "warranty": "2 years",
+        "scopeSummary": "Drain, resurface, retile and refill the pool", "status": "Pending",
+        "fileUrl": f"/uploads/proposals/{index}.pdf", "thumbnailUrl": None, "uploadedBy": OBJECT_ID,
+        "createdAt": NOW, "updatedAt": NOW, "archivedAt": None
+    }
+
+
+def document_doc(index: int) -> dict:
+    return {
+        "_id": OBJECT_ID, "title": f"Board meeting minutes {index}", "category": "Meeting Minutes",
+        "description": "Minutes of the monthly board meeting", "fileUrl": f"/uploads/documents/{index}.pdf",
+        "fileType": "pdf", "fileSize": 2516582, "thumbnailUrl": None, "uploadedBy": OBJECT_ID,
+        "createdAt": NOW, "updatedAt": NOW, "archivedAt": None
+    }
+
+
+def document_overrides(record: DocumentInDB) -> dict:
+    # The route formats fileSize for display; a fixed string keeps settings out of the benchmark
+    return {"fileSize": "2.4 MB", "fileSizeBytes": record.fileSize}
+
+
+# endpoint: (document factory, stored model, response model, list model, list field, response overrides)
+ENDPOINTS = {
+    "GET /expenses": (expense_doc, ExpenseInDB, ExpenseResponse, ExpenseListResponse, "expenses", None),
+    "GET /income": (income_doc, IncomeInDB, IncomeResponse, IncomeListResponse, "income", None),
+    "GET /projects": (project_doc, ProjectInDB, ProjectResponse, ProjectListResponse, "projects", None),
+    "GET /proposals": (proposal_doc, ProposalInDB, ProposalResponse, ProposalListResponse, "proposals", None),
+    "GET /documents": (document_doc, DocumentInDB, DocumentResponse, DocumentListResponse, "documents", document_overrides),
+}
+
+
+def time_per_call(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def benchmark(rows: int, repeat: int) -> None:
+    header = f"{'endpoint':<16}{'before us/row':>15}{'after us/row':>15}{'speedup':>10}"
+    print(f"{rows} rows per page, mean of {repeat} runs")
+    print(header)
+    print("-" * len(header))
+
+    for name, (make_doc, stored_model, response_model, list_model, field, overrides) in ENDPOINTS.items():
+        docs = [make_doc(index) for index in range(rows)]
+        list_adapter = TypeAdapter(list_model)
+        response_fields = list(response_model.model_fields)
+
+        def before():
+            records = [stored_model(**dict(doc)) for doc in docs]
+            responses = []
+            for record in records:
+                values = {key: getattr(record, key) for key in response_fields if hasattr(record, key)}
+                values.update(overrides(record) if overrides else {})
+                responses.append(response_model(**values))
+            page = list_model(**{field: responses, "total": rows})
+            # FastAPI: dump the returned model, validate against response_model, serialize
+            validated = list_adapter.validate_python(page.model_dump(by_alias=True))
+            return list_adapter.dump_python(validated, mode="json")
+
+        def after():
+            records = [stored_model.model_construct(**dict(doc)) for doc in docs]
+            page = list_model.model_construct(**{
+                field: [
+                    to_response_model(response_model, record, **(overrides(record) if overrides else {}))
+                    for record in records
+                ],
+                "total": rows
+            })
+            return page.model_dump(mode="json")
+
+        # Both paths must produce the same response
+        assert before() == after()
+
+        before_time = time_per_call(before, repeat) / rows
+        after_time = time_per_call(after, repeat) / rows
+        print(f"{name:<16}{before_time * 1e6:>15.2f}{after_time * 1e6:>15.2f}{before_time / after_time:>9.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100, help="Records per page")
+    parser.add_argument("--repeat", type=int, default=200, help="Timed runs per endpoint")
+    args = parser.parse_args()
+
+    benchmark(args.rows, args.repeat)
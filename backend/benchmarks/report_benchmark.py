@@ -0,0 +1,99 @@
+"""
+Ledger report throughput benchmark.
+
+Feeds --rows synthetic ledger rows (a mix of income and expenses, as
+crud.report.iter_ledger_rows yields them) through the CSV writer and the
+write-only XLSX writer, and reports rows written per second and output
+size. With --trace-memory, a second run reports peak traced memory (tracing
+slows the writers down considerably). No database is needed.
+
+Usage:
+    python benchmarks/report_benchmark.py [--rows 100000] [--batch 1000] [--trace-memory]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# The report writers read settings; the benchmark never connects to the database
+os.environ.setdefault("MONGODB_URI", "mongodb://localhost:27017/benchmark")
+os.environ.setdefault("JWT_SECRET", "benchmark")
+
+from openpyxl import LXML  # noqa: E402
+
+from utils.ledger_report import iter_ledger_csv, write_ledger_xlsx  # noqa: E402
+
+START = date(2024, 1, 1)
+
+
+async def ledger_rows(count: int):
+    for index in range(count):
+        row_date = (START + timedelta(days=index * 365 // max(count, 1))).isoformat()
+        if index % 4 == 0:
+            yield {
+                "date": row_date, "type": "Income", "category": "Dues", "vendor": None,
+                "description": f"Quarterly dues, unit {index % 300}", "amount": 350.0
+            }
+        else:
+            yield {
+                "date": row_date, "type": "Expense", "category": "Maintenance", "vendor": "Green Lawn Services",
+                "description": f"Monthly landscaping service #{index}", "amount": 1234.56 + index % 100
+            }
+
+
+async def run_csv(rows: int, batch: int) -> int:
+    size = 0
+    async for chunk in iter_ledger_csv(ledger_rows(rows), batch):
+        size += len(chunk)
+    return size
+
+
+async def run_xlsx(rows: int, batch: int) -> int:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "ledger.xlsx"
+        await write_ledger_xlsx(ledger_rows(rows), path, batch)
+        return path.stat().st_size
+
+
+def measure(name: str, runner, rows: int, batch: int, trace_memory: bool) -> None:
+    start = time.perf_counter()
+    size = asyncio.run(runner(rows, batch))
+    elapsed = time.perf_counter() - start
+
+    peak = ""
+    if trace_memory:
+        tracemalloc.start()
+        asyncio.run(runner(rows, batch))
+        peak = f"{tracemalloc.get_traced_memory()[1] / 1e6:.1f}"
+        tracemalloc.stop()
+
+    print(f"{name:<6}{rows / elapsed:>12,.0f}{elapsed:>10.2f}{size / 1e6:>10.1f}{peak:>12}")
+
+
+def benchmark(rows: int, batch: int, trace_memory: bool) -> None:
+    if not LXML:
+        print("lxml is not installed: openpyxl falls back to a slower XML writer\n")
+
+    header = f"{'format':<6}{'rows/sec':>12}{'seconds':>10}{'size MB':>10}{'peak mem MB':>12}"
+    print(f"{rows:,} rows, batches of {batch}")
+    print(header)
+    print("-" * len(header))
+    measure("csv", run_csv, rows, batch, trace_memory)
+    measure("xlsx", run_xlsx, rows, batch, trace_memory)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000, help="Ledger rows to write")
+    parser.add_argument("--batch", type=int, default=1000, help="Rows per batch (EXPORT_BATCH_SIZE)")
+    parser.add_argument("--trace-memory", action="store_true", help="Also report peak traced memory (slow)")
+    args = parser.parse_args()
+
+    benchmark(args.rows, args.batch, args.trace_memory)
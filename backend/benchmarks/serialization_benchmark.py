@@ -0,0 +1,144 @@
+"""
+Response serialization benchmark for the list endpoints.
+
+Builds a list response of --rows synthetic records for each list endpoint
+and times what FastAPI does after the handler returns: converting the
+response model to JSON-compatible data (pydantic JSON mode), then encoding
+it to bytes. The encoding step is timed with Starlette's default
+JSONResponse (before) and the app's FastJSONResponse (after, orjson).
+
+Usage:
+    python benchmarks/serialization_benchmark.py [--rows 100] [--repeat 500]
+"""
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models.document import DocumentListResponse, DocumentResponse  # noqa: E402
+from models.expense import ExpenseListResponse, ExpenseResponse  # noqa: E402
+from models.income import IncomeListResponse, IncomeResponse  # noqa: E402
+from models.project import ProjectListResponse, ProjectResponse  # noqa: E402
+from models.proposal import ProposalListResponse, ProposalResponse  # noqa: E402
+from utils.json_response import FastJSONResponse, orjson  # noqa: E402
+
+NOW = datetime(2024, 6, 1, 12, 30, 15, 123456)
+OBJECT_ID = "665b1f0e9d1c4a2b3c4d5e6f"
+
+
+def row_time(index: int) -> datetime:
+    return NOW - timedelta(hours=index)
+
+
+def build_expenses(rows: int) -> ExpenseListResponse:
+    return ExpenseListResponse(expenses=[
+        ExpenseResponse(
+            id=OBJECT_ID, date="2024-05-01", amount=1234.56 + index, category="Maintenance",
+            vendor="Green Lawn Services", description=f"Monthly landscaping service #{index}",
+            projectId=OBJECT_ID, receiptUrl=f"/uploads/receipts/{index}.jpg",
+            createdBy=OBJECT_ID, createdAt=row_time(index)
+        )
+        for index in range(rows)
+    ], total=rows)
+
+
+def build_income(rows: int) -> IncomeListResponse:
+    return IncomeListResponse(income=[
+        IncomeResponse(
+            id=OBJECT_ID, date="2024-05-01", amount=350.0 + index, source="Dues",
+            description=f"Quarterly dues, unit {index}", createdBy=OBJECT_ID, createdAt=row_time(index)
+        )
+        for index in range(rows)
+    ], total=rows)
+
+
+def build_projects(rows: int) -> ProjectListResponse:
+    return ProjectListResponse(projects=[
+        ProjectResponse(
+            id=OBJECT_ID, name=f"Pool resurfacing {index}", description="Resurface and retile the community pool",
+            status="Planned", budget=45000.0 + index, startDate="2024-07-01", endDate="2024-08-15",
+            createdBy=OBJECT_ID, createdAt=row_time(index), updatedAt=row_time(index)
+        )
+        for index in range(rows)
+    ], total=rows)
+
+
+def build_proposals(rows: int) -> ProposalListResponse:
+    return ProposalListResponse(proposals=[
+        ProposalResponse(
+            id=OBJECT_ID, projectId=OBJECT_ID, vendorName=f"Blue Water Pools {index}", bidAmount=42000.0 + index,
+            timeline="6 weeks", warranty="2 years", scopeSummary="Drain, resurface, retile and refill the pool",
+            fileUrl=f"/uploads/proposals/{index}.pdf", uploadedBy=OBJECT_ID,
+            createdAt=row_time(index), updatedAt=row_time(index)
+        )
+        for index in range(rows)
+    ], total=rows)
+
+
+def build_documents(rows: int) -> DocumentListResponse:
+    return DocumentListResponse(documents=[
+        DocumentResponse(
+            id=OBJECT_ID, title=f"Board meeting minutes {index}", category="Meeting Minutes",
+            description="Minutes of the monthly board meeting", fileUrl=f"/uploads/documents/{index}.pdf",
+            fileType="pdf", fileSize="2.4 MB", fileSizeBytes=2516582, uploadedBy=OBJECT_ID,
+            createdAt=row_time(index), updatedAt=row_time(index)
+        )
+        for index in range(rows)
+    ], total=rows)
+
+
+ENDPOINTS = {
+    "GET /expenses": build_expenses,
+    "GET /income": build_income,
+    "GET /projects": build_projects,
+    "GET /proposals": build_proposals,
+    "GET /documents": build_documents,
+}
+
+
+def time_per_call(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def benchmark(rows: int, repeat: int) -> None:
+    if orjson is None:
+        print("orjson is not installed: FastJSONResponse falls back to the standard library encoder\n")
+
+    header = f"{'endpoint':<16}{'to json us':>12}{'before us':>12}{'after us':>12}{'encode x':>10}{'total x':>10}"
+    print(f"{rows} rows per response, mean of {repeat} runs")
+    print(header)
+    print("-" * len(header))
+
+    for name, build in ENDPOINTS.items():
+        response = build(rows)
+        adapter = TypeAdapter(type(response))
+        content = adapter.dump_python(response, mode="json")
+
+        # Before and after must produce the same document
+        assert JSONResponse(content).body == FastJSONResponse(content).body
+
+        dump = time_per_call(lambda: adapter.dump_python(response, mode="json"), repeat)
+        before = time_per_call(lambda: JSONResponse(content), repeat)
+        after = time_per_call(lambda: FastJSONResponse(content), repeat)
+        print(
+            f"{name:<16}{dump * 1e6:>12.1f}{before * 1e6:>12.1f}{after * 1e6:>12.1f}"
+            f"{before / after:>10.2f}{(dump + before) / (dump + after):>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100, help="Records per list response")
+    parser.add_argument("--repeat", type=int, default=500, help="Timed runs per endpoint")
+    args = parser.parse_args()
+
+    benchmark(args.rows, args.repeat)
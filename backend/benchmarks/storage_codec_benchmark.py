@@ -0,0 +1,90 @@
+"""
+Per-file-type benchmark for the storage compression codecs.
+
+Compresses every file under a directory (by default the upload directory)
+with each available codec and level, and reports the compression ratio and
+the CPU cost of compressing and decompressing, grouped by file extension.
+
+Usage:
+    python benchmarks/storage_codec_benchmark.py [directory] [--levels 1,3,6]
+"""
+import argparse
+import gzip
+import time
+from collections import defaultdict
+from pathlib import Path
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def gzip_codec(level: int):
+    return (
+        lambda data: gzip.compress(data, compresslevel=level),
+        gzip.decompress
+    )
+
+
+def zstd_codec(level: int):
+    compressor = zstandard.ZstdCompressor(level=level)
+    decompressor = zstandard.ZstdDecompressor()
+    return compressor.compress, decompressor.decompress
+
+
+def benchmark(directory: Path, levels: list[int]) -> None:
+    files_by_type: dict[str, list[Path]] = defaultdict(list)
+    for path in directory.rglob("*"):
+        if path.is_file() and ".thumb." not in path.name:
+            files_by_type[path.suffix.lstrip(".").lower() or "(none)"].append(path)
+
+    if not files_by_type:
+        print(f"No files found under {directory}")
+        return
+
+    codecs = [(f"gzip-{level}", gzip_codec(min(level, 9))) for level in levels]
+    if zstandard is not None:
+        codecs += [(f"zstd-{level}", zstd_codec(level)) for level in levels]
+    else:
+        print("zstandard not installed; reporting gzip only\n")
+
+    header = f"{'type':<8}{'files':>7}{'size MB':>10}  {'codec':<9}{'ratio':>7}{'comp MB/s':>11}{'decomp MB/s':>13}{'CPU s':>8}"
+    print(header)
+    print("-" * len(header))
+
+    for extension, paths in sorted(files_by_type.items()):
+        payloads = [path.read_bytes() for path in paths]
+        original = sum(len(data) for data in payloads)
+        if original == 0:
+            continue
+
+        for name, (compress, decompress) in codecs:
+            start = time.process_time()
+            compressed = [compress(data) for data in payloads]
+            compress_cpu = time.process_time() - start
+
+            start = time.process_time()
+            for data in compressed:
+                decompress(data)
+            decompress_cpu = time.process_time() - start
+
+            stored = sum(len(data) for data in compressed)
+            megabytes = original / (1024 * 1024)
+            print(
+                f"{extension:<8}{len(paths):>7}{megabytes:>10.2f}  {name:<9}"
+                f"{original / stored:>7.2f}"
+                f"{megabytes / max(compress_cpu, 1e-9):>11.1f}"
+                f"{megabytes / max(decompress_cpu, 1e-9):>13.1f}"
+                f"{compress_cpu + decompress_cpu:>8.3f}"
+            )
+        print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", nargs="?", default="./uploads", help="Directory of sample files")
+    parser.add_argument("--levels", default="1,3,6", help="Comma-separated compression levels")
+    args = parser.parse_args()
+
+    benchmark(Path(args.directory), [int(level) for level in args.levels.split(",")])
@@ -9,10 +9,72 @@ class Settings(BaseSettings):
     mongodb_uri: str
     jwt_secret: str
     jwt_expires_in: int = 86400
+    admin_emails: str = ""  # Comma-separated emails of users allowed to run admin operations
     cors_origins: str = "http://localhost:3000"
     upload_dir: str = "./uploads"
     max_file_size: int = 10485760  # 10MB in bytes
+    storage_backend: str = "local"  # local or s3
+    storage_shard_depth: int = 2  # Subdirectory levels for local files (0 stores them flat)
+    s3_bucket: str = ""
+    s3_prefix: str = ""  # Key prefix inside the bucket (e.g., "uploads/")
+    s3_endpoint_url: str = ""  # S3-compatible endpoint, e.g. a local MinIO (empty uses AWS)
+    s3_region: str = ""
+    s3_access_key_id: str = ""
+    s3_secret_access_key: str = ""
+    upload_staging_dir: str = "./uploads/.staging"  # Partial chunked uploads
+    upload_chunk_max_size: int = 8388608  # 8MB per chunk
+    upload_session_ttl: int = 86400  # Seconds before an unfinished upload expires
+    thumbnail_max_size: int = 320  # Longest thumbnail edge in pixels
+    thumbnail_format: str = "webp"  # webp or jpeg (jpeg is used if WebP is unavailable)
+    thumbnail_quality: int = 75
+    thumbnail_workers: int = 2
+    text_extraction_workers: int = 2
+    document_text_max_chars: int = 1000000  # Extracted text kept per document
+    receipt_max_dimension: int = 1600  # Longest receipt image edge in pixels
+    receipt_jpeg_quality: int = 80
+    receipt_keep_original: bool = False  # Keep the untouched upload as <name>.orig.<ext>
+    receipt_workers: int = 2
+    storage_compression: str = ""  # zstd or gzip to compress stored files ("" disables)
+    storage_compression_level: int = 3
+    storage_compression_types: str = "pdf,doc,xls"  # Extensions stored compressed
+    storage_compression_workers: int = 2  # Threads compressing uploads
+    response_compression: str = "zstd,br,gzip"  # Response codings offered, in order of preference ("" disables)
+    response_compression_min_size: int = 1024  # Smaller responses are sent uncompressed
+    response_gzip_level: int = 6  # 1-9
+    response_brotli_quality: int = 4  # 0-11
+    response_zstd_level: int = 3  # 1-22
+    export_batch_size: int = 1000  # Records fetched per database round trip by streaming exports
+    report_workers: int = 2  # Threads writing XLSX reports
+    upload_gc_interval: int = 0  # Seconds between orphaned upload sweeps (0 disables)
+    upload_gc_grace_period: int = 86400  # Minimum file age in seconds before it can be reclaimed
+    upload_gc_archived_retention_days: int = 0  # Reclaim files of records archived this long ago (0 keeps them)
     openai_api_key: str = ""  # OpenAI API key for chatbot
+    openai_base_url: str = "https://api.openai.com/v1"  # Completions API root (e.g., a local mock for load tests)
+    ai_http2: bool = True  # Use HTTP/2 to the completions API when h2 is installed
+    ai_http_max_connections: int = 20
+    ai_http_max_keepalive_connections: int = 10
+    ai_http_keepalive_expiry: float = 60.0  # Seconds an idle pooled connection is kept
+    ai_http_connect_timeout: float = 5.0
+    ai_http_read_timeout: float = 30.0
+    ai_cache_enabled: bool = True  # Reuse replies to repeated chat prompts
+    ai_cache_max_entries: int = 1000  # In-memory LRU size
+    ai_cache_ttl: int = 86400  # Seconds a cached reply is served
+    ai_cache_mongo: bool = False  # Also share cached replies through MongoDB
+    ai_retrieval_enabled: bool = True  # Add relevant HOA records to chat prompts
+    ai_retrieval_top_k: int = 5  # Snippets considered per question
+    ai_retrieval_token_budget: int = 800  # Approximate prompt tokens spent on snippets
+    ai_retrieval_rebuild_interval: int = 900  # Seconds between full index rebuilds
+    ai_tools_enabled: bool = True  # Let the model call aggregation functions for exact figures
+    ai_tool_max_rounds: int = 3  # Tool-calling rounds before the model must answer
+    ai_tool_cache_ttl: int = 60  # Seconds a tool result is reused
+    ai_conversation_token_budget: int = 1500  # Approximate prompt tokens spent on conversation history
+    ai_conversation_summary_max_tokens: int = 300  # Length of a conversation's rolling summary
+    ai_max_concurrent_requests: int = 8  # Upstream AI calls in flight per process
+    ai_max_queued_requests: int = 16  # Requests waiting for a slot before 503s
+    ai_queue_timeout: float = 10.0  # Seconds a request may wait for a slot
+    ai_rate_limit_per_minute: int = 20  # Sustained AI requests per client (0 disables)
+    ai_rate_limit_burst: int = 5  # AI requests a client may send back to back
+    ai_trust_forwarded_for: bool = False  # Identify clients by X-Forwarded-For (behind a proxy)
     
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -24,6 +86,11 @@ class Settings(BaseSettings):
     def cors_origins_list(self) -> list[str]:
         """Parse CORS origins from comma-separated string."""
         return [origin.strip() for origin in self.cors_origins.split(",")]
+    
+    @property
+    def admin_emails_list(self) -> list[str]:
+        """Parse admin emails from comma-separated string."""
+        return [email.strip().lower() for email in self.admin_emails.split(",") if email.strip()]
 
 
 # Global settings instance
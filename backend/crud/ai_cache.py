@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+from typing import Optional
+import logging
+
+import database as db_module
+
+logger = logging.getLogger(__name__)
+
+
+async def ensure_ai_cache_index() -> None:
+    """Create the TTL index that expires cached AI responses."""
+    if db_module.database is None:
+        return
+
+    try:
+        await db_module.database.ai_response_cache.create_index(
+            "expiresAt",
+            name="ai_response_cache_ttl",
+            expireAfterSeconds=0
+        )
+    except Exception as e:
+        logger.warning(f"Failed to create AI response cache index: {e}")
+
+
+async def get_cached_response(cache_key: str) -> Optional[tuple[str, datetime]]:
+    """
+    Get a stored AI response.
+
+    Args:
+        cache_key: Prompt cache key
+
+    Returns:
+        Tuple of (response message, expiry time), or None if missing or expired
+    """
+    doc = await db_module.database.ai_response_cache.find_one(
+        # The TTL monitor only runs periodically, so filter expired entries too
+        {"_id": cache_key, "expiresAt": {"$gt": datetime.utcnow()}},
+        {"message": 1, "expiresAt": 1}
+    )
+    return (doc["message"], doc["expiresAt"]) if doc else None
+
+
+async def save_cached_response(cache_key: str, message: str, ttl: int) -> None:
+    """
+    Store an AI response, replacing any previous entry for the key.
+
+    Args:
+        cache_key: Prompt cache key
+        message: Response message
+        ttl: Seconds until the entry expires
+    """
+    now = datetime.utcnow()
+    await db_module.database.ai_response_cache.replace_one(
+        {"_id": cache_key},
+        {
+            "_id": cache_key,
+            "message": message,
+            "createdAt": now,
+            "expiresAt": now + timedelta(seconds=ttl)
+        },
+        upsert=True
+    )
+
+
+async def purge_cached_responses() -> int:
+    """
+    Delete every stored AI response.
+
+    Returns:
+        Number of entries deleted
+    """
+    result = await db_module.database.ai_response_cache.delete_many({})
+    return result.deleted_count
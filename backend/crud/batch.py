@@ -0,0 +1,36 @@
+from typing import Optional
+
+from bson import ObjectId
+
+import database as db_module
+
+
+async def find_by_ids(collection_name: str, record_ids: list[str], projection: Optional[dict] = None) -> dict[str, dict]:
+    """
+    Read several records by ID with a single $in query.
+
+    Args:
+        collection_name: Collection to read from
+        record_ids: Record IDs (invalid and duplicate IDs are allowed)
+        projection: Mongo projection limiting the fields read (all fields if None)
+
+    Returns:
+        Dict of requested record ID (as sent, e.g. in upper case) to document
+        (with _id as a string); missing IDs are absent
+    """
+    # Requested spellings per ObjectId, so results map back to the IDs as sent
+    requested: dict[ObjectId, list[str]] = {}
+    for record_id in dict.fromkeys(record_ids):
+        if ObjectId.is_valid(record_id):
+            requested.setdefault(ObjectId(record_id), []).append(record_id)
+    if not requested:
+        return {}
+
+    docs = {}
+    cursor = db_module.database[collection_name].find({"_id": {"$in": list(requested)}}, projection)
+    async for doc in cursor:
+        object_id = doc["_id"]
+        doc["_id"] = str(object_id)
+        for record_id in requested.get(object_id, []):
+            docs[record_id] = doc
+    return docs
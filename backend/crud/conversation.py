@@ -0,0 +1,210 @@
+from datetime import datetime
+from typing import Optional
+import logging
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, ReturnDocument
+
+import database as db_module
+from models.conversation import ConversationInDB
+
+logger = logging.getLogger(__name__)
+
+
+async def ensure_conversation_indexes() -> None:
+    """Create the indexes used to list conversations and read their message logs."""
+    if db_module.database is None:
+        return
+
+    try:
+        await db_module.database.ai_conversations.create_index(
+            [("userId", ASCENDING), ("updatedAt", DESCENDING)],
+            name="ai_conversations_user"
+        )
+        await db_module.database.ai_messages.create_index(
+            [("conversationId", ASCENDING), ("seq", ASCENDING)],
+            name="ai_messages_conversation_seq",
+            unique=True
+        )
+    except Exception as e:
+        logger.warning(f"Failed to create AI conversation indexes: {e}")
+
+
+def _to_conversation(doc: dict) -> ConversationInDB:
+    doc["_id"] = str(doc["_id"])
+    return ConversationInDB(**doc)
+
+
+async def create_conversation(user_id: str, title: str) -> ConversationInDB:
+    """
+    Start a new conversation.
+
+    Args:
+        user_id: ID of the user who owns the conversation
+        title: Conversation title (usually the first message, shortened)
+
+    Returns:
+        Created conversation from database
+    """
+    now = datetime.utcnow()
+    conversation_dict = {
+        "userId": user_id,
+        "title": title,
+        "summary": "",
+        "summarizedThrough": -1,
+        "messageCount": 0,
+        "createdAt": now,
+        "updatedAt": now
+    }
+
+    result = await db_module.database.ai_conversations.insert_one(conversation_dict)
+    conversation_dict["_id"] = result.inserted_id
+
+    return _to_conversation(conversation_dict)
+
+
+async def get_conversation(conversation_id: str, user_id: Optional[str] = None) -> Optional[ConversationInDB]:
+    """
+    Get a conversation by ID.
+
+    Args:
+        conversation_id: Conversation ID
+        user_id: Only return the conversation if this user owns it
+
+    Returns:
+        Conversation if found, None otherwise
+    """
+    if not ObjectId.is_valid(conversation_id):
+        return None
+
+    query = {"_id": ObjectId(conversation_id)}
+    if user_id is not None:
+        query["userId"] = user_id
+
+    doc = await db_module.database.ai_conversations.find_one(query)
+    return _to_conversation(doc) if doc else None
+
+
+async def get_conversations(user_id: str, limit: int = 50, skip: int = 0) -> tuple[list[ConversationInDB], int]:
+    """
+    Get a user's conversations, most recently active first.
+
+    Args:
+        user_id: Owner's user ID
+        limit: Maximum number of results
+        skip: Number of results to skip (for pagination)
+
+    Returns:
+        Tuple of (list of conversations, total count)
+    """
+    conversations_collection = db_module.database.ai_conversations
+    query = {"userId": user_id}
+
+    total = await conversations_collection.count_documents(query)
+    cursor = conversations_collection.find(query, {"summary": 0}).sort("updatedAt", DESCENDING).skip(skip).limit(limit)
+
+    return [_to_conversation(doc) async for doc in cursor], total
+
+
+async def get_messages(
+    conversation_id: str,
+    after_seq: int = -1,
+    limit: int = 50,
+    newest: bool = False
+) -> list[dict]:
+    """
+    Read part of a conversation's message log.
+
+    Args:
+        conversation_id: Conversation ID
+        after_seq: Only messages with a higher sequence number
+        limit: Maximum number of messages
+        newest: Take the newest messages instead of the oldest
+
+    Returns:
+        Message dicts (seq, role, content, tokens, createdAt) in conversation order
+    """
+    cursor = db_module.database.ai_messages.find(
+        {"conversationId": conversation_id, "seq": {"$gt": after_seq}},
+        {"_id": 0, "conversationId": 0}
+    ).sort("seq", DESCENDING if newest else ASCENDING).limit(limit)
+
+    messages = await cursor.to_list(limit)
+    if newest:
+        messages.reverse()
+    return messages
+
+
+async def append_messages(conversation_id: str, messages: list[dict]) -> None:
+    """
+    Append messages to a conversation's log.
+
+    Sequence numbers are reserved atomically on the conversation, so
+    concurrent appends never collide.
+
+    Args:
+        conversation_id: Conversation ID
+        messages: Dicts with role, content and tokens
+    """
+    now = datetime.utcnow()
+    conversation = await db_module.database.ai_conversations.find_one_and_update(
+        {"_id": ObjectId(conversation_id)},
+        {"$inc": {"messageCount": len(messages)}, "$set": {"updatedAt": now}},
+        projection={"messageCount": 1},
+        return_document=ReturnDocument.AFTER
+    )
+    if conversation is None:
+        return
+
+    first_seq = conversation["messageCount"] - len(messages)
+    await db_module.database.ai_messages.insert_many([
+        {**message, "conversationId": conversation_id, "seq": first_seq + offset, "createdAt": now}
+        for offset, message in enumerate(messages)
+    ])
+
+
+async def save_summary(conversation_id: str, summary: str, summarized_through: int, previous_through: int) -> bool:
+    """
+    Replace a conversation's rolling summary.
+
+    The update only applies if no other summary was saved since
+    previous_through was read.
+
+    Args:
+        conversation_id: Conversation ID
+        summary: New summary
+        summarized_through: Sequence number of the last message it covers
+        previous_through: summarizedThrough value the summary was built from
+
+    Returns:
+        True if the summary was saved
+    """
+    result = await db_module.database.ai_conversations.update_one(
+        {"_id": ObjectId(conversation_id), "summarizedThrough": previous_through},
+        {"$set": {"summary": summary, "summarizedThrough": summarized_through}}
+    )
+    return result.modified_count > 0
+
+
+async def delete_conversation(conversation_id: str, user_id: str) -> bool:
+    """
+    Delete a conversation and its messages.
+
+    Args:
+        conversation_id: Conversation ID
+        user_id: Owner's user ID
+
+    Returns:
+        True if the conversation was deleted, False if not found
+    """
+    if not ObjectId.is_valid(conversation_id):
+        return False
+
+    result = await db_module.database.ai_conversations.delete_one(
+        {"_id": ObjectId(conversation_id), "userId": user_id}
+    )
+    if result.deleted_count == 0:
+        return False
+
+    await db_module.database.ai_messages.delete_many({"conversationId": conversation_id})
+    return True
@@ -0,0 +1,80 @@
+from typing import Optional
+
+import database as db_module
+
+
+def build_date_match(start_date: Optional[str] = None, end_date: Optional[str] = None) -> dict:
+    """
+    Build a $match filter on the YYYY-MM-DD date field.
+
+    Args:
+        start_date: Inclusive start date (YYYY-MM-DD)
+        end_date: Inclusive end date (YYYY-MM-DD)
+
+    Returns:
+        Filter dict (empty if no bounds given)
+    """
+    date_filter = {}
+    if start_date:
+        date_filter["$gte"] = start_date
+    if end_date:
+        date_filter["$lte"] = end_date
+    return {"date": date_filter} if date_filter else {}
+
+
+async def get_collection_total(collection_name: str, match: Optional[dict] = None) -> float:
+    """
+    Sum the amount field of a financial collection.
+
+    Args:
+        collection_name: 'income' or 'expenses'
+        match: Optional filter applied before summing
+
+    Returns:
+        Total amount (0.0 if no records match)
+    """
+    pipeline = []
+    if match:
+        pipeline.append({"$match": match})
+    pipeline.append({
+        "$group": {
+            "_id": None,
+            "total": {"$sum": "$amount"}
+        }
+    })
+
+    result = await db_module.database[collection_name].aggregate(pipeline).to_list(1)
+    return result[0]["total"] if result else 0.0
+
+
+async def get_expense_category_totals(match: Optional[dict] = None) -> list[dict]:
+    """
+    Total expenses per category.
+
+    Args:
+        match: Optional filter applied before grouping
+
+    Returns:
+        List of {"category", "total", "count"} dicts, largest total first
+    """
+    pipeline = []
+    if match:
+        pipeline.append({"$match": match})
+    pipeline += [
+        {
+            "$group": {
+                "_id": "$category",
+                "total": {"$sum": "$amount"},
+                "count": {"$sum": 1}
+            }
+        },
+        {
+            "$sort": {"total": -1}
+        }
+    ]
+
+    results = await db_module.database.expenses.aggregate(pipeline).to_list(None)
+    return [
+        {"category": item["_id"], "total": item["total"], "count": item["count"]}
+        for item in results
+    ]
@@ -1,9 +1,17 @@
 from datetime import datetime
 from typing import Optional, List
 from bson import ObjectId
+from pymongo import UpdateOne
+import logging
 
 import database as db_module
-from models.document import DocumentCreate, DocumentUpdate, DocumentInDB
+from crud.batch import find_by_ids
+from crud import document_text as document_text_crud
+from models.document import DocumentCreate, DocumentUpdate, DocumentInDB, parse_file_size
+from utils.file_upload import get_upload_relative_path
+from utils.storage_codec import find_stored_object, get_original_size
+
+logger = logging.getLogger(__name__)
 
 
 async def create_document(
@@ -11,7 +19,7 @@ async def create_document(
     user_id: str,
     file_url: str,
     file_type: str,
-    file_size: str
+    file_size: int
 ) -> DocumentInDB:
     """
     Create a new document in the database.
@@ -21,7 +29,7 @@ async def create_document(
         user_id: ID of user creating the document
         file_url: URL to uploaded file
         file_type: File type (e.g., pdf, docx)
-        file_size: File size (e.g., "2.4 MB")
+        file_size: File size in bytes
         
     Returns:
         Created document from database
@@ -47,29 +55,22 @@ async def create_document(
     return DocumentInDB(**document_dict)
 
 
-async def get_documents(
+async def build_document_query(
     category: Optional[str] = None,
     search: Optional[str] = None,
-    archived: bool = False,
-    limit: int = 50,
-    skip: int = 0
-) -> tuple[List[DocumentInDB], int]:
+    archived: bool = False
+) -> dict:
     """
-    Get documents with optional filtering.
+    Build the filter query for get_documents.
     
     Args:
         category: Filter by category
-        search: Search in title and description (case-insensitive)
+        search: Search in title, description and extracted file text
         archived: Include archived documents
-        limit: Maximum number of results
-        skip: Number of results to skip (for pagination)
         
     Returns:
-        Tuple of (list of documents, total count)
+        Mongo filter dict
     """
-    documents_collection = db_module.database.documents
-    
-    # Build filter query
     query = {}
     
     # Exclude archived by default
@@ -80,26 +81,170 @@ async def get_documents(
         query["category"] = category
     
     if search:
-        # Search in title and description
+        # Search in title and description, plus extracted file text via the text index
         query["$or"] = [
             {"title": {"$regex": search, "$options": "i"}},
             {"description": {"$regex": search, "$options": "i"}}
         ]
+        text_match_ids = await document_text_crud.search_document_ids(search)
+        if text_match_ids:
+            query["$or"].append({"_id": {"$in": [ObjectId(doc_id) for doc_id in text_match_ids]}})
+    
+    return query
+
+
+def construct_document(document_doc: dict) -> DocumentInDB:
+    """
+    Build a document from a stored record without validating it.
+    
+    Records were validated when written, but legacy formatted sizes
+    (e.g., "2.4 MB") are still converted to bytes, as the model's validator
+    would, until migrate_file_sizes has run.
+    
+    Args:
+        document_doc: Stored document with a string _id
+        
+    Returns:
+        Document model
+    """
+    if isinstance(document_doc.get("fileSize"), str):
+        document_doc["fileSize"] = parse_file_size(document_doc["fileSize"])
+    return DocumentInDB.model_construct(**document_doc)
+
+
+async def get_documents(
+    category: Optional[str] = None,
+    search: Optional[str] = None,
+    archived: bool = False,
+    limit: int = 50,
+    skip: int = 0,
+    projection: Optional[dict] = None
+) -> tuple[List[DocumentInDB], int]:
+    """
+    Get documents with optional filtering.
+    
+    Args:
+        category: Filter by category
+        search: Search in title, description and extracted file text
+        archived: Include archived documents
+        limit: Maximum number of results
+        skip: Number of results to skip (for pagination)
+        projection: Mongo projection limiting the fields read (all fields if None)
+        
+    Returns:
+        Tuple of (list of documents, total count)
+    """
+    documents_collection = db_module.database.documents
+    
+    query = await build_document_query(category, search, archived)
     
     # Get total count
     total = await documents_collection.count_documents(query)
     
     # Get documents with pagination, sorted by createdAt descending
-    cursor = documents_collection.find(query).sort("createdAt", -1).skip(skip).limit(limit)
+    cursor = documents_collection.find(query, projection).sort("createdAt", -1).skip(skip).limit(limit)
     documents = []
     
     async for document_doc in cursor:
         document_doc["_id"] = str(document_doc["_id"])
-        documents.append(DocumentInDB(**document_doc))
+        documents.append(construct_document(document_doc))
     
     return documents, total
 
 
+async def get_storage_usage(archived: bool = False) -> dict:
+    """
+    Aggregate stored bytes by category and file type.
+    
+    Args:
+        archived: Include archived documents
+        
+    Returns:
+        Dict with totalBytes, totalFiles, byCategory and byFileType
+    """
+    documents_collection = db_module.database.documents
+    
+    match = {} if archived else {"archivedAt": None}
+    
+    def group_by(field: str) -> list:
+        return [
+            {"$group": {"_id": f"${field}", "bytes": {"$sum": "$fileSize"}, "files": {"$sum": 1}}},
+            {"$sort": {"bytes": -1}}
+        ]
+    
+    pipeline = [
+        {"$match": match},
+        {"$facet": {
+            "total": [{"$group": {"_id": None, "bytes": {"$sum": "$fileSize"}, "files": {"$sum": 1}}}],
+            "byCategory": group_by("category"),
+            "byFileType": group_by("fileType")
+        }}
+    ]
+    
+    result = await documents_collection.aggregate(pipeline).to_list(1)
+    facets = result[0] if result else {"total": [], "byCategory": [], "byFileType": []}
+    total = facets["total"][0] if facets["total"] else {"bytes": 0, "files": 0}
+    
+    def to_groups(items: list) -> list:
+        return [
+            {"key": item["_id"] or "unknown", "bytes": item["bytes"], "files": item["files"]}
+            for item in items
+        ]
+    
+    return {
+        "totalBytes": total["bytes"],
+        "totalFiles": total["files"],
+        "byCategory": to_groups(facets["byCategory"]),
+        "byFileType": to_groups(facets["byFileType"])
+    }
+
+
+async def migrate_file_sizes() -> int:
+    """
+    Convert legacy formatted fileSize strings (e.g., "2.4 MB") to integer bytes.
+    
+    Uses the size of the stored file when it still exists, otherwise parses
+    the stored string. Safe to run repeatedly; only string sizes are touched.
+    
+    Returns:
+        Number of documents migrated
+    """
+    if db_module.database is None:
+        return 0
+    
+    documents_collection = db_module.database.documents
+    
+    cursor = documents_collection.find(
+        {"fileSize": {"$type": "string"}},
+        {"fileSize": 1, "fileUrl": 1}
+    )
+    
+    operations = []
+    migrated = 0
+    async for doc in cursor:
+        stored, codec = await find_stored_object(get_upload_relative_path(doc.get("fileUrl") or ""))
+        if stored:
+            size_bytes = await get_original_size(stored, codec)
+        else:
+            try:
+                size_bytes = parse_file_size(doc["fileSize"])
+            except ValueError:
+                size_bytes = 0
+        
+        operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"fileSize": size_bytes}}))
+        if len(operations) >= 500:
+            migrated += (await documents_collection.bulk_write(operations, ordered=False)).modified_count
+            operations = []
+    
+    if operations:
+        migrated += (await documents_collection.bulk_write(operations, ordered=False)).modified_count
+    
+    if migrated:
+        logger.info(f"Migrated {migrated} document sizes to bytes")
+    
+    return migrated
+
+
 async def get_document_by_id(document_id: str) -> Optional[DocumentInDB]:
     """
     Get document by ID.
@@ -124,6 +269,20 @@ async def get_document_by_id(document_id: str) -> Optional[DocumentInDB]:
     return None
 
 
+async def get_documents_by_ids(document_ids: List[str]) -> dict[str, DocumentInDB]:
+    """
+    Get several documents by ID with a single query.
+    
+    Args:
+        document_ids: Document IDs
+        
+    Returns:
+        Dict of document ID to document; IDs that were not found are absent
+    """
+    docs = await find_by_ids("documents", document_ids)
+    return {document_id: construct_document(doc) for document_id, doc in docs.items()}
+
+
 async def update_document(document_id: str, document_data: DocumentUpdate) -> Optional[DocumentInDB]:
     """
     Update document by ID.
@@ -187,5 +346,31 @@ async def archive_document(document_id: str) -> bool:
             {"$set": {"archivedAt": datetime.utcnow()}}
         )
         return result.modified_count > 0
+    except Exception:
+        return False
+
+
+async def set_document_thumbnail(
+    document_id: str,
+    thumbnail_url: str
+) -> bool:
+    """
+    Record the generated preview thumbnail for a document.
+    
+    Args:
+        document_id: Document ID
+        thumbnail_url: Relative URL of the thumbnail file
+        
+    Returns:
+        True if updated successfully, False otherwise
+    """
+    documents_collection = db_module.database.documents
+    
+    try:
+        result = await documents_collection.update_one(
+            {"_id": ObjectId(document_id)},
+            {"$set": {"thumbnailUrl": thumbnail_url}}
+        )
+        return result.modified_count > 0
     except Exception:
         return False
\ No newline at end of file
@@ -0,0 +1,71 @@
+from datetime import datetime
+import logging
+
+import database as db_module
+
+logger = logging.getLogger(__name__)
+
+# Cap on document IDs returned by a body search before it is merged into the document query
+MAX_TEXT_MATCHES = 1000
+
+
+async def ensure_text_index() -> None:
+    """Create the full-text index on extracted document text if it is missing."""
+    if db_module.database is None:
+        return
+
+    try:
+        await db_module.database.document_text.create_index(
+            [("text", "text")],
+            name="document_text_search"
+        )
+    except Exception as e:
+        logger.warning(f"Failed to create document text index: {e}")
+
+
+async def save_document_text(document_id: str, text: str) -> None:
+    """
+    Store extracted text for a document, replacing any previous extraction.
+
+    Args:
+        document_id: Document ID
+        text: Extracted text
+    """
+    document_text_collection = db_module.database.document_text
+
+    await document_text_collection.replace_one(
+        {"_id": document_id},
+        {
+            "_id": document_id,
+            "text": text,
+            "extractedAt": datetime.utcnow()
+        },
+        upsert=True
+    )
+
+
+async def search_document_ids(search: str) -> list[str]:
+    """
+    Find documents whose extracted text matches a search string.
+
+    Uses the text index only; no file is read at query time.
+
+    Args:
+        search: Search terms
+
+    Returns:
+        List of matching document IDs (best matches first)
+    """
+    document_text_collection = db_module.database.document_text
+
+    try:
+        cursor = document_text_collection.find(
+            {"$text": {"$search": search}},
+            {"_id": 1, "score": {"$meta": "textScore"}}
+        ).sort([("score", {"$meta": "textScore"})]).limit(MAX_TEXT_MATCHES)
+
+        return [doc["_id"] async for doc in cursor]
+    except Exception as e:
+        # Missing text index: fall back to title/description search only
+        logger.warning(f"Document text search failed: {e}")
+        return []
@@ -1,10 +1,27 @@
 from datetime import datetime
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List
+import logging
+
 from bson import ObjectId
+from pymongo import DESCENDING
 
 import database as db_module
+from crud.batch import find_by_ids
 from models.expense import ExpenseCreate, ExpenseInDB
 
+logger = logging.getLogger(__name__)
+
+
+async def ensure_expense_indexes() -> None:
+    """Create the date index used to sort expense lists and exports."""
+    if db_module.database is None:
+        return
+
+    try:
+        await db_module.database.expenses.create_index([("date", DESCENDING)], name="expenses_date")
+    except Exception as e:
+        logger.warning(f"Failed to create expense indexes: {e}")
+
 
 async def create_expense(expense_data: ExpenseCreate, user_id: str) -> ExpenseInDB:
     """
@@ -37,31 +54,24 @@ async def create_expense(expense_data: ExpenseCreate, user_id: str) -> ExpenseIn
     return ExpenseInDB(**expense_dict)
 
 
-async def get_expenses(
+def build_expense_query(
     category: Optional[str] = None,
     vendor: Optional[str] = None,
     project_id: Optional[str] = None,
-    search: Optional[str] = None,
-    limit: int = 50,
-    skip: int = 0
-) -> tuple[List[ExpenseInDB], int]:
+    search: Optional[str] = None
+) -> dict:
     """
-    Get expenses with optional filtering.
+    Build the filter query for get_expenses.
     
     Args:
         category: Filter by category
         vendor: Filter by vendor
         project_id: Filter by project ID
         search: Search in description and vendor
-        limit: Maximum number of results
-        skip: Number of results to skip (for pagination)
         
     Returns:
-        Tuple of (list of expenses, total count)
+        Mongo filter dict
     """
-    expenses_collection = db_module.database.expenses
-    
-    # Build filter query
     query = {}
     
     if category:
@@ -79,20 +89,84 @@ async def get_expenses(
             {"vendor": {"$regex": search, "$options": "i"}}
         ]
     
+    return query
+
+
+async def get_expenses(
+    category: Optional[str] = None,
+    vendor: Optional[str] = None,
+    project_id: Optional[str] = None,
+    search: Optional[str] = None,
+    limit: int = 50,
+    skip: int = 0,
+    projection: Optional[dict] = None
+) -> tuple[List[ExpenseInDB], int]:
+    """
+    Get expenses with optional filtering.
+    
+    Args:
+        category: Filter by category
+        vendor: Filter by vendor
+        project_id: Filter by project ID
+        search: Search in description and vendor
+        limit: Maximum number of results
+        skip: Number of results to skip (for pagination)
+        projection: Mongo projection limiting the fields read (all fields if None)
+        
+    Returns:
+        Tuple of (list of expenses, total count)
+    """
+    expenses_collection = db_module.database.expenses
+    
+    query = build_expense_query(category, vendor, project_id, search)
+    
     # Get total count
     total = await expenses_collection.count_documents(query)
     
     # Get expenses with pagination, sorted by date descending
-    cursor = expenses_collection.find(query).sort("date", -1).skip(skip).limit(limit)
+    cursor = expenses_collection.find(query, projection).sort("date", -1).skip(skip).limit(limit)
     expenses = []
     
     async for expense_doc in cursor:
         expense_doc["_id"] = str(expense_doc["_id"])
-        expenses.append(ExpenseInDB(**expense_doc))
+        # Records were validated when written, so list reads skip validation
+        expenses.append(ExpenseInDB.model_construct(**expense_doc))
     
     return expenses, total
 
 
+async def iter_expenses(
+    category: Optional[str] = None,
+    vendor: Optional[str] = None,
+    project_id: Optional[str] = None,
+    search: Optional[str] = None,
+    projection: Optional[dict] = None,
+    batch_size: int = 1000
+) -> AsyncIterator[dict]:
+    """
+    Stream every matching expense record from a single cursor, newest first.
+    
+    Args:
+        category: Filter by category
+        vendor: Filter by vendor
+        project_id: Filter by project ID
+        search: Search in description and vendor
+        projection: Mongo projection limiting the fields read (all fields if None)
+        batch_size: Records fetched per round trip
+        
+    Yields:
+        Raw expense documents
+    """
+    query = build_expense_query(category, vendor, project_id, search)
+    cursor = db_module.database.expenses.find(query, projection).sort("date", -1).batch_size(batch_size)
+    
+    try:
+        async for expense_doc in cursor:
+            yield expense_doc
+    finally:
+        await cursor.close()
+
+
 async def get_expense_by_id(expense_id: str) -> Optional[ExpenseInDB]:
     """
     Get expense by ID.
@@ -114,4 +188,19 @@ async def get_expense_by_id(expense_id: str) -> Optional[ExpenseInDB]:
     except Exception:
         pass
     
-    return None
\ No newline at end of file
+    return None
+
+
+async def get_expenses_by_ids(expense_ids: List[str]) -> dict[str, ExpenseInDB]:
+    """
+    Get several expenses by ID with a single query.
+    
+    Args:
+        expense_ids: Expense IDs
+        
+    Returns:
+        Dict of expense ID to expense; IDs that were not found are absent
+    """
+    docs = await find_by_ids("expenses", expense_ids)
+    # Records were validated when written, so batch reads skip validation
+    return {expense_id: ExpenseInDB.model_construct(**doc) for expense_id, doc in docs.items()}
\ No newline at end of file
@@ -1,12 +1,28 @@
 from datetime import datetime
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List
+import logging
+
 from bson import ObjectId
+from pymongo import DESCENDING
 import pandas as pd
 from io import BytesIO
 
 import database as db_module
 from models.income import IncomeCreate, IncomeInDB
 
+logger = logging.getLogger(__name__)
+
+
+async def ensure_income_indexes() -> None:
+    """Create the date index used to sort income lists and exports."""
+    if db_module.database is None:
+        return
+
+    try:
+        await db_module.database.income.create_index([("date", DESCENDING)], name="income_date")
+    except Exception as e:
+        logger.warning(f"Failed to create income indexes: {e}")
+
 
 async def create_income(income_data: IncomeCreate, user_id: str) -> IncomeInDB:
     """
@@ -36,11 +52,37 @@ async def create_income(income_data: IncomeCreate, user_id: str) -> IncomeInDB:
     return IncomeInDB(**income_dict)
 
 
+def build_income_query(
+    source: Optional[str] = None,
+    search: Optional[str] = None
+) -> dict:
+    """
+    Build the filter query for get_income_list.
+    
+    Args:
+        source: Filter by source type
+        search: Search in description
+        
+    Returns:
+        Mongo filter dict
+    """
+    query = {}
+    
+    if source:
+        query["source"] = source
+    
+    if search:
+        query["description"] = {"$regex": search, "$options": "i"}
+    
+    return query
+
+
 async def get_income_list(
     source: Optional[str] = None,
     search: Optional[str] = None,
     limit: int = 50,
-    skip: int = 0
+    skip: int = 0,
+    projection: Optional[dict] = None
 ) -> tuple[List[IncomeInDB], int]:
     """
     Get income records with optional filtering.
@@ -50,35 +92,58 @@ async def get_income_list(
         search: Search in description
         limit: Maximum number of results
         skip: Number of results to skip (for pagination)
+        projection: Mongo projection limiting the fields read (all fields if None)
         
     Returns:
         Tuple of (list of income records, total count)
     """
     income_collection = db_module.database.income
     
-    # Build filter query
-    query = {}
-    
-    if source:
-        query["source"] = source
-    
-    if search:
-        query["description"] = {"$regex": search, "$options": "i"}
+    query = build_income_query(source, search)
     
     # Get total count
     total = await income_collection.count_documents(query)
     
     # Get income records with pagination, sorted by date descending
-    cursor = income_collection.find(query).sort("date", -1).skip(skip).limit(limit)
+    cursor = income_collection.find(query, projection).sort("date", -1).skip(skip).limit(limit)
     income_records = []
     
     async for income_doc in cursor:
         income_doc["_id"] = str(income_doc["_id"])
-        income_records.append(IncomeInDB(**income_doc))
+        # Records were validated when written, so list reads skip validation
+        income_records.append(IncomeInDB.model_construct(**income_doc))
     
     return income_records, total
 
 
+async def iter_income(
+    source: Optional[str] = None,
+    search: Optional[str] = None,
+    projection: Optional[dict] = None,
+    batch_size: int = 1000
+) -> AsyncIterator[dict]:
+    """
+    Stream every matching income record from a single cursor, newest first.
+    
+    Args:
+        source: Filter by source type
+        search: Search in description
+        projection: Mongo projection limiting the fields read (all fields if None)
+        batch_size: Records fetched per round trip
+        
+    Yields:
+        Raw income documents
+    """
+    query = build_income_query(source, search)
+    cursor = db_module.database.income.find(query, projection).sort("date", -1).batch_size(batch_size)
+    
+    try:
+        async for income_doc in cursor:
+            yield income_doc
+    finally:
+        await cursor.close()
+
+
 async def bulk_create_income(income_list: List[IncomeCreate], user_id: str) -> int:
     """
     Bulk create income records from import.
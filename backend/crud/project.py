@@ -1,8 +1,11 @@
+import asyncio
 from datetime import datetime
 from typing import Optional, List
 from bson import ObjectId
 
 import database as db_module
+from crud.batch import find_by_ids
+from crud import version as version_crud
 from models.project import ProjectCreate, ProjectUpdate, ProjectInDB
 
 
@@ -39,29 +42,22 @@ async def create_project(project_data: ProjectCreate, user_id: str) -> ProjectIn
     return ProjectInDB(**project_dict)
 
 
-async def get_projects(
+def build_project_query(
     status: Optional[str] = None,
     search: Optional[str] = None,
-    archived: bool = False,
-    limit: int = 50,
-    skip: int = 0
-) -> tuple[List[ProjectInDB], int]:
+    archived: bool = False
+) -> dict:
     """
-    Get projects with optional filtering.
+    Build the filter query for get_projects.
     
     Args:
         status: Filter by status
         search: Search in name and description
         archived: Include archived projects
-        limit: Maximum number of results
-        skip: Number of results to skip (for pagination)
         
     Returns:
-        Tuple of (list of projects, total count)
+        Mongo filter dict
     """
-    projects_collection = db_module.database.projects
-    
-    # Build filter query
     query = {}
     
     # Exclude archived by default
@@ -77,16 +73,46 @@ async def get_projects(
             {"description": {"$regex": search, "$options": "i"}}
         ]
     
+    return query
+
+
+async def get_projects(
+    status: Optional[str] = None,
+    search: Optional[str] = None,
+    archived: bool = False,
+    limit: int = 50,
+    skip: int = 0,
+    projection: Optional[dict] = None
+) -> tuple[List[ProjectInDB], int]:
+    """
+    Get projects with optional filtering.
+    
+    Args:
+        status: Filter by status
+        search: Search in name and description
+        archived: Include archived projects
+        limit: Maximum number of results
+        skip: Number of results to skip (for pagination)
+        projection: Mongo projection limiting the fields read (all fields if None)
+        
+    Returns:
+        Tuple of (list of projects, total count)
+    """
+    projects_collection = db_module.database.projects
+    
+    query = build_project_query(status, search, archived)
+    
     # Get total count
     total = await projects_collection.count_documents(query)
     
     # Get projects with pagination, sorted by createdAt descending
-    cursor = projects_collection.find(query).sort("createdAt", -1).skip(skip).limit(limit)
+    cursor = projects_collection.find(query, projection).sort("createdAt", -1).skip(skip).limit(limit)
     projects = []
     
     async for project_doc in cursor:
         project_doc["_id"] = str(project_doc["_id"])
-        projects.append(ProjectInDB(**project_doc))
+        # Records were validated when written, so list reads skip validation
+        projects.append(ProjectInDB.model_construct(**project_doc))
     
     return projects, total
 
@@ -115,6 +141,21 @@ async def get_project_by_id(project_id: str) -> Optional[ProjectInDB]:
     return None
 
 
+async def get_projects_by_ids(project_ids: List[str]) -> dict[str, ProjectInDB]:
+    """
+    Get several projects by ID with a single query.
+    
+    Args:
+        project_ids: Project IDs
+        
+    Returns:
+        Dict of project ID to project; IDs that were not found are absent
+    """
+    docs = await find_by_ids("projects", project_ids)
+    # Records were validated when written, so batch reads skip validation
+    return {project_id: ProjectInDB.model_construct(**doc) for project_id, doc in docs.items()}
+
+
 async def get_project_with_aggregations(project_id: str) -> Optional[dict]:
     """
     Get project by ID with linked proposals and expenses, and calculate actualSpent.
@@ -167,6 +208,75 @@ async def get_project_with_aggregations(project_id: str) -> Optional[dict]:
         return None
 
 
+async def get_project_detail_version(project_id: str) -> Optional[tuple]:
+    """
+    Get the version of a project's detail view (project, linked proposals and expenses).
+    
+    Args:
+        project_id: Project ID
+        
+    Returns:
+        Version tuple, or None if the project is not found
+    """
+    project_version, proposals_version, expenses_version = await asyncio.gather(
+        version_crud.get_record_version("projects", project_id),
+        version_crud.get_collection_version("proposals", {"projectId": project_id, "archivedAt": None}),
+        version_crud.get_collection_version("expenses", {"projectId": project_id})
+    )
+    
+    if project_version is None:
+        return None
+    return project_version + proposals_version + expenses_version
+
+
+async def get_project_files(project_id: str) -> Optional[dict]:
+    """
+    Get the files attached to a project's proposals and linked expense receipts.
+    
+    Uses the same links as get_project_with_aggregations, but projects only the
+    fields needed to name and locate each file.
+    
+    Args:
+        project_id: Project ID
+        
+    Returns:
+        Dict with project name, proposal files and receipt files if found, None otherwise
+    """
+    projects_collection = db_module.database.projects
+    proposals_collection = db_module.database.proposals
+    expenses_collection = db_module.database.expenses
+    
+    try:
+        project_doc = await projects_collection.find_one(
+            {"_id": ObjectId(project_id)},
+            {"name": 1}
+        )
+        if not project_doc:
+            return None
+        
+        # Non-archived proposals with an uploaded file
+        proposals_cursor = proposals_collection.find(
+            {"projectId": project_id, "archivedAt": None, "fileUrl": {"$ne": None}},
+            {"vendorName": 1, "fileUrl": 1}
+        )
+        proposal_files = [doc async for doc in proposals_cursor]
+        
+        # Linked expenses with an uploaded receipt
+        expenses_cursor = expenses_collection.find(
+            {"projectId": project_id, "receiptUrl": {"$regex": "^/uploads/"}},
+            {"date": 1, "vendor": 1, "receiptUrl": 1}
+        )
+        receipt_files = [doc async for doc in expenses_cursor]
+        
+        return {
+            "name": project_doc.get("name", ""),
+            "proposals": proposal_files,
+            "receipts": receipt_files
+        }
+    except Exception:
+        return None
+
+
 async def update_project(project_id: str, project_data: ProjectUpdate) -> Optional[ProjectInDB]:
     """
     Update project by ID.
@@ -3,6 +3,7 @@ from typing import Optional, List
 from bson import ObjectId
 
 import database as db_module
+from crud.batch import find_by_ids
 from models.proposal import ProposalCreate, ProposalUpdate, ProposalInDB
 
 
@@ -45,29 +46,22 @@ async def create_proposal(
     return ProposalInDB(**proposal_dict)
 
 
-async def get_proposals(
+def build_proposal_query(
     project_id: Optional[str] = None,
     vendor_name: Optional[str] = None,
-    archived: bool = False,
-    limit: int = 50,
-    skip: int = 0
-) -> tuple[List[ProposalInDB], int]:
+    archived: bool = False
+) -> dict:
     """
-    Get proposals with optional filtering.
+    Build the filter query for get_proposals.
     
     Args:
         project_id: Filter by project ID
         vendor_name: Filter by vendor name (case-insensitive partial match)
         archived: Include archived proposals
-        limit: Maximum number of results
-        skip: Number of results to skip (for pagination)
         
     Returns:
-        Tuple of (list of proposals, total count)
+        Mongo filter dict
     """
-    proposals_collection = db_module.database.proposals
-    
-    # Build filter query
     query = {}
     
     # Exclude archived by default
@@ -80,16 +74,46 @@ async def get_proposals(
     if vendor_name:
         query["vendorName"] = {"$regex": vendor_name, "$options": "i"}
     
+    return query
+
+
+async def get_proposals(
+    project_id: Optional[str] = None,
+    vendor_name: Optional[str] = None,
+    archived: bool = False,
+    limit: int = 50,
+    skip: int = 0,
+    projection: Optional[dict] = None
+) -> tuple[List[ProposalInDB], int]:
+    """
+    Get proposals with optional filtering.
+    
+    Args:
+        project_id: Filter by project ID
+        vendor_name: Filter by vendor name (case-insensitive partial match)
+        archived: Include archived proposals
+        limit: Maximum number of results
+        skip: Number of results to skip (for pagination)
+        projection: Mongo projection limiting the fields read (all fields if None)
+        
+    Returns:
+        Tuple of (list of proposals, total count)
+    """
+    proposals_collection = db_module.database.proposals
+    
+    query = build_proposal_query(project_id, vendor_name, archived)
+    
     # Get total count
     total = await proposals_collection.count_documents(query)
     
     # Get proposals with pagination, sorted by createdAt descending
-    cursor = proposals_collection.find(query).sort("createdAt", -1).skip(skip).limit(limit)
+    cursor = proposals_collection.find(query, projection).sort("createdAt", -1).skip(skip).limit(limit)
     proposals = []
     
     async for proposal_doc in cursor:
         proposal_doc["_id"] = str(proposal_doc["_id"])
-        proposals.append(ProposalInDB(**proposal_doc))
+        # Records were validated when written, so list reads skip validation
+        proposals.append(ProposalInDB.model_construct(**proposal_doc))
     
     return proposals, total
 
@@ -118,6 +142,21 @@ async def get_proposal_by_id(proposal_id: str) -> Optional[ProposalInDB]:
     return None
 
 
+async def get_proposals_by_ids(proposal_ids: List[str]) -> dict[str, ProposalInDB]:
+    """
+    Get several proposals by ID with a single query.
+    
+    Args:
+        proposal_ids: Proposal IDs
+        
+    Returns:
+        Dict of proposal ID to proposal; IDs that were not found are absent
+    """
+    docs = await find_by_ids("proposals", proposal_ids)
+    # Records were validated when written, so batch reads skip validation
+    return {proposal_id: ProposalInDB.model_construct(**doc) for proposal_id, doc in docs.items()}
+
+
 async def update_proposal(proposal_id: str, proposal_data: ProposalUpdate) -> Optional[ProposalInDB]:
     """
     Update proposal by ID.
@@ -187,5 +226,31 @@ async def archive_proposal(proposal_id: str) -> bool:
             {"$set": {"archivedAt": datetime.utcnow()}}
         )
         return result.modified_count > 0
+    except Exception:
+        return False
+
+
+async def set_proposal_thumbnail(
+    proposal_id: str,
+    thumbnail_url: str
+) -> bool:
+    """
+    Record the generated preview thumbnail for a proposal.
+    
+    Args:
+        proposal_id: Proposal ID
+        thumbnail_url: Relative URL of the thumbnail file
+        
+    Returns:
+        True if updated successfully, False otherwise
+    """
+    proposals_collection = db_module.database.proposals
+    
+    try:
+        result = await proposals_collection.update_one(
+            {"_id": ObjectId(proposal_id)},
+            {"$set": {"thumbnailUrl": thumbnail_url}}
+        )
+        return result.modified_count > 0
     except Exception:
         return False
\ No newline at end of file
@@ -0,0 +1,29 @@
+from datetime import datetime
+
+import database as db_module
+
+
+async def create_receipt_record(
+    receipt_url: str,
+    original_size: int,
+    stored_size: int,
+    user_id: str
+) -> None:
+    """
+    Record an uploaded receipt with its size before and after optimization.
+    
+    Args:
+        receipt_url: URL of the stored receipt
+        original_size: Uploaded file size in bytes
+        stored_size: Stored file size in bytes
+        user_id: ID of user uploading the receipt
+    """
+    receipts_collection = db_module.database.receipts
+    
+    await receipts_collection.insert_one({
+        "receiptUrl": receipt_url,
+        "originalSize": original_size,
+        "storedSize": stored_size,
+        "uploadedBy": user_id,
+        "createdAt": datetime.utcnow()
+    })
@@ -0,0 +1,92 @@
+from typing import AsyncIterator, Callable, Optional
+
+import database as db_module
+from crud.dashboard import build_date_match
+
+EXPENSE_FIELDS = {"date": 1, "category": 1, "vendor": 1, "description": 1, "amount": 1}
+INCOME_FIELDS = {"date": 1, "source": 1, "description": 1, "amount": 1}
+
+
+def _expense_row(doc: dict) -> dict:
+    return {
+        "date": doc.get("date"),
+        "type": "Expense",
+        "category": doc.get("category"),
+        "vendor": doc.get("vendor"),
+        "description": doc.get("description"),
+        "amount": doc.get("amount", 0.0)
+    }
+
+
+def _income_row(doc: dict) -> dict:
+    return {
+        "date": doc.get("date"),
+        "type": "Income",
+        "category": doc.get("source"),
+        "vendor": None,
+        "description": doc.get("description"),
+        "amount": doc.get("amount", 0.0)
+    }
+
+
+async def _iter_rows(
+    collection_name: str,
+    query: dict,
+    projection: dict,
+    to_row: Callable[[dict], dict],
+    batch_size: int
+) -> AsyncIterator[dict]:
+    cursor = db_module.database[collection_name].find(query, projection).sort("date", 1).batch_size(batch_size)
+    try:
+        async for doc in cursor:
+            yield to_row(doc)
+    finally:
+        await cursor.close()
+
+
+async def iter_ledger_rows(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    category: Optional[str] = None,
+    source: Optional[str] = None,
+    batch_size: int = 1000
+) -> AsyncIterator[dict]:
+    """
+    Stream income and expense records as one ledger in date order (oldest first).
+
+    Expenses and income are read from one cursor each and merged by date,
+    so the ledger is never held in memory. A category filter selects
+    expenses only and a source filter income only, unless both are given.
+
+    Args:
+        start_date: Inclusive start date (YYYY-MM-DD)
+        end_date: Inclusive end date (YYYY-MM-DD)
+        category: Expense category to include
+        source: Income source to include
+        batch_size: Records fetched per round trip from each collection
+
+    Yields:
+        Ledger rows with date, type, category, vendor, description and amount
+    """
+    match = build_date_match(start_date, end_date)
+    streams = []
+    if category or not source:
+        query = {**match, "category": category} if category else match
+        streams.append(_iter_rows("expenses", query, EXPENSE_FIELDS, _expense_row, batch_size))
+    if source or not category:
+        query = {**match, "source": source} if source else match
+        streams.append(_iter_rows("income", query, INCOME_FIELDS, _income_row, batch_size))
+
+    try:
+        heads = [await anext(stream, None) for stream in streams]
+        while True:
+            pending = [index for index, row in enumerate(heads) if row is not None]
+            if not pending:
+                return
+            # Dates are YYYY-MM-DD strings, so they sort correctly as text
+            index = min(pending, key=lambda i: heads[i]["date"] or "")
+            yield heads[index]
+            heads[index] = await anext(streams[index], None)
+    finally:
+        for stream in streams:
+            await stream.aclose()
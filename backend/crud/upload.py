@@ -0,0 +1,134 @@
+from datetime import datetime, timedelta
+from typing import Optional
+from bson import ObjectId
+
+import database as db_module
+from config import settings
+from models.upload import UploadSessionCreate, UploadSessionInDB
+from utils.file_upload import get_file_extension
+
+
+async def create_upload_session(session_data: UploadSessionCreate, user_id: str) -> UploadSessionInDB:
+    """
+    Create a new resumable upload session in the database.
+
+    Args:
+        session_data: Upload session creation data
+        user_id: ID of user starting the upload
+
+    Returns:
+        Created upload session from database
+    """
+    sessions_collection = db_module.database.upload_sessions
+
+    now = datetime.utcnow()
+    session_dict = {
+        "filename": session_data.filename,
+        "fileType": get_file_extension(session_data.filename),
+        "size": session_data.size,
+        "subdirectory": session_data.subdirectory,
+        "receivedRanges": [],
+        "status": "open",
+        "fileUrl": None,
+        "createdBy": user_id,
+        "createdAt": now,
+        "expiresAt": now + timedelta(seconds=settings.upload_session_ttl)
+    }
+
+    result = await sessions_collection.insert_one(session_dict)
+    session_dict["_id"] = str(result.inserted_id)
+
+    return UploadSessionInDB(**session_dict)
+
+
+async def get_upload_session(session_id: str) -> Optional[UploadSessionInDB]:
+    """
+    Get upload session by ID.
+
+    Args:
+        session_id: Upload session ID
+
+    Returns:
+        Upload session if found, None otherwise
+    """
+    sessions_collection = db_module.database.upload_sessions
+
+    try:
+        session_doc = await sessions_collection.find_one({"_id": ObjectId(session_id)})
+
+        if session_doc:
+            session_doc["_id"] = str(session_doc["_id"])
+            return UploadSessionInDB(**session_doc)
+    except Exception:
+        pass
+
+    return None
+
+
+async def record_chunk(session_id: str, start: int, end: int) -> Optional[UploadSessionInDB]:
+    """
+    Record a written byte range on an open upload session.
+
+    Ranges are appended atomically so chunks may be uploaded in parallel.
+
+    Args:
+        session_id: Upload session ID
+        start: First byte offset of the chunk
+        end: Offset one past the last byte of the chunk
+
+    Returns:
+        Updated upload session if still open, None otherwise
+    """
+    sessions_collection = db_module.database.upload_sessions
+
+    try:
+        result = await sessions_collection.find_one_and_update(
+            {"_id": ObjectId(session_id), "status": "open"},
+            {"$push": {"receivedRanges": [start, end]}},
+            return_document=True
+        )
+
+        if result:
+            result["_id"] = str(result["_id"])
+            return UploadSessionInDB(**result)
+    except Exception:
+        pass
+
+    return None
+
+
+async def set_upload_status(
+    session_id: str,
+    from_status: str,
+    to_status: str,
+    file_url: Optional[str] = None
+) -> bool:
+    """
+    Move an upload session between statuses if it is in the expected state.
+
+    Used to claim a session for finalizing so concurrent finalize calls
+    cannot promote the same staged file twice.
+
+    Args:
+        session_id: Upload session ID
+        from_status: Status the session must currently have
+        to_status: New status
+        file_url: Optional final file URL to record
+
+    Returns:
+        True if the transition was applied, False otherwise
+    """
+    sessions_collection = db_module.database.upload_sessions
+
+    update_dict = {"status": to_status}
+    if file_url is not None:
+        update_dict["fileUrl"] = file_url
+
+    try:
+        result = await sessions_collection.update_one(
+            {"_id": ObjectId(session_id), "status": from_status},
+            {"$set": update_dict}
+        )
+        return result.modified_count > 0
+    except Exception:
+        return False
@@ -0,0 +1,71 @@
+from typing import Optional
+
+from bson import ObjectId
+
+import database as db_module
+
+
+async def get_collection_version(collection_name: str, match: dict) -> tuple:
+    """
+    Summarize the state of the records matching a filter without reading them.
+
+    The summary changes whenever a matching record is created, edited
+    (updatedAt), archived or given a thumbnail, or stops matching.
+
+    Args:
+        collection_name: Collection to summarize (e.g., 'expenses')
+        match: Filter selecting the records
+
+    Returns:
+        Tuple of (count, newest _id, latest updatedAt, latest archivedAt, thumbnail count)
+    """
+    pipeline = [
+        {"$match": match},
+        {
+            "$group": {
+                "_id": None,
+                "count": {"$sum": 1},
+                "lastId": {"$max": "$_id"},
+                "lastUpdated": {"$max": "$updatedAt"},
+                "lastArchived": {"$max": "$archivedAt"},
+                "thumbnails": {"$sum": {"$cond": [{"$ifNull": ["$thumbnailUrl", False]}, 1, 0]}}
+            }
+        }
+    ]
+
+    result = await db_module.database[collection_name].aggregate(pipeline).to_list(1)
+    if not result:
+        return (0,)
+
+    summary = result[0]
+    return (
+        summary["count"],
+        str(summary["lastId"]),
+        summary["lastUpdated"],
+        summary["lastArchived"],
+        summary["thumbnails"]
+    )
+
+
+async def get_record_version(collection_name: str, record_id: str) -> Optional[tuple]:
+    """
+    Read the fields that change when a record is modified.
+
+    Args:
+        collection_name: Collection holding the record
+        record_id: Record ID
+
+    Returns:
+        Tuple of (updatedAt, archivedAt, thumbnailUrl), or None if not found
+    """
+    try:
+        record = await db_module.database[collection_name].find_one(
+            {"_id": ObjectId(record_id)},
+            {"updatedAt": 1, "archivedAt": 1, "thumbnailUrl": 1}
+        )
+    except Exception:
+        return None
+
+    if record is None:
+        return None
+    return record.get("updatedAt"), record.get("archivedAt"), record.get("thumbnailUrl")
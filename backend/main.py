@@ -1,14 +1,28 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from contextlib import asynccontextmanager
 from datetime import datetime
+import asyncio
 import logging
-import os
 
 from config import settings
 from database import connect_to_mongo, close_mongo_connection, ping_database
-from routers import auth, expenses, income, projects, proposals, documents, dashboard, ai
+from utils.background import shutdown_worker_pools
+from utils.ai_client import open_ai_client, close_ai_client
+from crud.document_text import ensure_text_index
+from crud.ai_cache import ensure_ai_cache_index
+from crud.conversation import ensure_conversation_indexes
+from crud.document import migrate_file_sizes
+from crud.expense import ensure_expense_indexes
+from crud.income import ensure_income_indexes
+from utils.upload_gc import run_upload_gc_periodically
+from utils.ai_retrieval import run_index_rebuilds_periodically
+from utils.storage import get_storage
+from utils.storage_codec import accepts_encoding, find_stored_object, iter_original
+from utils.json_response import FastJSONResponse
+from utils.response_compression import CompressionMiddleware
+from routers import auth, expenses, income, projects, proposals, documents, dashboard, reports, ai, uploads
 from auth.middleware import get_current_user
 from models.user import UserInDB
 from fastapi import Depends
@@ -27,9 +41,34 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting HOA OpsAI Backend...")
     await connect_to_mongo()
+    # Fail fast on a misconfigured storage backend
+    get_storage()
+    await open_ai_client()
+    await ensure_text_index()
+    if settings.ai_cache_mongo:
+        await ensure_ai_cache_index()
+    await ensure_conversation_indexes()
+    await ensure_expense_indexes()
+    await ensure_income_indexes()
+    try:
+        await migrate_file_sizes()
+    except Exception as e:
+        logger.warning(f"Document size migration failed: {e}")
+    upload_gc_task = None
+    if settings.upload_gc_interval > 0:
+        upload_gc_task = asyncio.create_task(run_upload_gc_periodically())
+    retrieval_task = None
+    if settings.ai_retrieval_enabled:
+        retrieval_task = asyncio.create_task(run_index_rebuilds_periodically())
     yield
     # Shutdown
     logger.info("Shutting down HOA OpsAI Backend...")
+    if upload_gc_task:
+        upload_gc_task.cancel()
+    if retrieval_task:
+        retrieval_task.cancel()
+    shutdown_worker_pools()
+    await close_ai_client()
     await close_mongo_connection()
 
 
@@ -38,7 +77,8 @@ app = FastAPI(
     title="HOA OpsAI Backend",
     description="Backend API for HOA Operations AI Management System",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # Configure CORS
@@ -50,6 +90,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON and other text responses
+app.add_middleware(CompressionMiddleware)
+
 # Include routers
 app.include_router(auth.router, prefix="/api/v1")
 app.include_router(expenses.router, prefix="/api/v1")
@@ -58,6 +101,8 @@ app.include_router(projects.router, prefix="/api/v1")
 app.include_router(proposals.router, prefix="/api/v1")
 app.include_router(documents.router, prefix="/api/v1")
 app.include_router(dashboard.router, prefix="/api/v1")
+app.include_router(reports.router, prefix="/api/v1")
+app.include_router(uploads.router, prefix="/api/v1")
 app.include_router(ai.router)  # AI router without /api/v1 prefix
 
 
@@ -87,6 +132,7 @@ async def root():
 async def download_file(
     file_type: str,
     filename: str,
+    request: Request,
     current_user: UserInDB = Depends(get_current_user)
 ):
     """
@@ -105,11 +151,11 @@ async def download_file(
             detail=f"Invalid file type. Must be one of: {', '.join(allowed_types)}"
         )
     
-    # Construct file path
-    file_path = os.path.join(settings.upload_dir, file_type, filename)
+    # Locate the stored file (plain or compressed)
+    stored, codec = await find_stored_object(f"{file_type}/{filename}")
     
     # Check if file exists
-    if not os.path.exists(file_path):
+    if stored is None:
         raise HTTPException(status_code=404, detail="File not found")
     
     # Determine media type based on file extension
@@ -122,17 +168,41 @@ async def download_file(
         'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
         'jpg': 'image/jpeg',
         'jpeg': 'image/jpeg',
-        'png': 'image/png'
+        'png': 'image/png',
+        'webp': 'image/webp'
     }
     media_type = media_types.get(extension, 'application/octet-stream')
     
-    return FileResponse(
-        path=file_path,
+    storage = get_storage()
+    local_path = storage.local_path(stored.key)
+    disposition = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    
+    # Compressed files pass through as-is when the client accepts the encoding,
+    # otherwise they are decompressed on the fly
+    if codec is not None and not accepts_encoding(request.headers.get("accept-encoding", ""), codec):
+        return StreamingResponse(
+            iter_original(stored, codec),
+            media_type=media_type,
+            headers={**disposition, "Vary": "Accept-Encoding"}
+        )
+    
+    headers = {"Content-Encoding": codec, "Vary": "Accept-Encoding"} if codec else {}
+    
+    # Local files are sent with FileResponse so the server can use sendfile
+    if local_path is not None:
+        return FileResponse(
+            path=local_path,
+            media_type=media_type,
+            filename=filename,
+            headers=headers or None
+        )
+    
+    return StreamingResponse(
+        storage.get_stream(stored.key),
         media_type=media_type,
-        filename=filename
+        headers={**disposition, **headers, "Content-Length": str(stored.size)}
     )
 
-
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field
+
+# Upper bound on IDs per batch-get request
+MAX_BATCH_IDS = 100
+
+
+class BatchGetRequest(BaseModel):
+    """Request model for batch-get endpoints."""
+    ids: list[str] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_IDS,
+        description=f"Record IDs to fetch (1-{MAX_BATCH_IDS}); results follow this order"
+    )
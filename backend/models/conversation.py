@@ -0,0 +1,47 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from bson import ObjectId
+
+
+class ConversationInDB(BaseModel):
+    """AI conversation model as stored in database."""
+    id: str = Field(alias="_id")
+    userId: str
+    title: str
+    summary: str = Field(default="", description="Rolling summary of messages up to summarizedThrough")
+    summarizedThrough: int = Field(default=-1, description="Sequence number of the last summarized message")
+    messageCount: int = 0
+    createdAt: datetime = Field(default_factory=datetime.utcnow)
+    updatedAt: datetime = Field(default_factory=datetime.utcnow)
+
+    class Config:
+        populate_by_name = True
+        json_encoders = {ObjectId: str}
+
+
+class ConversationMessage(BaseModel):
+    """Single message of an AI conversation."""
+    seq: int = Field(..., description="Position in the conversation, starting at 0")
+    role: str = Field(..., description="user or assistant")
+    content: str
+    createdAt: datetime
+
+
+class ConversationResponse(BaseModel):
+    """AI conversation model for API responses."""
+    id: str
+    title: str
+    messageCount: int
+    createdAt: datetime
+    updatedAt: datetime
+
+
+class ConversationDetailResponse(ConversationResponse):
+    """AI conversation with its messages."""
+    messages: list[ConversationMessage] = Field(default_factory=list)
+
+
+class ConversationListResponse(BaseModel):
+    """Response model for conversation list endpoint."""
+    conversations: list[ConversationResponse]
+    total: int
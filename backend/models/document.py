@@ -21,6 +21,21 @@ class PyObjectId(ObjectId):
         field_schema.update(type="string")
 
 
+def parse_file_size(value: str) -> int:
+    """
+    Parse a legacy formatted file size (e.g., "2.4 MB") into bytes.
+    
+    Args:
+        value: Formatted file size
+        
+    Returns:
+        Approximate size in bytes
+    """
+    units = {"B": 1, "KB": 1024, "MB": 1024 * 1024, "GB": 1024 * 1024 * 1024}
+    number, _, unit = value.strip().partition(" ")
+    return int(float(number) * units.get(unit.upper(), 1))
+
+
 class DocumentBase(BaseModel):
     """Base document model with common fields."""
     title: str = Field(..., min_length=1, description="Document title")
@@ -65,12 +80,21 @@ class DocumentInDB(DocumentBase):
     id: str = Field(alias="_id")
     fileUrl: str = Field(..., description="URL to uploaded document file")
     fileType: str = Field(..., description="File type (e.g., pdf, docx)")
-    fileSize: str = Field(..., description="File size (e.g., '2.4 MB')")
+    fileSize: int = Field(..., ge=0, description="File size in bytes")
+    thumbnailUrl: Optional[str] = Field(None, description="URL to generated preview thumbnail")
     uploadedBy: str = Field(..., description="User ID who uploaded the document")
     createdAt: datetime = Field(default_factory=datetime.utcnow)
     updatedAt: datetime = Field(default_factory=datetime.utcnow)
     archivedAt: Optional[datetime] = None
 
+    @field_validator('fileSize', mode='before')
+    @classmethod
+    def validate_file_size(cls, v):
+        """Accept legacy formatted sizes until they are migrated to bytes."""
+        if isinstance(v, str):
+            return parse_file_size(v)
+        return v
+
     class Config:
         populate_by_name = True
         json_encoders = {ObjectId: str}
@@ -81,7 +105,9 @@ class DocumentResponse(DocumentBase):
     id: str
     fileUrl: str
     fileType: str
-    fileSize: str
+    fileSize: str = Field(..., description="Formatted file size (e.g., '2.4 MB')")
+    fileSizeBytes: int = Field(..., description="File size in bytes")
+    thumbnailUrl: Optional[str] = None
     uploadedBy: str
     createdAt: datetime
     updatedAt: datetime
@@ -94,4 +120,25 @@ class DocumentResponse(DocumentBase):
 class DocumentListResponse(BaseModel):
     """Response model for document list endpoint."""
     documents: list[DocumentResponse]
-    total: int
\ No newline at end of file
+    total: int
+
+
+class DocumentBatchResponse(BaseModel):
+    """Response model for document batch-get endpoint."""
+    documents: list[Optional[DocumentResponse]] = Field(..., description="One entry per requested ID, in request order (null if not found)")
+    missing: list[str] = Field(..., description="Requested IDs that were not found")
+
+
+class StorageUsageGroup(BaseModel):
+    """Storage used by one category or file type."""
+    key: str
+    bytes: int
+    files: int
+
+
+class StorageUsageResponse(BaseModel):
+    """Response model for document storage usage endpoint."""
+    totalBytes: int
+    totalFiles: int
+    byCategory: list[StorageUsageGroup]
+    byFileType: list[StorageUsageGroup]
\ No newline at end of file
@@ -87,4 +87,17 @@ class ExpenseResponse(ExpenseBase):
 class ExpenseListResponse(BaseModel):
     """Response model for expense list endpoint."""
     expenses: list[ExpenseResponse]
-    total: int
\ No newline at end of file
+    total: int
+
+
+class ExpenseBatchResponse(BaseModel):
+    """Response model for expense batch-get endpoint."""
+    expenses: list[Optional[ExpenseResponse]] = Field(..., description="One entry per requested ID, in request order (null if not found)")
+    missing: list[str] = Field(..., description="Requested IDs that were not found")
+
+
+class ReceiptUploadResponse(BaseModel):
+    """Response model for receipt upload endpoint."""
+    receiptUrl: str = Field(..., description="URL to use as the expense receiptUrl")
+    originalSize: int = Field(..., description="Uploaded file size in bytes")
+    storedSize: int = Field(..., description="Stored file size in bytes after optimization")
\ No newline at end of file
@@ -127,4 +127,10 @@ class ProjectDetailResponse(ProjectResponse):
 class ProjectListResponse(BaseModel):
     """Response model for project list endpoint."""
     projects: list[ProjectResponse]
-    total: int
\ No newline at end of file
+    total: int
+
+
+class ProjectBatchResponse(BaseModel):
+    """Response model for project batch-get endpoint."""
+    projects: list[Optional[ProjectResponse]] = Field(..., description="One entry per requested ID, in request order (null if not found)")
+    missing: list[str] = Field(..., description="Requested IDs that were not found")
\ No newline at end of file
@@ -71,6 +71,7 @@ class ProposalInDB(ProposalBase):
     """Proposal model as stored in database."""
     id: str = Field(alias="_id")
     fileUrl: Optional[str] = Field(None, description="URL to uploaded proposal file")
+    thumbnailUrl: Optional[str] = Field(None, description="URL to generated preview thumbnail")
     uploadedBy: str = Field(..., description="User ID who uploaded the proposal")
     createdAt: datetime = Field(default_factory=datetime.utcnow)
     updatedAt: datetime = Field(default_factory=datetime.utcnow)
@@ -85,6 +86,7 @@ class ProposalResponse(ProposalBase):
     """Proposal model for API responses."""
     id: str
     fileUrl: Optional[str] = None
+    thumbnailUrl: Optional[str] = None
     uploadedBy: str
     createdAt: datetime
     updatedAt: datetime
@@ -97,4 +99,10 @@ class ProposalResponse(ProposalBase):
 class ProposalListResponse(BaseModel):
     """Response model for proposal list endpoint."""
     proposals: list[ProposalResponse]
-    total: int
\ No newline at end of file
+    total: int
+
+
+class ProposalBatchResponse(BaseModel):
+    """Response model for proposal batch-get endpoint."""
+    proposals: list[Optional[ProposalResponse]] = Field(..., description="One entry per requested ID, in request order (null if not found)")
+    missing: list[str] = Field(..., description="Requested IDs that were not found")
\ No newline at end of file
@@ -0,0 +1,53 @@
+from pydantic import BaseModel, Field, field_validator
+from typing import Optional
+from datetime import datetime
+from bson import ObjectId
+
+
+class UploadSessionCreate(BaseModel):
+    """Upload session model for creation."""
+    filename: str = Field(..., min_length=1, description="Original filename")
+    size: int = Field(..., gt=0, description="Total file size in bytes")
+    subdirectory: str = Field(..., description="Upload target (proposals or documents)")
+
+    @field_validator('subdirectory')
+    @classmethod
+    def validate_subdirectory(cls, v):
+        """Validate upload target is from allowed list."""
+        allowed_subdirectories = ["proposals", "documents"]
+        if v not in allowed_subdirectories:
+            raise ValueError(f"Subdirectory must be one of: {', '.join(allowed_subdirectories)}")
+        return v
+
+
+class UploadSessionInDB(BaseModel):
+    """Upload session model as stored in database."""
+    id: str = Field(alias="_id")
+    filename: str
+    fileType: str
+    size: int
+    subdirectory: str
+    receivedRanges: list[list[int]] = Field(default_factory=list, description="Written [start, end) byte ranges")
+    status: str = Field(default="open", description="Session status (open, finalizing, stored, completed, aborted)")
+    fileUrl: Optional[str] = None
+    createdBy: str
+    createdAt: datetime = Field(default_factory=datetime.utcnow)
+    expiresAt: datetime
+
+    class Config:
+        populate_by_name = True
+        json_encoders = {ObjectId: str}
+
+
+class UploadSessionResponse(BaseModel):
+    """Upload session model for API responses."""
+    id: str
+    filename: str
+    size: int
+    subdirectory: str
+    status: str
+    uploadOffset: int = Field(..., description="Bytes received contiguously from the start of the file")
+    receivedBytes: int = Field(..., description="Total bytes received across all chunks")
+    missingRanges: list[list[int]] = Field(default_factory=list, description="Byte ranges still to upload")
+    maxChunkSize: int
+    expiresAt: datetime
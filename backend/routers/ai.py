@@ -1,33 +1,336 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status, Depends
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel, Field
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Optional
 import httpx
+import json
+import logging
 
-from auth.middleware import get_current_user
+import database as db_module
+from auth.middleware import get_current_admin, get_current_user, get_current_user_optional
+from crud import conversation as conversation_crud
+from models.conversation import (
+    ConversationDetailResponse,
+    ConversationInDB,
+    ConversationListResponse,
+    ConversationMessage,
+    ConversationResponse
+)
 from models.user import UserInDB
 from config import settings
+from utils.ai_client import get_ai_client, get_auth_headers, iter_completion_deltas, merge_tool_call_deltas
+from utils.ai_cache import get_cached_reply, make_cache_key, purge_cache, store_reply
+from utils.ai_conversation import build_conversation_context, record_exchange
+from utils.ai_retrieval import build_context
+from utils.ai_tools import TOOL_DEFINITIONS, append_tool_results
+from utils.admission import AdmissionSlot, acquire_ai_slot, enforce_ai_rate_limit, get_admission_metrics
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/ai", tags=["AI Chatbot"])
 
+SYSTEM_PROMPT = "You are a helpful assistant for an HOA (Homeowners Association) management system. Help users with questions about HOA operations, financial management, project tracking, and document management."
+CHAT_MODEL = "gpt-3.5-turbo"
+CHAT_TEMPERATURE = 0.7
+CHAT_MAX_TOKENS = 500
+
 
 class ChatRequest(BaseModel):
     """Chat request model."""
     message: str = Field(..., min_length=1, description="User's message to the AI chatbot")
+    conversationId: Optional[str] = Field(None, description="Conversation to continue (requires authentication)")
 
 
 class ChatResponse(BaseModel):
     """Chat response model."""
     message: str = Field(..., description="AI's response message")
+    conversationId: Optional[str] = Field(None, description="Conversation the exchange was stored in")
+
+
+class CachePurgeResponse(BaseModel):
+    """Result of purging the AI response cache."""
+    memoryEntries: int = Field(..., description="Entries removed from the in-memory cache")
+    storedEntries: int = Field(..., description="Entries removed from the MongoDB cache")
+
+
+def get_cache_key(message: str, system_prompt: str) -> str:
+    """Get the response cache key for a user message with the current chat settings."""
+    return make_cache_key(system_prompt, CHAT_MODEL, CHAT_TEMPERATURE, message)
+
+
+def get_cache_headers(tier: Optional[str]) -> dict:
+    """
+    Get headers reporting whether a reply came from the cache.
+    
+    Args:
+        tier: Cache tier that served the reply ('memory' or 'mongo'), or None on a miss
+        
+    Returns:
+        X-Cache (and X-Cache-Tier on hits) headers
+    """
+    if tier is None:
+        return {"X-Cache": "MISS"}
+    return {"X-Cache": "HIT", "X-Cache-Tier": tier}
+
+
+def require_api_key() -> None:
+    """
+    Ensure the OpenAI API key is configured.
+    
+    Raises:
+        HTTPException: If the key is missing
+    """
+    if not settings.openai_api_key:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="OpenAI API key is not configured. Please set OPENAI_API_KEY environment variable."
+        )
+
+
+async def build_system_prompt(message: str, current_user: Optional[UserInDB]) -> str:
+    """
+    Build the system prompt, adding HOA records relevant to the message.
+    
+    Association records are only retrieved for authenticated users.
+    
+    Args:
+        message: User's message
+        current_user: Authenticated user, or None for anonymous requests
+        
+    Returns:
+        System prompt with retrieved context, or the base prompt if none applies
+    """
+    if current_user is None:
+        return SYSTEM_PROMPT
+    
+    context = await build_context(message)
+    if not context:
+        return SYSTEM_PROMPT
+    return (
+        f"{SYSTEM_PROMPT}\n\n"
+        "Records from this association's data that may be relevant. Use them when they "
+        "answer the question and say so when they do not:\n"
+        f"{context}"
+    )
+
+
+def build_chat_payload(
+    message: str,
+    system_prompt: str = SYSTEM_PROMPT,
+    history: Optional[list[dict]] = None,
+    allow_tools: bool = False
+) -> dict:
+    """
+    Build the chat completions request body for a user message.
+    
+    Args:
+        message: User's message
+        system_prompt: System prompt to send
+        history: Earlier conversation messages to send before the message
+        allow_tools: Offer the financial tools (authenticated requests only)
+        
+    Returns:
+        Request body for the completions API
+    """
+    payload = {
+        "model": CHAT_MODEL,
+        "messages": [
+            {
+                "role": "system",
+                "content": system_prompt
+            },
+            *(history or []),
+            {
+                "role": "user",
+                "content": message
+            }
+        ],
+        "temperature": CHAT_TEMPERATURE,
+        "max_tokens": CHAT_MAX_TOKENS
+    }
+    if allow_tools and settings.ai_tools_enabled:
+        payload["tools"] = TOOL_DEFINITIONS
+        payload["tool_choice"] = "auto"
+    return payload
+
+
+@dataclass
+class ChatTurn:
+    """One question to the chatbot, with the context it is answered in."""
+    message: str
+    system_prompt: str
+    cache_key: Optional[str] = None  # None when the reply depends on conversation history
+    conversation: Optional[ConversationInDB] = None
+    history: list[dict] = field(default_factory=list)
+    needs_summary: bool = False
+    user_id: Optional[str] = None  # Signed-in asker; tools and retrieved records are only used for them
+    
+    def build_payload(self) -> dict:
+        return build_chat_payload(self.message, self.system_prompt, self.history, allow_tools=self.user_id is not None)
+    
+    def get_conversation_id(self) -> Optional[str]:
+        return self.conversation.id if self.conversation else None
+    
+    def get_headers(self) -> dict:
+        return {"X-Conversation-Id": self.conversation.id} if self.conversation else {}
+
+
+async def open_conversation(request: ChatRequest, current_user: Optional[UserInDB]) -> Optional[ConversationInDB]:
+    """
+    Get the existing conversation a chat request continues.
+    
+    Requests without a conversationId get None; for authenticated requests
+    a new conversation is created once a reply has been produced (see
+    complete_chat_turn).
+    
+    Raises:
+        HTTPException: If a conversation is requested without authentication,
+            or it does not exist or belongs to another user
+    """
+    if request.conversationId is None:
+        return None
+    
+    if current_user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Sign in to continue a conversation",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+    
+    conversation = await conversation_crud.get_conversation(request.conversationId, current_user.id)
+    if conversation is None:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    return conversation
+
+
+async def prepare_chat_turn(request: ChatRequest, current_user: Optional[UserInDB]) -> ChatTurn:
+    """Resolve the conversation, history and system prompt for a chat request."""
+    conversation = await open_conversation(request, current_user)
+    turn = ChatTurn(
+        message=request.message,
+        system_prompt=await build_system_prompt(request.message, current_user),
+        conversation=conversation,
+        user_id=current_user.id if current_user else None
+    )
+    
+    if conversation is not None:
+        turn.history, turn.needs_summary = await build_conversation_context(conversation)
+    # Replies that depend on earlier messages are not shared through the cache
+    if not turn.history:
+        turn.cache_key = get_cache_key(turn.message, turn.system_prompt)
+    return turn
+
+
+async def complete_chat_turn(turn: ChatTurn, reply: str, cacheable: bool) -> None:
+    """
+    Store a finished reply in the response cache and the conversation log.
+    
+    For authenticated turns without a conversation, this starts one and
+    sets it on the turn, so no conversation exists for requests that never
+    got a reply.
+    
+    Args:
+        turn: Answered chat turn
+        reply: Reply message
+        cacheable: Whether the reply may be served to other askers
+    """
+    if cacheable and turn.cache_key:
+        await store_reply(turn.cache_key, reply)
+    
+    if turn.user_id is not None and db_module.database is not None:
+        try:
+            turn.conversation = await record_exchange(
+                turn.conversation, turn.user_id, turn.message, reply, turn.needs_summary
+            )
+        except Exception as e:
+            logger.warning(f"Failed to record AI conversation {turn.get_conversation_id()}: {e}")
 
 
-@router.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+def tools_offered(payload: dict) -> bool:
+    """Check whether a completions request offered tools, so tool calls may be run."""
+    return "tools" in payload
+
+
+def start_tool_round(payload: dict, round_number: int) -> None:
+    """
+    Prepare the payload for a tool-calling round.
+    
+    The final allowed round disables tool calls so the model has to answer.
+    
+    Args:
+        payload: Completions request body (updated in place)
+        round_number: Zero-based round number
+    """
+    if tools_offered(payload) and round_number >= settings.ai_tool_max_rounds:
+        payload["tool_choice"] = "none"
+
+
+def raise_for_upstream_error(status_code: int, body: bytes) -> None:
+    """
+    Map a failed completions API response to an HTTPException.
+    
+    Args:
+        status_code: Upstream HTTP status code
+        body: Upstream response body
+        
+    Raises:
+        HTTPException: 503 for quota errors, 502 otherwise
+    """
+    try:
+        error_data = json.loads(body).get("error", {})
+    except (ValueError, AttributeError):
+        error_data = {}
+    error_message = error_data.get("message", "Unknown error")
+    
+    # Handle quota exceeded error specifically
+    if status_code == 429 or "quota" in error_message.lower():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="The AI chatbot service is temporarily unavailable due to API quota limits. Please try again later or contact support to upgrade the service plan."
+        )
+    
+    # Handle other API errors
+    raise HTTPException(
+        status_code=status.HTTP_502_BAD_GATEWAY,
+        detail=f"OpenAI API error: {error_message}"
+    )
+
+
+@router.post("/chat", response_model=ChatResponse, dependencies=[Depends(enforce_ai_rate_limit)])
+async def chat(
+    request: ChatRequest,
+    response: Response,
+    current_user: Optional[UserInDB] = Depends(get_current_user_optional)
+):
     """
     Send a message to the AI chatbot and receive a response.
     
     This endpoint is publicly accessible and does not require authentication.
+    Anonymous requests get general answers only: association records are
+    added to the prompt for authenticated requests.
+    
+    Authenticated requests are stored as a conversation: pass the returned
+    `conversationId` to continue it. The assistant then sees a summary of
+    older messages plus the most recent ones, within a fixed token budget.
+    
+    Repeated questions are answered from the response cache; the `X-Cache`
+    header is `HIT` or `MISS`.
+    
+    Requests are rate limited per client (429) and upstream calls are capped
+    per process; when every slot is busy and the queue is full, the response
+    is 503. Both carry a `Retry-After` header.
+    
+    For authenticated requests, the model may call financial aggregation
+    tools (category totals, project budget status, vendor bid comparison)
+    before answering. Replies that used tools are not cached, since they
+    reflect live data.
     
     Args:
         request: Chat request containing the user's message
+        response: Outgoing response, used to set cache headers
+        current_user: Authenticated user, if a token was sent
         
     Returns:
         AI's response message
@@ -36,63 +339,55 @@ async def chat(request: ChatRequest):
         HTTPException: If OpenAI API key is missing or API call fails
     """
     # Check for OpenAI API key
-    if not settings.openai_api_key:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="OpenAI API key is not configured. Please set OPENAI_API_KEY environment variable."
-        )
+    require_api_key()
     
+    turn = await prepare_chat_turn(request, current_user)
+    
+    cached_message, tier = await get_cached_reply(turn.cache_key) if turn.cache_key else (None, None)
+    if cached_message is not None:
+        await complete_chat_turn(turn, cached_message, cacheable=False)
+        response.headers.update({**turn.get_headers(), **get_cache_headers(tier)})
+        return ChatResponse(message=cached_message, conversationId=turn.get_conversation_id())
+    
+    slot = await acquire_ai_slot()
     try:
-        # Make direct API call to OpenAI using httpx
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {settings.openai_api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "gpt-3.5-turbo",
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "You are a helpful assistant for an HOA (Homeowners Association) management system. Help users with questions about HOA operations, financial management, project tracking, and document management."
-                        },
-                        {
-                            "role": "user",
-                            "content": request.message
-                        }
-                    ],
-                    "temperature": 0.7,
-                    "max_tokens": 500
-                },
-                timeout=30.0
+        payload = turn.build_payload()
+        used_tools = False
+        
+        # Bounded tool-calling loop: each round either answers or requests data
+        for round_number in range(settings.ai_tool_max_rounds + 1):
+            start_tool_round(payload, round_number)
+            
+            # Reuse pooled keep-alive connections to the completions API
+            upstream = await get_ai_client().post(
+                "/chat/completions",
+                headers=get_auth_headers(),
+                json=payload
             )
             
-            if response.status_code != 200:
-                error_data = response.json().get("error", {})
-                error_message = error_data.get("message", "Unknown error")
-                error_type = error_data.get("type", "")
-                
-                # Handle quota exceeded error specifically
-                if response.status_code == 429 or "quota" in error_message.lower():
-                    raise HTTPException(
-                        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                        detail="The AI chatbot service is temporarily unavailable due to API quota limits. Please try again later or contact support to upgrade the service plan."
-                    )
-                
-                # Handle other API errors
-                raise HTTPException(
-                    status_code=status.HTTP_502_BAD_GATEWAY,
-                    detail=f"OpenAI API error: {error_message}"
-                )
+            if upstream.status_code != 200:
+                raise_for_upstream_error(upstream.status_code, upstream.content)
             
             # Extract the response message
-            data = response.json()
-            ai_message = data["choices"][0]["message"]["content"]
+            data = upstream.json()
+            assistant_message = data["choices"][0]["message"]
+            # Tool calls are never run for a payload that did not offer tools
+            if not assistant_message.get("tool_calls") or not tools_offered(payload) or round_number == settings.ai_tool_max_rounds:
+                break
             
-            return ChatResponse(message=ai_message)
+            used_tools = True
+            await append_tool_results(payload["messages"], assistant_message)
         
+        ai_message = assistant_message.get("content") or ""
+        
+        # Answers built from live data are not cached
+        await complete_chat_turn(turn, ai_message, cacheable=not used_tools)
+        response.headers.update({**turn.get_headers(), **get_cache_headers(None)})
+        
+        return ChatResponse(message=ai_message, conversationId=turn.get_conversation_id())
+    
+    except HTTPException:
+        raise
     except httpx.HTTPError as e:
         # Handle HTTP errors
         raise HTTPException(
@@ -104,4 +399,300 @@ async def chat(request: ChatRequest):
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"An error occurred while processing your request: {str(e)}"
-        )
\ No newline at end of file
+        )
+    finally:
+        slot.release()
+
+
+def format_sse(data: dict, event: str = None) -> str:
+    """
+    Format one server-sent event.
+    
+    Args:
+        data: Event payload (sent as JSON so newlines in tokens are preserved)
+        event: Optional event name
+        
+    Returns:
+        Event text terminated by a blank line
+    """
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+def format_done_event(turn: ChatTurn) -> str:
+    """Format the final 'done' event, carrying the conversation ID if the exchange was stored."""
+    conversation_id = turn.get_conversation_id()
+    return format_sse({"conversationId": conversation_id} if conversation_id else {}, event="done")
+
+
+async def replay_cached_reply(message: str, turn: ChatTurn) -> AsyncIterator[str]:
+    """Send a cached reply as a single content event followed by 'done'."""
+    yield format_sse({"content": message})
+    yield format_done_event(turn)
+
+
+async def open_completion_stream(payload: dict) -> httpx.Response:
+    """
+    Start a streamed completion.
+    
+    Args:
+        payload: Completions request body (without the stream flag)
+        
+    Returns:
+        Open streaming response; the caller must close it
+        
+    Raises:
+        HTTPException: If the upstream call fails or is rejected
+    """
+    client = get_ai_client()
+    upstream_request = client.build_request(
+        "POST",
+        "/chat/completions",
+        headers=get_auth_headers(),
+        json={**payload, "stream": True}
+    )
+    
+    try:
+        upstream = await client.send(upstream_request, stream=True)
+    except httpx.HTTPError as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"OpenAI API error: {str(e)}"
+        )
+    
+    if upstream.status_code != 200:
+        body = await upstream.aread()
+        await upstream.aclose()
+        raise_for_upstream_error(upstream.status_code, body)
+    
+    return upstream
+
+
+async def relay_chat_stream(
+    upstream: httpx.Response,
+    http_request: Request,
+    turn: ChatTurn,
+    payload: dict,
+    slot: AdmissionSlot
+) -> AsyncIterator[str]:
+    """
+    Relay a streamed completion to the browser as server-sent events.
+    
+    If the model requests tool calls, they are run and a follow-up completion
+    is streamed, up to the configured number of rounds. If the client
+    disconnects, relaying stops and the upstream request is closed, so the
+    completion stops consuming quota.
+    
+    Args:
+        upstream: Open streaming response from the completions API
+        http_request: Incoming request, checked for client disconnects
+        turn: Chat turn the completed reply is cached and recorded for
+        payload: Request body of the first round, extended with tool results
+        slot: Upstream concurrency slot, released when the stream ends
+        
+    Yields:
+        'message' events with content fragments, then a 'done' event
+    """
+    parts = []
+    used_tools = False
+    try:
+        for round_number in range(settings.ai_tool_max_rounds + 1):
+            round_parts = []
+            tool_calls: dict[int, dict] = {}
+            try:
+                async for delta in iter_completion_deltas(upstream):
+                    if await http_request.is_disconnected():
+                        return
+                    if delta.get("tool_calls"):
+                        merge_tool_call_deltas(tool_calls, delta["tool_calls"])
+                    content = delta.get("content")
+                    if content:
+                        round_parts.append(content)
+                        yield format_sse({"content": content})
+            finally:
+                await upstream.aclose()
+            
+            parts += round_parts
+            if not tool_calls or not tools_offered(payload) or round_number == settings.ai_tool_max_rounds:
+                break
+            
+            used_tools = True
+            await append_tool_results(payload["messages"], {
+                "role": "assistant",
+                "content": "".join(round_parts) or None,
+                "tool_calls": [tool_calls[index] for index in sorted(tool_calls)]
+            })
+            start_tool_round(payload, round_number + 1)
+            upstream = await open_completion_stream(payload)
+        
+        # Only complete replies that did not use live data are cached
+        if parts:
+            await complete_chat_turn(turn, "".join(parts), cacheable=not used_tools)
+        yield format_done_event(turn)
+    except (httpx.HTTPError, HTTPException, ValueError) as e:
+        logger.warning(f"AI chat stream failed: {e}")
+        yield format_sse({"detail": "The AI response was interrupted. Please try again."}, event="error")
+    finally:
+        slot.release()
+
+
+@router.post("/chat/stream", dependencies=[Depends(enforce_ai_rate_limit)])
+async def chat_stream(
+    request: ChatRequest,
+    http_request: Request,
+    current_user: Optional[UserInDB] = Depends(get_current_user_optional)
+):
+    """
+    Send a message to the AI chatbot and stream the response as it is generated.
+    
+    This endpoint is publicly accessible and does not require authentication.
+    As for `/ai/chat`, association records are only used for authenticated requests.
+    
+    Responds with `text/event-stream`. Each event's data is JSON:
+    - default events: `{"content": "<text fragment>"}`
+    - `done`: the response is complete; `{"conversationId": "..."}` when the
+      exchange was stored in a conversation
+    - `error`: `{"detail": "..."}` if the upstream stream failed midway
+    
+    Closing the connection cancels the upstream completion. Cached replies
+    are sent as a single event, with `X-Cache: HIT`. A stream holds an
+    upstream concurrency slot until it ends.
+    
+    Conversations work as for `/ai/chat`. The conversation ID is returned in
+    the `done` event, and in the `X-Conversation-Id` header when continuing
+    a conversation or replaying a cached reply.
+    
+    Raises:
+        HTTPException: If OpenAI API key is missing, the client is rate limited,
+            the service is saturated or the upstream call is rejected
+    """
+    require_api_key()
+    
+    stream_headers = {
+        "Cache-Control": "no-cache",
+        # Stop reverse proxies from buffering the event stream
+        "X-Accel-Buffering": "no"
+    }
+    
+    turn = await prepare_chat_turn(request, current_user)
+    stream_headers.update(turn.get_headers())
+    
+    cached_message, tier = await get_cached_reply(turn.cache_key) if turn.cache_key else (None, None)
+    if cached_message is not None:
+        await complete_chat_turn(turn, cached_message, cacheable=False)
+        return StreamingResponse(
+            replay_cached_reply(cached_message, turn),
+            media_type="text/event-stream",
+            headers={**stream_headers, **turn.get_headers(), **get_cache_headers(tier)}
+        )
+    
+    payload = turn.build_payload()
+    start_tool_round(payload, 0)
+    slot = await acquire_ai_slot()
+    try:
+        upstream = await open_completion_stream(payload)
+    except BaseException:
+        slot.release()
+        raise
+    
+    return StreamingResponse(
+        relay_chat_stream(upstream, http_request, turn, payload, slot),
+        media_type="text/event-stream",
+        headers={**stream_headers, **get_cache_headers(None)},
+        # Also covers a client that disconnects before the stream starts
+        background=BackgroundTask(slot.release)
+    )
+
+
+@router.delete("/cache", response_model=CachePurgeResponse)
+async def purge_response_cache(current_user: UserInDB = Depends(get_current_admin)):
+    """
+    Remove every cached AI reply, in memory and in MongoDB.
+    
+    Use after changing the system prompt or when cached answers are out of date.
+    Requires an administrator (a user listed in ADMIN_EMAILS).
+    """
+    return CachePurgeResponse(**await purge_cache())
+
+
+def build_conversation_response(conversation: ConversationInDB) -> ConversationResponse:
+    """Convert a stored conversation to its API representation."""
+    return ConversationResponse(
+        id=conversation.id,
+        title=conversation.title,
+        messageCount=conversation.messageCount,
+        createdAt=conversation.createdAt,
+        updatedAt=conversation.updatedAt
+    )
+
+
+@router.get("/conversations", response_model=ConversationListResponse)
+async def list_conversations(
+    limit: int = Query(50, ge=1, le=100, description="Maximum number of results"),
+    skip: int = Query(0, ge=0, description="Number of results to skip"),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """
+    List the current user's AI conversations, most recently active first.
+    
+    Requires authentication.
+    """
+    conversations, total = await conversation_crud.get_conversations(current_user.id, limit=limit, skip=skip)
+    
+    return ConversationListResponse(
+        conversations=[build_conversation_response(conversation) for conversation in conversations],
+        total=total
+    )
+
+
+@router.get("/conversations/{conversation_id}", response_model=ConversationDetailResponse)
+async def get_conversation(
+    conversation_id: str,
+    limit: int = Query(100, ge=1, le=500, description="Number of most recent messages to return"),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """
+    Get one of the current user's AI conversations with its latest messages.
+    
+    Requires authentication. Returns 404 if the conversation is not found.
+    """
+    conversation = await conversation_crud.get_conversation(conversation_id, current_user.id)
+    if conversation is None:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    
+    messages = await conversation_crud.get_messages(conversation.id, limit=limit, newest=True)
+    
+    return ConversationDetailResponse(
+        **build_conversation_response(conversation).model_dump(),
+        messages=[ConversationMessage(**message) for message in messages]
+    )
+
+
+@router.delete("/conversations/{conversation_id}")
+async def delete_conversation(
+    conversation_id: str,
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """
+    Delete one of the current user's AI conversations and all its messages.
+    
+    Requires authentication. Returns 404 if the conversation is not found.
+    """
+    success = await conversation_crud.delete_conversation(conversation_id, current_user.id)
+    
+    if not success:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    
+    return {"message": "Conversation deleted successfully"}
+
+
+@router.get("/metrics")
+async def admission_metrics(current_user: UserInDB = Depends(get_current_admin)):
+    """
+    Get AI admission control metrics.
+    
+    Reports in-flight and queued upstream calls, queue wait percentiles and
+    counts of admitted and rejected requests for this process.
+    Requires an administrator (a user listed in ADMIN_EMAILS).
+    """
+    return get_admission_metrics()
@@ -3,6 +3,7 @@ from typing import Dict, Any, List
 from datetime import datetime
 
 import database as db_module
+from crud import dashboard as dashboard_crud
 from auth.middleware import get_current_user
 from models.user import UserInDB
 from bson import ObjectId
@@ -25,49 +26,17 @@ async def get_dashboard_summary(
     - **recentTransactions**: 5 most recent transactions (income + expenses)
     """
     try:
-        # Get total income
-        income_pipeline = [
-            {
-                "$group": {
-                    "_id": None,
-                    "total": {"$sum": "$amount"}
-                }
-            }
-        ]
-        income_result = await db_module.database.income.aggregate(income_pipeline).to_list(1)
-        total_income = income_result[0]["total"] if income_result else 0.0
-        
-        # Get total expenses
-        expenses_pipeline = [
-            {
-                "$group": {
-                    "_id": None,
-                    "total": {"$sum": "$amount"}
-                }
-            }
-        ]
-        expenses_result = await db_module.database.expenses.aggregate(expenses_pipeline).to_list(1)
-        total_expenses = expenses_result[0]["total"] if expenses_result else 0.0
+        # Get total income and expenses
+        total_income = await dashboard_crud.get_collection_total("income")
+        total_expenses = await dashboard_crud.get_collection_total("expenses")
         
         # Calculate balance
         total_balance = total_income - total_expenses
         
         # Get expenses by category
-        category_pipeline = [
-            {
-                "$group": {
-                    "_id": "$category",
-                    "total": {"$sum": "$amount"},
-                    "count": {"$sum": 1}
-                }
-            },
-            {
-                "$sort": {"total": -1}
-            }
-        ]
-        category_results = await db_module.database.expenses.aggregate(category_pipeline).to_list(None)
+        category_results = await dashboard_crud.get_expense_category_totals()
         expenses_by_category = {
-            item["_id"]: {
+            item["category"]: {
                 "total": item["total"],
                 "count": item["count"]
             }
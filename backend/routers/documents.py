@@ -1,17 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, UploadFile, File, Form
 from typing import Optional
-from pathlib import Path
 
 from models.document import (
     DocumentCreate,
     DocumentUpdate,
     DocumentResponse,
-    DocumentListResponse
+    DocumentListResponse,
+    DocumentBatchResponse,
+    StorageUsageResponse
 )
 from crud import document as document_crud
+from crud import version as version_crud
 from auth.middleware import get_current_user
 from models.user import UserInDB
-from utils.file_upload import save_file, get_file_extension
+from models.batch import BatchGetRequest
+from utils.file_upload import save_upload, get_file_extension
+from utils.chunked_upload import finalize_upload_session
+from utils.thumbnails import schedule_thumbnail
+from utils.text_extraction import schedule_text_extraction
+from utils.ai_retrieval import mark_record_changed
+from utils.json_response import model_response, to_response_model
+from utils.etag import compute_etag, etag_matches, not_modified, with_etag
+from utils.sparse_fields import FIELDS_QUERY_DESCRIPTION, build_include, build_projection, parse_fields
 
 router = APIRouter(prefix="/documents", tags=["documents"])
 
@@ -34,6 +44,65 @@ def format_file_size(size_bytes: int) -> str:
         return f"{size_bytes / (1024 * 1024):.1f} MB"
 
 
+async def _create_document_record(
+    document_data: DocumentCreate,
+    file_url: str,
+    filename: str,
+    file_size_bytes: int,
+    current_user: UserInDB
+) -> DocumentResponse:
+    """
+    Create the document record for a file already saved to storage.
+    
+    Args:
+        document_data: Validated document metadata
+        file_url: Relative URL of the saved file
+        filename: Original filename (used for the file type)
+        file_size_bytes: Original file size in bytes, as received
+        current_user: User uploading the document
+        
+    Returns:
+        The created document response
+    """
+    # Get file metadata
+    file_extension = get_file_extension(filename)
+    
+    # Create document in database
+    document = await document_crud.create_document(
+        document_data,
+        current_user.id,
+        file_url,
+        file_extension,
+        file_size_bytes
+    )
+    mark_record_changed("document", document.id)
+    
+    # Generate a preview thumbnail in the background
+    schedule_thumbnail(
+        file_url,
+        lambda thumbnail_url: document_crud.set_document_thumbnail(document.id, thumbnail_url)
+    )
+    
+    # Index the file contents for search in the background
+    schedule_text_extraction(document.id, file_url)
+    
+    return DocumentResponse(
+        id=document.id,
+        title=document.title,
+        category=document.category,
+        description=document.description,
+        fileUrl=document.fileUrl,
+        thumbnailUrl=document.thumbnailUrl,
+        fileType=document.fileType,
+        fileSize=format_file_size(document.fileSize),
+        fileSizeBytes=document.fileSize,
+        uploadedBy=document.uploadedBy,
+        createdAt=document.createdAt,
+        updatedAt=document.updatedAt,
+        archivedAt=document.archivedAt
+    )
+
+
 @router.post("", response_model=DocumentResponse, status_code=201)
 async def create_document(
     title: str = Form(...),
@@ -55,15 +124,7 @@ async def create_document(
     """
     try:
         # Handle file upload
-        file_url = await save_file(file, subdirectory="documents")
-        
-        # Get file metadata
-        file_extension = get_file_extension(file.filename)
-        
-        # Calculate file size (read file to get size)
-        file_path = Path(file_url.lstrip("/"))
-        file_size_bytes = file_path.stat().st_size if file_path.exists() else 0
-        file_size = format_file_size(file_size_bytes)
+        file_url, file_size_bytes = await save_upload(file, subdirectory="documents")
         
         # Create document data
         document_data = DocumentCreate(
@@ -72,28 +133,42 @@ async def create_document(
             description=description
         )
         
-        # Create document in database
-        document = await document_crud.create_document(
-            document_data,
-            current_user.id,
-            file_url,
-            file_extension,
-            file_size
+        return await _create_document_record(document_data, file_url, file.filename, file_size_bytes, current_user)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to create document: {str(e)}")
+
+
+@router.post("/from-upload", response_model=DocumentResponse, status_code=201)
+async def create_document_from_upload(
+    uploadId: str = Form(...),
+    title: str = Form(...),
+    category: str = Form(...),
+    description: Optional[str] = Form(None),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """
+    Create a document from a completed resumable upload.
+    
+    Accepts the same metadata as `POST /documents`, with **uploadId** referring
+    to an upload session (created with subdirectory "documents") whose chunks
+    have all been received.
+    
+    Returns the created document with file URL.
+    """
+    try:
+        # Validate before promoting the staged file
+        document_data = DocumentCreate(
+            title=title,
+            category=category,
+            description=description
         )
         
-        return DocumentResponse(
-            id=document.id,
-            title=document.title,
-            category=document.category,
-            description=document.description,
-            fileUrl=document.fileUrl,
-            fileType=document.fileType,
-            fileSize=document.fileSize,
-            uploadedBy=document.uploadedBy,
-            createdAt=document.createdAt,
-            updatedAt=document.updatedAt,
-            archivedAt=document.archivedAt
-        )
+        async with finalize_upload_session(uploadId, "documents", current_user) as (file_url, filename, file_size_bytes):
+            return await _create_document_record(document_data, file_url, filename, file_size_bytes, current_user)
     except HTTPException:
         raise
     except ValueError as e:
@@ -104,11 +179,13 @@ async def create_document(
 
 @router.get("", response_model=DocumentListResponse)
 async def list_documents(
+    request: Request,
     category: Optional[str] = Query(None, description="Filter by category"),
-    search: Optional[str] = Query(None, description="Search in title and description"),
+    search: Optional[str] = Query(None, description="Search in title, description and file contents"),
     archived: bool = Query(False, description="Include archived documents"),
     limit: int = Query(50, ge=1, le=100, description="Maximum number of results"),
     skip: int = Query(0, ge=0, description="Number of results to skip"),
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
     current_user: UserInDB = Depends(get_current_user)
 ):
     """
@@ -116,45 +193,108 @@ async def list_documents(
     
     Supports filtering by:
     - **category**: Exact category match
-    - **search**: Search in title and description (case-insensitive)
+    - **search**: Search in title and description (case-insensitive) and in
+      text extracted from PDF/DOCX/XLSX files
     - **archived**: Include archived documents (default: false)
     
     Results are paginated and sorted by creation date (newest first).
+    
+    Pass **fields** (e.g., `id,title,category,fileSize`) to return only those
+    fields of each document; id is always included.
     """
+    field_names = parse_fields(fields, DocumentResponse)
     try:
+        etag = compute_etag(request, await version_crud.get_collection_version(
+            "documents",
+            await document_crud.build_document_query(category, search, archived)
+        ))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
         documents, total = await document_crud.get_documents(
             category=category,
             search=search,
             archived=archived,
             limit=limit,
-            skip=skip
+            skip=skip,
+            projection=build_projection(field_names, {"fileSizeBytes": "fileSize"})
         )
         
-        document_responses = [
-            DocumentResponse(
-                id=doc.id,
-                title=doc.title,
-                category=doc.category,
-                description=doc.description,
-                fileUrl=doc.fileUrl,
-                fileType=doc.fileType,
-                fileSize=doc.fileSize,
-                uploadedBy=doc.uploadedBy,
-                createdAt=doc.createdAt,
-                updatedAt=doc.updatedAt,
-                archivedAt=doc.archivedAt
+        # fileSize is only read when fileSize or fileSizeBytes was requested
+        size_requested = field_names is None or not field_names.isdisjoint({"fileSize", "fileSizeBytes"})
+        return with_etag(model_response(DocumentListResponse.model_construct(
+            documents=[
+                to_response_model(
+                    DocumentResponse,
+                    doc,
+                    fileSize=format_file_size(doc.fileSize),
+                    fileSizeBytes=doc.fileSize
+                ) if size_requested else to_response_model(DocumentResponse, doc)
+                for doc in documents
+            ],
+            total=total
+        ), include=build_include("documents", field_names)), etag)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to retrieve documents: {str(e)}")
+
+
+@router.post("/batch-get", response_model=DocumentBatchResponse)
+async def batch_get_documents(
+    request_data: BatchGetRequest,
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """
+    Get several documents by ID in one request.
+    
+    - **ids**: Up to 100 document IDs
+    
+    Returns one entry per requested ID, in request order, with null for
+    IDs that were not found; those IDs are also listed in **missing**.
+    """
+    try:
+        found = await document_crud.get_documents_by_ids(request_data.ids)
+        responses = {
+            document_id: to_response_model(
+                DocumentResponse,
+                doc,
+                fileSize=format_file_size(doc.fileSize),
+                fileSizeBytes=doc.fileSize
             )
-            for doc in documents
-        ]
+            for document_id, doc in found.items()
+        }
         
-        return DocumentListResponse(documents=document_responses, total=total)
+        return model_response(DocumentBatchResponse.model_construct(
+            documents=[responses.get(document_id) for document_id in request_data.ids],
+            missing=[document_id for document_id in request_data.ids if document_id not in found]
+        ))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve documents: {str(e)}")
 
 
+@router.get("/storage", response_model=StorageUsageResponse)
+async def get_storage_usage(
+    archived: bool = Query(False, description="Include archived documents"),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """
+    Get document storage usage aggregated on the server.
+    
+    Returns:
+    - **totalBytes** / **totalFiles**: Overall usage
+    - **byCategory**: Bytes and file count per category (largest first)
+    - **byFileType**: Bytes and file count per file type (largest first)
+    """
+    try:
+        return await document_crud.get_storage_usage(archived=archived)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to retrieve storage usage: {str(e)}")
+
+
 @router.get("/{document_id}", response_model=DocumentResponse)
 async def get_document(
     document_id: str,
+    request: Request,
+    response: Response,
     current_user: UserInDB = Depends(get_current_user)
 ):
     """
@@ -162,6 +302,13 @@ async def get_document(
     
     Returns 404 if document not found.
     """
+    version = await version_crud.get_record_version("documents", document_id)
+    if version is not None:
+        etag = compute_etag(request, version)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        with_etag(response, etag)
+    
     document = await document_crud.get_document_by_id(document_id)
     
     if not document:
@@ -173,8 +320,10 @@ async def get_document(
         category=document.category,
         description=document.description,
         fileUrl=document.fileUrl,
+        thumbnailUrl=document.thumbnailUrl,
         fileType=document.fileType,
-        fileSize=document.fileSize,
+        fileSize=format_file_size(document.fileSize),
+        fileSizeBytes=document.fileSize,
         uploadedBy=document.uploadedBy,
         createdAt=document.createdAt,
         updatedAt=document.updatedAt,
@@ -208,14 +357,18 @@ async def update_document(
         if not document:
             raise HTTPException(status_code=404, detail="Document not found")
         
+        mark_record_changed("document", document_id)
+        
         return DocumentResponse(
             id=document.id,
             title=document.title,
             category=document.category,
             description=document.description,
             fileUrl=document.fileUrl,
+            thumbnailUrl=document.thumbnailUrl,
             fileType=document.fileType,
-            fileSize=document.fileSize,
+            fileSize=format_file_size(document.fileSize),
+            fileSizeBytes=document.fileSize,
             uploadedBy=document.uploadedBy,
             createdAt=document.createdAt,
             updatedAt=document.updatedAt,
@@ -245,4 +398,6 @@ async def archive_document(
     if not success:
         raise HTTPException(status_code=404, detail="Document not found")
     
+    mark_record_changed("document", document_id)
+    
     return {"message": "Document archived successfully"}
\ No newline at end of file
@@ -1,10 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, UploadFile, File
+from fastapi.responses import StreamingResponse
 from typing import Optional
 
-from models.expense import ExpenseCreate, ExpenseResponse, ExpenseListResponse
+from models.expense import ExpenseCreate, ExpenseResponse, ExpenseListResponse, ExpenseBatchResponse, ReceiptUploadResponse
 from crud import expense as expense_crud
+from crud import receipt as receipt_crud
+from crud import version as version_crud
 from auth.middleware import get_current_user
 from models.user import UserInDB
+from models.batch import BatchGetRequest
+from config import settings
+from utils.file_upload import save_upload
+from utils.ai_retrieval import mark_finances_changed
+from utils.image_optimizer import optimize_receipt
+from utils.json_response import model_response, to_response_model
+from utils.ndjson import NDJSON_MEDIA_TYPE, iter_ndjson
+from utils.etag import compute_etag, etag_matches, not_modified, with_etag
+from utils.sparse_fields import FIELDS_QUERY_DESCRIPTION, build_include, build_projection, parse_fields, select_fields
 
 router = APIRouter(prefix="/expenses", tags=["expenses"])
 
@@ -27,6 +39,7 @@ async def create_expense(
     """
     try:
         expense = await expense_crud.create_expense(expense_data, current_user.id)
+        mark_finances_changed()
         return ExpenseResponse(
             id=expense.id,
             date=expense.date,
@@ -43,14 +56,51 @@ async def create_expense(
         raise HTTPException(status_code=500, detail=f"Failed to create expense: {str(e)}")
 
 
+@router.post("/receipts", response_model=ReceiptUploadResponse, status_code=201)
+async def upload_receipt(
+    file: UploadFile = File(...),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """
+    Upload a receipt file to attach to an expense.
+    
+    - **file**: Receipt file (max 10MB, PDF/JPG/PNG)
+    
+    Photos are downscaled, stripped of metadata and re-encoded as JPEG.
+    Use the returned **receiptUrl** when creating the expense.
+    """
+    try:
+        file_url, file_size = await save_upload(file, subdirectory="receipts")
+        receipt_url, original_size, stored_size = await optimize_receipt(file_url, file_size)
+        
+        await receipt_crud.create_receipt_record(
+            receipt_url,
+            original_size,
+            stored_size,
+            current_user.id
+        )
+        
+        return ReceiptUploadResponse(
+            receiptUrl=receipt_url,
+            originalSize=original_size,
+            storedSize=stored_size
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to upload receipt: {str(e)}")
+
+
 @router.get("", response_model=ExpenseListResponse)
 async def list_expenses(
+    request: Request,
     category: Optional[str] = Query(None, description="Filter by category"),
     vendor: Optional[str] = Query(None, description="Filter by vendor name"),
     projectId: Optional[str] = Query(None, description="Filter by project ID"),
     search: Optional[str] = Query(None, description="Search in description and vendor"),
     limit: int = Query(50, ge=1, le=100, description="Maximum number of results"),
     skip: int = Query(0, ge=0, description="Number of results to skip"),
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
     current_user: UserInDB = Depends(get_current_user)
 ):
     """
@@ -63,41 +113,103 @@ async def list_expenses(
     - **search**: Search across description and vendor (case-insensitive)
     
     Results are paginated and sorted by date (newest first).
+    
+    Pass **fields** (e.g., `id,date,amount,vendor`) to return only those
+    fields of each expense; id is always included.
     """
+    field_names = parse_fields(fields, ExpenseResponse)
     try:
+        etag = compute_etag(request, await version_crud.get_collection_version(
+            "expenses",
+            expense_crud.build_expense_query(category, vendor, projectId, search)
+        ))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
         expenses, total = await expense_crud.get_expenses(
             category=category,
             vendor=vendor,
             project_id=projectId,
             search=search,
             limit=limit,
-            skip=skip
+            skip=skip,
+            projection=build_projection(field_names)
         )
         
-        expense_responses = [
-            ExpenseResponse(
-                id=exp.id,
-                date=exp.date,
-                amount=exp.amount,
-                category=exp.category,
-                vendor=exp.vendor,
-                description=exp.description,
-                projectId=exp.projectId,
-                receiptUrl=exp.receiptUrl,
-                createdBy=exp.createdBy,
-                createdAt=exp.createdAt
-            )
-            for exp in expenses
-        ]
+        return with_etag(model_response(ExpenseListResponse.model_construct(
+            expenses=[to_response_model(ExpenseResponse, exp) for exp in expenses],
+            total=total
+        ), include=build_include("expenses", field_names)), etag)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to retrieve expenses: {str(e)}")
+
+
+@router.post("/batch-get", response_model=ExpenseBatchResponse)
+async def batch_get_expenses(
+    request_data: BatchGetRequest,
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """
+    Get several expenses by ID in one request.
+    
+    - **ids**: Up to 100 expense IDs
+    
+    Returns one entry per requested ID, in request order, with null for
+    IDs that were not found; those IDs are also listed in **missing**.
+    """
+    try:
+        found = await expense_crud.get_expenses_by_ids(request_data.ids)
+        responses = {
+            expense_id: to_response_model(ExpenseResponse, exp)
+            for expense_id, exp in found.items()
+        }
         
-        return ExpenseListResponse(expenses=expense_responses, total=total)
+        return model_response(ExpenseBatchResponse.model_construct(
+            expenses=[responses.get(expense_id) for expense_id in request_data.ids],
+            missing=[expense_id for expense_id in request_data.ids if expense_id not in found]
+        ))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve expenses: {str(e)}")
 
 
+@router.get("/export.ndjson")
+async def export_expenses(
+    category: Optional[str] = Query(None, description="Filter by category"),
+    vendor: Optional[str] = Query(None, description="Filter by vendor name"),
+    projectId: Optional[str] = Query(None, description="Filter by project ID"),
+    search: Optional[str] = Query(None, description="Search in description and vendor"),
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """
+    Export every matching expense as newline-delimited JSON.
+    
+    Takes the same filters and **fields** as the expense list, without
+    pagination. Rows are sorted by date (newest first), one expense object
+    per line, and streamed as they are read from the database.
+    """
+    field_names = parse_fields(fields, ExpenseResponse)
+    expense_docs = expense_crud.iter_expenses(
+        category=category,
+        vendor=vendor,
+        project_id=projectId,
+        search=search,
+        projection=build_projection(field_names),
+        batch_size=settings.export_batch_size
+    )
+    
+    return StreamingResponse(
+        iter_ndjson(expense_docs, select_fields(ExpenseResponse, field_names), settings.export_batch_size),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"Content-Disposition": 'attachment; filename="expenses.ndjson"'}
+    )
+
+
 @router.get("/{expense_id}", response_model=ExpenseResponse)
 async def get_expense(
     expense_id: str,
+    request: Request,
+    response: Response,
     current_user: UserInDB = Depends(get_current_user)
 ):
     """
@@ -105,6 +217,13 @@ async def get_expense(
     
     Returns 404 if expense not found.
     """
+    version = await version_crud.get_record_version("expenses", expense_id)
+    if version is not None:
+        etag = compute_etag(request, version)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        with_etag(response, etag)
+    
     expense = await expense_crud.get_expense_by_id(expense_id)
     
     if not expense:
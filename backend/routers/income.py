@@ -1,10 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, UploadFile, File
+from fastapi.responses import StreamingResponse
 from typing import Optional
 
 from models.income import IncomeCreate, IncomeResponse, IncomeListResponse, ImportResult
 from crud import income as income_crud
+from crud import version as version_crud
 from auth.middleware import get_current_user
 from models.user import UserInDB
+from config import settings
+from utils.ai_retrieval import mark_finances_changed
+from utils.json_response import model_response, to_response_model
+from utils.ndjson import NDJSON_MEDIA_TYPE, iter_ndjson
+from utils.etag import compute_etag, etag_matches, not_modified, with_etag
+from utils.sparse_fields import FIELDS_QUERY_DESCRIPTION, build_include, build_projection, parse_fields, select_fields
 
 router = APIRouter(prefix="/income", tags=["income"])
 
@@ -24,6 +32,7 @@ async def create_income(
     """
     try:
         income = await income_crud.create_income(income_data, current_user.id)
+        mark_finances_changed()
         return IncomeResponse(
             id=income.id,
             date=income.date,
@@ -39,10 +48,12 @@ async def create_income(
 
 @router.get("", response_model=IncomeListResponse)
 async def list_income(
+    request: Request,
     source: Optional[str] = Query(None, description="Filter by source type"),
     search: Optional[str] = Query(None, description="Search in description"),
     limit: int = Query(50, ge=1, le=100, description="Maximum number of results"),
     skip: int = Query(0, ge=0, description="Number of results to skip"),
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
     current_user: UserInDB = Depends(get_current_user)
 ):
     """
@@ -53,33 +64,64 @@ async def list_income(
     - **search**: Search in description (case-insensitive)
     
     Results are paginated and sorted by date (newest first).
+    
+    Pass **fields** (e.g., `id,date,amount,source`) to return only those
+    fields of each income record; id is always included.
     """
+    field_names = parse_fields(fields, IncomeResponse)
     try:
+        etag = compute_etag(request, await version_crud.get_collection_version(
+            "income",
+            income_crud.build_income_query(source, search)
+        ))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
         income_records, total = await income_crud.get_income_list(
             source=source,
             search=search,
             limit=limit,
-            skip=skip
+            skip=skip,
+            projection=build_projection(field_names)
         )
         
-        income_responses = [
-            IncomeResponse(
-                id=inc.id,
-                date=inc.date,
-                amount=inc.amount,
-                source=inc.source,
-                description=inc.description,
-                createdBy=inc.createdBy,
-                createdAt=inc.createdAt
-            )
-            for inc in income_records
-        ]
-        
-        return IncomeListResponse(income=income_responses, total=total)
+        return with_etag(model_response(IncomeListResponse.model_construct(
+            income=[to_response_model(IncomeResponse, inc) for inc in income_records],
+            total=total
+        ), include=build_include("income", field_names)), etag)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve income: {str(e)}")
 
 
+@router.get("/export.ndjson")
+async def export_income(
+    source: Optional[str] = Query(None, description="Filter by source type"),
+    search: Optional[str] = Query(None, description="Search in description"),
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """
+    Export every matching income record as newline-delimited JSON.
+    
+    Takes the same filters and **fields** as the income list, without
+    pagination. Rows are sorted by date (newest first), one income object
+    per line, and streamed as they are read from the database.
+    """
+    field_names = parse_fields(fields, IncomeResponse)
+    income_docs = income_crud.iter_income(
+        source=source,
+        search=search,
+        projection=build_projection(field_names),
+        batch_size=settings.export_batch_size
+    )
+    
+    return StreamingResponse(
+        iter_ndjson(income_docs, select_fields(IncomeResponse, field_names), settings.export_batch_size),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"Content-Disposition": 'attachment; filename="income.ndjson"'}
+    )
+
+
 @router.post("/import", response_model=ImportResult)
 async def import_income(
     file: UploadFile = File(...),
@@ -140,6 +182,7 @@ async def import_income(
                     income_objects,
                     current_user.id
                 )
+                mark_finances_changed()
             except Exception as e:
                 errors.append({
                     "row": 0,
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from typing import Optional, Dict, Any
 
 from models.project import (
@@ -6,13 +7,23 @@ from models.project import (
     ProjectUpdate,
     ProjectResponse,
     ProjectDetailResponse,
-    ProjectListResponse
+    ProjectListResponse,
+    ProjectBatchResponse
 )
 from models.proposal import ProposalResponse
 from crud import project as project_crud
 from crud import proposal as proposal_crud
+from crud import version as version_crud
 from auth.middleware import get_current_user
 from models.user import UserInDB
+from models.batch import BatchGetRequest
+from utils.file_upload import get_file_extension, get_upload_relative_path
+from utils.storage_codec import find_stored_object
+from utils.zip_stream import iter_zip, safe_archive_name
+from utils.ai_retrieval import mark_record_changed
+from utils.json_response import FastJSONResponse, model_response, to_response_model
+from utils.etag import compute_etag, etag_matches, not_modified, with_etag
+from utils.sparse_fields import FIELDS_QUERY_DESCRIPTION, build_include, build_projection, parse_fields
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
@@ -35,6 +46,7 @@ async def create_project(
     """
     try:
         project = await project_crud.create_project(project_data, current_user.id)
+        mark_record_changed("project", project.id)
         return ProjectResponse(
             id=project.id,
             name=project.name,
@@ -55,11 +67,13 @@ async def create_project(
 
 @router.get("", response_model=ProjectListResponse)
 async def list_projects(
+    request: Request,
     status: Optional[str] = Query(None, description="Filter by status"),
     search: Optional[str] = Query(None, description="Search in name and description"),
     archived: bool = Query(False, description="Include archived projects"),
     limit: int = Query(50, ge=1, le=100, description="Maximum number of results"),
     skip: int = Query(0, ge=0, description="Number of results to skip"),
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
     current_user: UserInDB = Depends(get_current_user)
 ):
     """
@@ -71,35 +85,60 @@ async def list_projects(
     - **archived**: Include archived projects (default: false)
     
     Results are paginated and sorted by creation date (newest first).
+    
+    Pass **fields** (e.g., `id,name,status,budget`) to return only those
+    fields of each project; id is always included.
     """
+    field_names = parse_fields(fields, ProjectResponse)
     try:
+        etag = compute_etag(request, await version_crud.get_collection_version(
+            "projects",
+            project_crud.build_project_query(status, search, archived)
+        ))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
         projects, total = await project_crud.get_projects(
             status=status,
             search=search,
             archived=archived,
             limit=limit,
-            skip=skip
+            skip=skip,
+            projection=build_projection(field_names)
         )
         
-        project_responses = [
-            ProjectResponse(
-                id=proj.id,
-                name=proj.name,
-                description=proj.description,
-                status=proj.status,
-                budget=proj.budget,
-                startDate=proj.startDate,
-                endDate=proj.endDate,
-                assignedVendorId=proj.assignedVendorId,
-                createdBy=proj.createdBy,
-                createdAt=proj.createdAt,
-                updatedAt=proj.updatedAt,
-                archivedAt=proj.archivedAt
-            )
-            for proj in projects
-        ]
+        return with_etag(model_response(ProjectListResponse.model_construct(
+            projects=[to_response_model(ProjectResponse, proj) for proj in projects],
+            total=total
+        ), include=build_include("projects", field_names)), etag)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to retrieve projects: {str(e)}")
+
+
+@router.post("/batch-get", response_model=ProjectBatchResponse)
+async def batch_get_projects(
+    request_data: BatchGetRequest,
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """
+    Get several projects by ID in one request.
+    
+    - **ids**: Up to 100 project IDs
+    
+    Returns one entry per requested ID, in request order, with null for
+    IDs that were not found; those IDs are also listed in **missing**.
+    """
+    try:
+        found = await project_crud.get_projects_by_ids(request_data.ids)
+        responses = {
+            project_id: to_response_model(ProjectResponse, proj)
+            for project_id, proj in found.items()
+        }
         
-        return ProjectListResponse(projects=project_responses, total=total)
+        return model_response(ProjectBatchResponse.model_construct(
+            projects=[responses.get(project_id) for project_id in request_data.ids],
+            missing=[project_id for project_id in request_data.ids if project_id not in found]
+        ))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve projects: {str(e)}")
 
@@ -107,6 +146,8 @@ async def list_projects(
 @router.get("/{project_id}", response_model=ProjectDetailResponse)
 async def get_project(
     project_id: str,
+    request: Request,
+    response: Response,
     current_user: UserInDB = Depends(get_current_user)
 ):
     """
@@ -120,6 +161,13 @@ async def get_project(
     
     Returns 404 if project not found.
     """
+    version = await project_crud.get_project_detail_version(project_id)
+    if version is not None:
+        etag = compute_etag(request, version)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        with_etag(response, etag)
+    
     result = await project_crud.get_project_with_aggregations(project_id)
     
     if not result:
@@ -172,6 +220,8 @@ async def update_project(
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
+    mark_record_changed("project", project_id)
+    
     return ProjectResponse(
         id=project.id,
         name=project.name,
@@ -206,9 +256,67 @@ async def archive_project(
     if not success:
         raise HTTPException(status_code=404, detail="Project not found")
     
+    mark_record_changed("project", project_id)
+    
     return {"message": "Project archived successfully"}
 
 
+@router.get("/{project_id}/files.zip")
+async def download_project_files(
+    project_id: str,
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """
+    Download every proposal attachment and linked expense receipt as one ZIP.
+    
+    The archive is built on the fly while streaming, so memory use stays
+    constant regardless of project size. Already-compressed formats (images,
+    DOCX, XLSX) are stored without recompression.
+    
+    Returns 404 if project not found or it has no attached files.
+    """
+    result = await project_crud.get_project_files(project_id)
+    
+    if not result:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    entries = []
+    used_names = set()
+    
+    async def add_entry(folder: str, label: str, file_url: str):
+        stored, codec = await find_stored_object(get_upload_relative_path(file_url))
+        if stored is None:
+            return
+        
+        extension = get_file_extension(file_url)
+        base_name = f"{folder}/{safe_archive_name(label)}"
+        arcname = f"{base_name}.{extension}"
+        suffix = 2
+        while arcname in used_names:
+            arcname = f"{base_name} ({suffix}).{extension}"
+            suffix += 1
+        
+        used_names.add(arcname)
+        entries.append((arcname, stored, codec))
+    
+    for proposal in result["proposals"]:
+        await add_entry("proposals", proposal.get("vendorName", "proposal"), proposal["fileUrl"])
+    
+    for expense in result["receipts"]:
+        await add_entry("receipts", f"{expense.get('date', '')} {expense.get('vendor', '')}", expense["receiptUrl"])
+    
+    if not entries:
+        raise HTTPException(status_code=404, detail="No files attached to this project")
+    
+    zip_name = safe_archive_name(result["name"]) or "project"
+    
+    return StreamingResponse(
+        iter_zip(entries),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{zip_name}-files.zip"'}
+    )
+
+
 @router.get("/{project_id}/comparison")
 async def get_project_comparison(
     project_id: str,
@@ -243,40 +351,8 @@ async def get_project_comparison(
     # Sort proposals by bidAmount (ascending - cheapest first)
     sorted_proposals = sorted(proposals, key=lambda p: p.bidAmount)
     
-    # Convert to response format
-    proposal_responses = [
-        ProposalResponse(
-            id=prop.id,
-            projectId=prop.projectId,
-            vendorName=prop.vendorName,
-            bidAmount=prop.bidAmount,
-            timeline=prop.timeline,
-            warranty=prop.warranty,
-            scopeSummary=prop.scopeSummary,
-            fileUrl=prop.fileUrl,
-            status=prop.status,
-            uploadedBy=prop.uploadedBy,
-            createdAt=prop.createdAt,
-            updatedAt=prop.updatedAt,
-            archivedAt=prop.archivedAt
-        )
-        for prop in sorted_proposals
-    ]
-    
-    return {
-        "project": ProjectResponse(
-            id=project.id,
-            name=project.name,
-            description=project.description,
-            status=project.status,
-            budget=project.budget,
-            startDate=project.startDate,
-            endDate=project.endDate,
-            assignedVendorId=project.assignedVendorId,
-            createdBy=project.createdBy,
-            createdAt=project.createdAt,
-            updatedAt=project.updatedAt,
-            archivedAt=project.archivedAt
-        ),
-        "proposals": proposal_responses
-    }
\ No newline at end of file
+    # Stored records go straight into the response models without re-validation
+    return FastJSONResponse({
+        "project": to_response_model(ProjectResponse, project),
+        "proposals": [to_response_model(ProposalResponse, prop) for prop in sorted_proposals]
+    })
\ No newline at end of file
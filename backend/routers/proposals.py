@@ -1,21 +1,79 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, UploadFile, File, Form
 from typing import Optional
 
 from models.proposal import (
     ProposalCreate,
     ProposalUpdate,
     ProposalResponse,
-    ProposalListResponse
+    ProposalListResponse,
+    ProposalBatchResponse
 )
 from crud import proposal as proposal_crud
 from crud import project as project_crud
+from crud import version as version_crud
 from auth.middleware import get_current_user
 from models.user import UserInDB
+from models.batch import BatchGetRequest
 from utils.file_upload import save_file
+from utils.chunked_upload import finalize_upload_session
+from utils.ai_retrieval import mark_record_changed
+from utils.thumbnails import schedule_thumbnail
+from utils.json_response import model_response, to_response_model
+from utils.etag import compute_etag, etag_matches, not_modified, with_etag
+from utils.sparse_fields import FIELDS_QUERY_DESCRIPTION, build_include, build_projection, parse_fields
 
 router = APIRouter(prefix="/proposals", tags=["proposals"])
 
 
+async def _create_proposal_record(
+    proposal_data: ProposalCreate,
+    file_url: Optional[str],
+    current_user: UserInDB
+) -> ProposalResponse:
+    """
+    Create the proposal record, optionally linked to an already saved file.
+    
+    Args:
+        proposal_data: Validated proposal data
+        file_url: Relative URL of the saved file, if any
+        current_user: User uploading the proposal
+        
+    Returns:
+        The created proposal response
+    """
+    # Create proposal in database
+    proposal = await proposal_crud.create_proposal(
+        proposal_data,
+        current_user.id,
+        file_url
+    )
+    mark_record_changed("proposal", proposal.id)
+    
+    # Generate a preview thumbnail in the background
+    if file_url:
+        schedule_thumbnail(
+            file_url,
+            lambda thumbnail_url: proposal_crud.set_proposal_thumbnail(proposal.id, thumbnail_url)
+        )
+    
+    return ProposalResponse(
+        id=proposal.id,
+        projectId=proposal.projectId,
+        vendorName=proposal.vendorName,
+        bidAmount=proposal.bidAmount,
+        timeline=proposal.timeline,
+        warranty=proposal.warranty,
+        scopeSummary=proposal.scopeSummary,
+        fileUrl=proposal.fileUrl,
+        thumbnailUrl=proposal.thumbnailUrl,
+        status=proposal.status,
+        uploadedBy=proposal.uploadedBy,
+        createdAt=proposal.createdAt,
+        updatedAt=proposal.updatedAt,
+        archivedAt=proposal.archivedAt
+    )
+
+
 @router.post("", response_model=ProposalResponse, status_code=201)
 async def create_proposal(
     projectId: str = Form(...),
@@ -65,28 +123,55 @@ async def create_proposal(
             status=status
         )
         
-        # Create proposal in database
-        proposal = await proposal_crud.create_proposal(
-            proposal_data,
-            current_user.id,
-            file_url
-        )
+        return await _create_proposal_record(proposal_data, file_url, current_user)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to create proposal: {str(e)}")
+
+
+@router.post("/from-upload", response_model=ProposalResponse, status_code=201)
+async def create_proposal_from_upload(
+    uploadId: str = Form(...),
+    projectId: str = Form(...),
+    vendorName: str = Form(...),
+    bidAmount: float = Form(...),
+    timeline: str = Form(...),
+    warranty: str = Form(...),
+    scopeSummary: str = Form(...),
+    status: str = Form(default="Pending"),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """
+    Create a vendor proposal from a completed resumable upload.
+    
+    Accepts the same fields as `POST /proposals`, with **uploadId** referring
+    to an upload session (created with subdirectory "proposals") whose chunks
+    have all been received.
+    
+    Returns the created proposal with file URL.
+    """
+    try:
+        # Verify project exists
+        project = await project_crud.get_project_by_id(projectId)
+        if not project:
+            raise HTTPException(status_code=404, detail="Project not found")
         
-        return ProposalResponse(
-            id=proposal.id,
-            projectId=proposal.projectId,
-            vendorName=proposal.vendorName,
-            bidAmount=proposal.bidAmount,
-            timeline=proposal.timeline,
-            warranty=proposal.warranty,
-            scopeSummary=proposal.scopeSummary,
-            fileUrl=proposal.fileUrl,
-            status=proposal.status,
-            uploadedBy=proposal.uploadedBy,
-            createdAt=proposal.createdAt,
-            updatedAt=proposal.updatedAt,
-            archivedAt=proposal.archivedAt
+        # Validate before promoting the staged file
+        proposal_data = ProposalCreate(
+            projectId=projectId,
+            vendorName=vendorName,
+            bidAmount=bidAmount,
+            timeline=timeline,
+            warranty=warranty,
+            scopeSummary=scopeSummary,
+            status=status
         )
+        
+        async with finalize_upload_session(uploadId, "proposals", current_user) as (file_url, _, _):
+            return await _create_proposal_record(proposal_data, file_url, current_user)
     except HTTPException:
         raise
     except ValueError as e:
@@ -97,11 +182,13 @@ async def create_proposal(
 
 @router.get("", response_model=ProposalListResponse)
 async def list_proposals(
+    request: Request,
     projectId: Optional[str] = Query(None, description="Filter by project ID"),
     vendorName: Optional[str] = Query(None, description="Filter by vendor name (partial match)"),
     archived: bool = Query(False, description="Include archived proposals"),
     limit: int = Query(50, ge=1, le=100, description="Maximum number of results"),
     skip: int = Query(0, ge=0, description="Number of results to skip"),
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
     current_user: UserInDB = Depends(get_current_user)
 ):
     """
@@ -113,36 +200,60 @@ async def list_proposals(
     - **archived**: Include archived proposals (default: false)
     
     Results are paginated and sorted by creation date (newest first).
+    
+    Pass **fields** (e.g., `id,vendorName,bidAmount,status`) to return only those
+    fields of each proposal; id is always included.
     """
+    field_names = parse_fields(fields, ProposalResponse)
     try:
+        etag = compute_etag(request, await version_crud.get_collection_version(
+            "proposals",
+            proposal_crud.build_proposal_query(projectId, vendorName, archived)
+        ))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
         proposals, total = await proposal_crud.get_proposals(
             project_id=projectId,
             vendor_name=vendorName,
             archived=archived,
             limit=limit,
-            skip=skip
+            skip=skip,
+            projection=build_projection(field_names)
         )
         
-        proposal_responses = [
-            ProposalResponse(
-                id=prop.id,
-                projectId=prop.projectId,
-                vendorName=prop.vendorName,
-                bidAmount=prop.bidAmount,
-                timeline=prop.timeline,
-                warranty=prop.warranty,
-                scopeSummary=prop.scopeSummary,
-                fileUrl=prop.fileUrl,
-                status=prop.status,
-                uploadedBy=prop.uploadedBy,
-                createdAt=prop.createdAt,
-                updatedAt=prop.updatedAt,
-                archivedAt=prop.archivedAt
-            )
-            for prop in proposals
-        ]
+        return with_etag(model_response(ProposalListResponse.model_construct(
+            proposals=[to_response_model(ProposalResponse, prop) for prop in proposals],
+            total=total
+        ), include=build_include("proposals", field_names)), etag)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to retrieve proposals: {str(e)}")
+
+
+@router.post("/batch-get", response_model=ProposalBatchResponse)
+async def batch_get_proposals(
+    request_data: BatchGetRequest,
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """
+    Get several proposals by ID in one request.
+    
+    - **ids**: Up to 100 proposal IDs
+    
+    Returns one entry per requested ID, in request order, with null for
+    IDs that were not found; those IDs are also listed in **missing**.
+    """
+    try:
+        found = await proposal_crud.get_proposals_by_ids(request_data.ids)
+        responses = {
+            proposal_id: to_response_model(ProposalResponse, prop)
+            for proposal_id, prop in found.items()
+        }
         
-        return ProposalListResponse(proposals=proposal_responses, total=total)
+        return model_response(ProposalBatchResponse.model_construct(
+            proposals=[responses.get(proposal_id) for proposal_id in request_data.ids],
+            missing=[proposal_id for proposal_id in request_data.ids if proposal_id not in found]
+        ))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve proposals: {str(e)}")
 
@@ -150,6 +261,8 @@ async def list_proposals(
 @router.get("/{proposal_id}", response_model=ProposalResponse)
 async def get_proposal(
     proposal_id: str,
+    request: Request,
+    response: Response,
     current_user: UserInDB = Depends(get_current_user)
 ):
     """
@@ -157,6 +270,13 @@ async def get_proposal(
     
     Returns 404 if proposal not found.
     """
+    version = await version_crud.get_record_version("proposals", proposal_id)
+    if version is not None:
+        etag = compute_etag(request, version)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        with_etag(response, etag)
+    
     proposal = await proposal_crud.get_proposal_by_id(proposal_id)
     
     if not proposal:
@@ -171,6 +291,7 @@ async def get_proposal(
         warranty=proposal.warranty,
         scopeSummary=proposal.scopeSummary,
         fileUrl=proposal.fileUrl,
+        thumbnailUrl=proposal.thumbnailUrl,
         status=proposal.status,
         uploadedBy=proposal.uploadedBy,
         createdAt=proposal.createdAt,
@@ -208,6 +329,8 @@ async def update_proposal(
         if not proposal:
             raise HTTPException(status_code=404, detail="Proposal not found")
         
+        mark_record_changed("proposal", proposal_id)
+        
         return ProposalResponse(
             id=proposal.id,
             projectId=proposal.projectId,
@@ -217,6 +340,7 @@ async def update_proposal(
             warranty=proposal.warranty,
             scopeSummary=proposal.scopeSummary,
             fileUrl=proposal.fileUrl,
+            thumbnailUrl=proposal.thumbnailUrl,
             status=proposal.status,
             uploadedBy=proposal.uploadedBy,
             createdAt=proposal.createdAt,
@@ -247,4 +371,6 @@ async def archive_proposal(
     if not success:
         raise HTTPException(status_code=404, detail="Proposal not found")
     
+    mark_record_changed("proposal", proposal_id)
+    
     return {"message": "Proposal archived successfully"}
\ No newline at end of file
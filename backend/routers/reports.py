@@ -0,0 +1,118 @@
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+
+from config import settings
+from crud import report as report_crud
+from auth.middleware import get_current_user
+from models.user import UserInDB
+from utils.ledger_report import (
+    CSV_MEDIA_TYPE,
+    XLSX_MEDIA_TYPE,
+    iter_ledger_csv,
+    write_ledger_xlsx
+)
+from utils.storage import iter_file_chunks
+
+router = APIRouter(prefix="/reports", tags=["reports"])
+
+DATE_PATTERN = r"^\d{4}-\d{2}-\d{2}$"
+
+
+def get_report_filename(extension: str, start_date: Optional[str], end_date: Optional[str]) -> str:
+    """
+    Build the download filename of a ledger report.
+
+    Args:
+        extension: File extension ('xlsx' or 'csv')
+        start_date: Inclusive start date, if filtered
+        end_date: Inclusive end date, if filtered
+
+    Returns:
+        Filename such as 'ledger_2024-01-01_2024-12-31.xlsx'
+    """
+    period = "_".join(part for part in (start_date, end_date) if part)
+    return f"ledger_{period}.{extension}" if period else f"ledger.{extension}"
+
+
+@router.get("/ledger.xlsx")
+async def export_ledger_xlsx(
+    startDate: Optional[str] = Query(None, pattern=DATE_PATTERN, description="Inclusive start date (YYYY-MM-DD)"),
+    endDate: Optional[str] = Query(None, pattern=DATE_PATTERN, description="Inclusive end date (YYYY-MM-DD)"),
+    category: Optional[str] = Query(None, description="Only expenses in this category"),
+    source: Optional[str] = Query(None, description="Only income from this source"),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """
+    Download the income and expense ledger as an Excel workbook.
+
+    Rows are sorted by date (oldest first) and end with income and expense
+    totals. Filters:
+    - **startDate** / **endDate**: Date range (inclusive)
+    - **category**: Only expenses in this category (plus income if **source** is also given)
+    - **source**: Only income from this source (plus expenses if **category** is also given)
+    """
+    rows = report_crud.iter_ledger_rows(
+        start_date=startDate,
+        end_date=endDate,
+        category=category,
+        source=source,
+        batch_size=settings.export_batch_size
+    )
+
+    file_descriptor, temp_path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(file_descriptor)
+    path = Path(temp_path)
+
+    try:
+        await write_ledger_xlsx(rows, path, settings.export_batch_size)
+    except Exception as e:
+        path.unlink(missing_ok=True)
+        raise HTTPException(status_code=500, detail=f"Failed to generate report: {str(e)}")
+
+    filename = get_report_filename("xlsx", startDate, endDate)
+    return StreamingResponse(
+        iter_file_chunks(path),
+        media_type=XLSX_MEDIA_TYPE,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Content-Length": str(path.stat().st_size)
+        },
+        # Runs once the response ends, even if the client disconnects before the body starts
+        background=BackgroundTask(path.unlink, missing_ok=True)
+    )
+
+
+@router.get("/ledger.csv")
+async def export_ledger_csv(
+    startDate: Optional[str] = Query(None, pattern=DATE_PATTERN, description="Inclusive start date (YYYY-MM-DD)"),
+    endDate: Optional[str] = Query(None, pattern=DATE_PATTERN, description="Inclusive end date (YYYY-MM-DD)"),
+    category: Optional[str] = Query(None, description="Only expenses in this category"),
+    source: Optional[str] = Query(None, description="Only income from this source"),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """
+    Download the income and expense ledger as CSV.
+
+    Takes the same filters as the XLSX report. Rows are streamed as they
+    are read from the database.
+    """
+    rows = report_crud.iter_ledger_rows(
+        start_date=startDate,
+        end_date=endDate,
+        category=category,
+        source=source,
+        batch_size=settings.export_batch_size
+    )
+
+    filename = get_report_filename("csv", startDate, endDate)
+    return StreamingResponse(
+        iter_ledger_csv(rows, settings.export_batch_size),
+        media_type=CSV_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
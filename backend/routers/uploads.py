@@ -0,0 +1,129 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+
+from config import settings
+from models.upload import UploadSessionCreate, UploadSessionResponse
+from crud import upload as upload_crud
+from auth.middleware import get_current_user
+from models.user import UserInDB
+from utils.file_upload import validate_filename
+from utils.chunked_upload import (
+    allocate_staging_file,
+    build_session_response,
+    discard_staging_file,
+    get_owned_session_or_raise,
+    write_chunk
+)
+
+router = APIRouter(prefix="/uploads", tags=["uploads"])
+
+
+@router.post("", response_model=UploadSessionResponse, status_code=201)
+async def create_upload_session(
+    session_data: UploadSessionCreate,
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """
+    Start a resumable chunked upload.
+
+    - **filename**: Original filename (extension must be an allowed file type)
+    - **size**: Total file size in bytes (max MAX_FILE_SIZE)
+    - **subdirectory**: Upload target (proposals or documents)
+
+    Upload the file with `PUT /uploads/{id}?offset=N` (chunks may be sent in
+    parallel and in any order), then finalize with
+    `POST /documents/from-upload` or `POST /proposals/from-upload`.
+    """
+    validate_filename(session_data.filename)
+
+    if session_data.size > settings.max_file_size:
+        raise HTTPException(
+            status_code=400,
+            detail=f"File size exceeds maximum allowed size of {settings.max_file_size / (1024 * 1024):.1f}MB"
+        )
+
+    try:
+        session = await upload_crud.create_upload_session(session_data, current_user.id)
+        await allocate_staging_file(session.id, session.size)
+        return build_session_response(session)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to create upload session: {str(e)}")
+
+
+@router.get("/{upload_id}", response_model=UploadSessionResponse)
+async def get_upload_session(
+    upload_id: str,
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """
+    Get upload progress for resuming an interrupted upload.
+
+    - **uploadOffset**: Resume a sequential upload from this byte offset
+    - **missingRanges**: Byte ranges still to send (for parallel uploads)
+
+    Returns 404 if upload session not found, 410 if it has expired.
+    """
+    session = get_owned_session_or_raise(
+        await upload_crud.get_upload_session(upload_id),
+        current_user
+    )
+    return build_session_response(session)
+
+
+@router.put("/{upload_id}", response_model=UploadSessionResponse)
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    offset: int = Query(..., ge=0, description="Byte offset of this chunk within the file"),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """
+    Upload one chunk of the file as the raw request body.
+
+    Chunks are written at `offset` and may overlap previously received data.
+    Each chunk must be at most `maxChunkSize` bytes.
+
+    Returns the updated upload progress.
+    """
+    session = get_owned_session_or_raise(
+        await upload_crud.get_upload_session(upload_id),
+        current_user
+    )
+
+    if session.status != "open":
+        raise HTTPException(status_code=409, detail="Upload session is not open")
+
+    if offset >= session.size:
+        raise HTTPException(status_code=400, detail="Offset is beyond the end of the file")
+
+    written = await write_chunk(session, offset, request.stream())
+    if written == 0:
+        return build_session_response(session)
+
+    updated = await upload_crud.record_chunk(upload_id, offset, offset + written)
+    if not updated:
+        raise HTTPException(status_code=409, detail="Upload session is not open")
+
+    return build_session_response(updated)
+
+
+@router.delete("/{upload_id}")
+async def abort_upload_session(
+    upload_id: str,
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """
+    Abort an upload and discard any received chunks.
+
+    Returns 404 if upload session not found.
+    """
+    get_owned_session_or_raise(
+        await upload_crud.get_upload_session(upload_id),
+        current_user
+    )
+
+    if not await upload_crud.set_upload_status(upload_id, "open", "aborted"):
+        raise HTTPException(status_code=409, detail="Upload session is not open")
+
+    discard_staging_file(upload_id)
+
+    return {"message": "Upload aborted successfully"}
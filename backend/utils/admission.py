@@ -0,0 +1,234 @@
+"""
+Admission control for the AI chat endpoints.
+
+Two independent checks protect the completions proxy:
+
+- a per-client token bucket, rejecting bursts from one client with 429
+- a per-process concurrency limiter with a bounded wait queue, rejecting
+  work with 503 when every slot is busy and the queue is full, or when a
+  queued request waits longer than the queue timeout
+
+Both responses carry a Retry-After header. Queue depth, wait times and
+rejection counts are kept for the metrics endpoint.
+"""
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+
+from fastapi import HTTPException, Request, status
+
+from config import settings
+
+# Recent queue waits kept for percentile reporting
+WAIT_SAMPLE_SIZE = 1000
+
+# Clients tracked by the rate limiter before the least recently seen are dropped
+MAX_TRACKED_CLIENTS = 10000
+
+
+def _percentile(samples: list[float], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class TokenBucketLimiter:
+    """Per-client token buckets refilled at a steady rate."""
+
+    def __init__(self, rate_per_minute: int, burst: int, max_clients: int = MAX_TRACKED_CLIENTS):
+        self.rate = rate_per_minute / 60.0
+        self.burst = max(1, burst)
+        self.max_clients = max_clients
+        self.rejected = 0
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def consume(self, client_id: str) -> float:
+        """
+        Take one token from a client's bucket.
+
+        Args:
+            client_id: Client identifier (e.g., IP address)
+
+        Returns:
+            0 if the request is allowed, otherwise seconds until a token is available
+        """
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(client_id, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - updated_at) * self.rate)
+
+        if tokens < 1:
+            self._buckets[client_id] = (tokens, now)
+            self._buckets.move_to_end(client_id)
+            self.rejected += 1
+            return (1 - tokens) / self.rate
+
+        self._buckets[client_id] = (tokens - 1, now)
+        self._buckets.move_to_end(client_id)
+        while len(self._buckets) > self.max_clients:
+            self._buckets.popitem(last=False)
+        return 0.0
+
+
+class AdmissionSlot:
+    """A held concurrency slot; releasing it more than once is a no-op."""
+
+    def __init__(self, limiter: "ConcurrencyLimiter"):
+        self._limiter = limiter
+        self._acquired_at = time.monotonic()
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._limiter._release(time.monotonic() - self._acquired_at)
+
+    async def __aenter__(self) -> "AdmissionSlot":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.release()
+
+
+class ConcurrencyLimiter:
+    """Caps in-flight requests, queueing a bounded number of waiters."""
+
+    def __init__(self, max_concurrent: int, max_queued: int, queue_timeout: float):
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queued = max(0, max_queued)
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.queued = 0
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        self._waits: deque[float] = deque(maxlen=WAIT_SAMPLE_SIZE)
+        self._max_wait = 0.0
+        # Moving average of how long a slot is held, used for Retry-After
+        self._average_hold = 1.0
+
+    def retry_after(self) -> int:
+        """Estimate the seconds until a slot frees up for a new request."""
+        backlog = (self.queued + 1) / self.max_concurrent
+        return max(1, math.ceil(self._average_hold * backlog))
+
+    def _reject(self, detail: str) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(self.retry_after())}
+        )
+
+    async def acquire(self) -> AdmissionSlot:
+        """
+        Wait for a free slot.
+
+        Returns:
+            Held slot; release it (or use it as an async context manager) when done
+
+        Raises:
+            HTTPException: 503 with Retry-After if the queue is full or the wait times out
+        """
+        if self._semaphore.locked() and self.queued >= self.max_queued:
+            self.rejected_queue_full += 1
+            raise self._reject("The AI assistant is busy. Please try again shortly.")
+
+        self.queued += 1
+        started_at = time.monotonic()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected_timeout += 1
+            raise self._reject("The AI assistant is busy. Please try again shortly.")
+        finally:
+            self.queued -= 1
+            waited = time.monotonic() - started_at
+            self._waits.append(waited)
+            self._max_wait = max(self._max_wait, waited)
+
+        self.active += 1
+        self.admitted += 1
+        return AdmissionSlot(self)
+
+    def _release(self, held: float) -> None:
+        self.active -= 1
+        self._average_hold = 0.9 * self._average_hold + 0.1 * held
+        self._semaphore.release()
+
+    def snapshot(self) -> dict:
+        """Current queue state and wait-time statistics."""
+        waits = list(self._waits)
+        return {
+            "maxConcurrent": self.max_concurrent,
+            "maxQueued": self.max_queued,
+            "active": self.active,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "rejectedQueueFull": self.rejected_queue_full,
+            "rejectedTimeout": self.rejected_timeout,
+            "waitMsP50": round(_percentile(waits, 0.5) * 1000, 1),
+            "waitMsP95": round(_percentile(waits, 0.95) * 1000, 1),
+            "waitMsMax": round(self._max_wait * 1000, 1),
+            "averageHoldSeconds": round(self._average_hold, 3)
+        }
+
+
+ai_rate_limiter = TokenBucketLimiter(settings.ai_rate_limit_per_minute, settings.ai_rate_limit_burst)
+ai_concurrency_limiter = ConcurrencyLimiter(
+    settings.ai_max_concurrent_requests,
+    settings.ai_max_queued_requests,
+    settings.ai_queue_timeout
+)
+
+
+def get_client_id(request: Request) -> str:
+    """
+    Identify the client a request came from.
+
+    Uses the first X-Forwarded-For address when AI_TRUST_FORWARDED_FOR is
+    enabled (behind a reverse proxy), otherwise the socket peer address.
+    """
+    if settings.ai_trust_forwarded_for:
+        forwarded_for = request.headers.get("x-forwarded-for")
+        if forwarded_for:
+            return forwarded_for.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+async def enforce_ai_rate_limit(request: Request) -> None:
+    """
+    Dependency that applies the per-client AI rate limit.
+
+    Raises:
+        HTTPException: 429 with Retry-After if the client's bucket is empty
+    """
+    if settings.ai_rate_limit_per_minute <= 0:
+        return
+
+    wait = ai_rate_limiter.consume(get_client_id(request))
+    if wait > 0:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many AI requests. Please slow down.",
+            headers={"Retry-After": str(max(1, math.ceil(wait)))}
+        )
+
+
+def get_admission_metrics() -> dict:
+    """
+    Collect AI admission control metrics.
+
+    Returns:
+        Concurrency limiter snapshot plus the number of rate-limited requests
+    """
+    return {
+        **ai_concurrency_limiter.snapshot(),
+        "rateLimited": ai_rate_limiter.rejected
+    }
+
+
+async def acquire_ai_slot() -> AdmissionSlot:
+    """Wait for a concurrency slot for an upstream AI call (see ConcurrencyLimiter.acquire)."""
+    return await ai_concurrency_limiter.acquire()
@@ -0,0 +1,155 @@
+"""
+Response cache for AI chat prompts.
+
+Replies are keyed on a normalized (system prompt, model, temperature,
+message) tuple. Lookups hit an in-process LRU first and, when
+AI_CACHE_MONGO is enabled, a shared Mongo collection whose entries expire
+through a TTL index.
+"""
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+
+import database as db_module
+from config import settings
+from crud import ai_cache as ai_cache_crud
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """Bounded in-memory cache with per-entry expiry, evicting least recently used entries."""
+
+    def __init__(self, max_entries: int, ttl: int):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[str, float]] = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        value, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        self._entries[key] = (value, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> int:
+        count = len(self._entries)
+        self._entries.clear()
+        return count
+
+
+_memory_cache = LRUCache(settings.ai_cache_max_entries, settings.ai_cache_ttl)
+
+
+def normalize_message(message: str) -> str:
+    """
+    Normalize a user message so trivially different phrasings share a cache entry.
+
+    Args:
+        message: User's message
+
+    Returns:
+        Case-folded message with collapsed whitespace and no trailing punctuation
+    """
+    return re.sub(r"\s+", " ", message).strip().rstrip("?!. ").casefold()
+
+
+def make_cache_key(system_prompt: str, model: str, temperature: float, message: str) -> str:
+    """
+    Build the cache key for a chat prompt.
+
+    Args:
+        system_prompt: System prompt sent with the message
+        model: Completions model name
+        temperature: Sampling temperature
+        message: User's message
+
+    Returns:
+        Hex SHA-256 digest of the normalized prompt tuple
+    """
+    payload = json.dumps([system_prompt, model, round(temperature, 3), normalize_message(message)])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _mongo_enabled() -> bool:
+    return settings.ai_cache_mongo and db_module.database is not None
+
+
+async def get_cached_reply(cache_key: str) -> tuple[Optional[str], Optional[str]]:
+    """
+    Look up a cached reply.
+
+    Args:
+        cache_key: Key from make_cache_key
+
+    Returns:
+        Tuple of (reply, tier) where tier is 'memory' or 'mongo', or (None, None) on a miss
+    """
+    if not settings.ai_cache_enabled:
+        return None, None
+
+    reply = _memory_cache.get(cache_key)
+    if reply is not None:
+        return reply, "memory"
+
+    if _mongo_enabled():
+        try:
+            stored = await ai_cache_crud.get_cached_response(cache_key)
+        except Exception as e:
+            logger.warning(f"AI cache lookup failed: {e}")
+            stored = None
+        if stored is not None:
+            reply, expires_at = stored
+            # Keep the entry in memory only for the rest of its stored lifetime
+            _memory_cache.set(cache_key, reply, (expires_at - datetime.utcnow()).total_seconds())
+            return reply, "mongo"
+
+    return None, None
+
+
+async def store_reply(cache_key: str, reply: str) -> None:
+    """
+    Cache a completed reply in every enabled tier.
+
+    Args:
+        cache_key: Key from make_cache_key
+        reply: Reply message
+    """
+    if not settings.ai_cache_enabled:
+        return
+
+    _memory_cache.set(cache_key, reply)
+    if _mongo_enabled():
+        try:
+            await ai_cache_crud.save_cached_response(cache_key, reply, settings.ai_cache_ttl)
+        except Exception as e:
+            logger.warning(f"AI cache write failed: {e}")
+
+
+async def purge_cache() -> dict:
+    """
+    Remove every cached reply.
+
+    Returns:
+        Dict with the number of memory and stored entries removed
+    """
+    stored = await ai_cache_crud.purge_cached_responses() if _mongo_enabled() else 0
+    return {"memoryEntries": _memory_cache.clear(), "storedEntries": stored}
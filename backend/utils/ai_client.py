@@ -0,0 +1,128 @@
+import json
+import logging
+from typing import AsyncIterator, Optional
+
+import httpx
+
+from config import settings
+
+try:
+    import h2  # noqa: F401
+except ImportError:  # h2 not installed: the client speaks HTTP/1.1 only
+    h2 = None
+
+logger = logging.getLogger(__name__)
+
+# Application-scoped client for the completions API, shared by all requests
+http_client: Optional[httpx.AsyncClient] = None
+
+
+def http2_enabled() -> bool:
+    """Check whether HTTP/2 is configured and the h2 package is installed."""
+    return settings.ai_http2 and h2 is not None
+
+
+def create_ai_client() -> httpx.AsyncClient:
+    """
+    Build the pooled HTTP client used for completions API calls.
+
+    Returns:
+        AsyncClient with keep-alive pool limits, timeouts and HTTP/2 when available
+    """
+    return httpx.AsyncClient(
+        base_url=settings.openai_base_url,
+        http2=http2_enabled(),
+        limits=httpx.Limits(
+            max_connections=settings.ai_http_max_connections,
+            max_keepalive_connections=settings.ai_http_max_keepalive_connections,
+            keepalive_expiry=settings.ai_http_keepalive_expiry
+        ),
+        timeout=httpx.Timeout(
+            settings.ai_http_read_timeout,
+            connect=settings.ai_http_connect_timeout
+        )
+    )
+
+
+async def open_ai_client() -> None:
+    """Create the shared completions API client."""
+    global http_client
+    http_client = create_ai_client()
+    logger.info(f"AI HTTP client ready (HTTP/2 {'enabled' if http2_enabled() else 'disabled'})")
+
+
+async def close_ai_client() -> None:
+    """Close the shared completions API client and its pooled connections."""
+    global http_client
+    if http_client:
+        await http_client.aclose()
+        http_client = None
+        logger.info("Closed AI HTTP client")
+
+
+def get_ai_client() -> httpx.AsyncClient:
+    """
+    Get the shared completions API client, creating it if the app has not.
+
+    Returns:
+        Pooled AsyncClient
+    """
+    global http_client
+    if http_client is None:
+        http_client = create_ai_client()
+    return http_client
+
+
+def get_auth_headers() -> dict:
+    """Get the request headers for the completions API."""
+    return {
+        "Authorization": f"Bearer {settings.openai_api_key}",
+        "Content-Type": "application/json"
+    }
+
+
+async def iter_completion_deltas(response: httpx.Response) -> AsyncIterator[dict]:
+    """
+    Parse a streamed chat completion (server-sent events) as it arrives.
+
+    Args:
+        response: Streaming response from the completions API (opened with stream=True)
+
+    Yields:
+        Delta dicts (with 'content' and/or 'tool_calls') in order, until the
+        stream's [DONE] marker
+    """
+    async for line in response.aiter_lines():
+        # Events are 'data: <json>' lines separated by blank lines
+        if not line.startswith("data:"):
+            continue
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            return
+
+        chunk = json.loads(data)
+        choices = chunk.get("choices") or [{}]
+        delta = choices[0].get("delta")
+        if delta:
+            yield delta
+
+
+def merge_tool_call_deltas(pending: dict[int, dict], tool_call_deltas: list[dict]) -> None:
+    """
+    Accumulate streamed tool call fragments into complete tool calls.
+
+    Args:
+        pending: Tool calls assembled so far, by index (updated in place)
+        tool_call_deltas: 'tool_calls' list from one streamed delta
+    """
+    for fragment in tool_call_deltas:
+        call = pending.setdefault(fragment.get("index", 0), {
+            "id": None,
+            "type": "function",
+            "function": {"name": "", "arguments": ""}
+        })
+        if fragment.get("id"):
+            call["id"] = fragment["id"]
+        function = fragment.get("function") or {}
+        call["function"]["name"] += function.get("name") or ""
+        call["function"]["arguments"] += function.get("arguments") or ""
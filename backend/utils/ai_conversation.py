@@ -0,0 +1,194 @@
+"""
+Conversation memory for the AI assistant.
+
+Each conversation is an append-only message log plus a rolling summary of
+its older messages. The context sent upstream is the summary followed by
+as many of the newest unsummarized messages as fit in
+AI_CONVERSATION_TOKEN_BUDGET, so prompt size stays flat however long the
+conversation grows.
+
+When the unsummarized messages no longer fit, the oldest are folded into
+the summary by a background completion call after the reply is sent,
+keeping about half the budget as verbatim recent turns.
+"""
+import logging
+from typing import Optional
+
+from fastapi import HTTPException
+
+from config import settings
+from crud import conversation as conversation_crud
+from models.conversation import ConversationInDB
+from utils.admission import acquire_ai_slot
+from utils.ai_client import get_ai_client, get_auth_headers
+from utils.ai_retrieval import estimate_tokens
+from utils.background import spawn
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_MODEL = "gpt-3.5-turbo"
+SUMMARY_PROMPT = (
+    "Summarize the conversation between an HOA board member and an assistant below. "
+    "Keep facts, figures, decisions and open questions. Reply with the summary only."
+)
+
+# Messages read per context build or summary pass
+MAX_CONTEXT_MESSAGES = 40
+MAX_SUMMARY_MESSAGES = 200
+
+# Length of the conversation title taken from its first message
+CONVERSATION_TITLE_LENGTH = 80
+
+# Conversations with a summary pass in progress in this process
+_summarizing: set[str] = set()
+
+
+async def build_conversation_context(conversation: ConversationInDB) -> tuple[list[dict], bool]:
+    """
+    Select the history sent upstream with the next message.
+
+    Args:
+        conversation: Conversation being continued
+
+    Returns:
+        Tuple of (chat messages, needs_summary), where needs_summary is True
+        if unsummarized messages were left out for lack of budget
+    """
+    budget = settings.ai_conversation_token_budget
+    history = []
+
+    if conversation.summary:
+        summary = f"Summary of the earlier conversation:\n{conversation.summary}"
+        history.append({"role": "system", "content": summary})
+        budget -= estimate_tokens(summary)
+
+    recent = await conversation_crud.get_messages(
+        conversation.id,
+        after_seq=conversation.summarizedThrough,
+        limit=MAX_CONTEXT_MESSAGES,
+        newest=True
+    )
+
+    selected = []
+    for message in reversed(recent):
+        if message["tokens"] > budget:
+            break
+        budget -= message["tokens"]
+        selected.append({"role": message["role"], "content": message["content"]})
+    selected.reverse()
+
+    needs_summary = len(selected) < len(recent) or len(recent) == MAX_CONTEXT_MESSAGES
+    return history + selected, needs_summary
+
+
+async def record_exchange(
+    conversation: Optional[ConversationInDB],
+    user_id: str,
+    message: str,
+    reply: str,
+    needs_summary: bool
+) -> ConversationInDB:
+    """
+    Append a question and its reply to a conversation, starting one if needed.
+
+    Conversations are only created here, once a reply exists, so requests
+    that are rejected, fail upstream or never finish leave nothing behind.
+
+    Args:
+        conversation: Conversation the exchange belongs to, or None to start one
+        user_id: ID of the user asking
+        message: User's message
+        reply: Assistant's reply
+        needs_summary: Start a summary pass (from build_conversation_context)
+
+    Returns:
+        The conversation the exchange was stored in
+    """
+    if conversation is None:
+        conversation = await conversation_crud.create_conversation(
+            user_id,
+            message[:CONVERSATION_TITLE_LENGTH].strip()
+        )
+
+    await conversation_crud.append_messages(conversation.id, [
+        {"role": "user", "content": message, "tokens": estimate_tokens(message)},
+        {"role": "assistant", "content": reply, "tokens": estimate_tokens(reply)}
+    ])
+
+    if needs_summary and conversation.id not in _summarizing:
+        spawn(summarize_conversation(conversation.id), f"summary of conversation {conversation.id}")
+
+    return conversation
+
+
+def _format_transcript(messages: list[dict]) -> str:
+    speakers = {"user": "Board member", "assistant": "Assistant"}
+    return "\n".join(f"{speakers.get(message['role'], message['role'])}: {message['content']}" for message in messages)
+
+
+async def summarize_conversation(conversation_id: str) -> None:
+    """
+    Fold a conversation's older unsummarized messages into its rolling summary.
+
+    Args:
+        conversation_id: Conversation ID
+    """
+    if conversation_id in _summarizing:
+        return
+    _summarizing.add(conversation_id)
+    try:
+        conversation = await conversation_crud.get_conversation(conversation_id)
+        if conversation is None:
+            return
+
+        messages = await conversation_crud.get_messages(
+            conversation_id,
+            after_seq=conversation.summarizedThrough,
+            limit=MAX_SUMMARY_MESSAGES
+        )
+
+        # Keep the newest messages, worth about half the budget, verbatim
+        fold_count = len(messages)
+        if len(messages) < MAX_SUMMARY_MESSAGES:
+            keep_budget = settings.ai_conversation_token_budget // 2
+            while fold_count > 0 and messages[fold_count - 1]["tokens"] <= keep_budget:
+                keep_budget -= messages[fold_count - 1]["tokens"]
+                fold_count -= 1
+        if fold_count == 0:
+            return
+
+        folded = messages[:fold_count]
+        transcript = _format_transcript(folded)
+        if conversation.summary:
+            transcript = f"Earlier summary:\n{conversation.summary}\n\nConversation:\n{transcript}"
+
+        try:
+            async with await acquire_ai_slot():
+                response = await get_ai_client().post(
+                    "/chat/completions",
+                    headers=get_auth_headers(),
+                    json={
+                        "model": SUMMARY_MODEL,
+                        "messages": [
+                            {"role": "system", "content": SUMMARY_PROMPT},
+                            {"role": "user", "content": transcript}
+                        ],
+                        "temperature": 0.2,
+                        "max_tokens": settings.ai_conversation_summary_max_tokens
+                    }
+                )
+        except HTTPException:
+            # Saturated: the next exchange schedules another pass
+            return
+        response.raise_for_status()
+        summary = (response.json()["choices"][0]["message"].get("content") or "").strip()
+
+        if summary:
+            await conversation_crud.save_summary(
+                conversation_id,
+                summary,
+                summarized_through=folded[-1]["seq"],
+                previous_through=conversation.summarizedThrough
+            )
+    finally:
+        _summarizing.discard(conversation_id)
@@ -0,0 +1,433 @@
+"""
+Local retrieval over HOA data for the AI assistant.
+
+Keeps an in-process TF-IDF index of short snippets: project descriptions,
+proposal scope summaries, document titles and extracted text, and a summary
+of the association's finances. The snippets most relevant to a question are
+added to the chat prompt within a token budget.
+
+The index is built by a background task started with the app, and rebuilt
+every AI_RETRIEVAL_REBUILD_INTERVAL seconds to pick up writes made by other
+processes. Rebuilds tokenize in a worker pool and swap the new index in when
+done; questions keep using the previous index meanwhile. Between rebuilds,
+routers mark the records they write as changed, and only those records are
+re-read before the next question.
+"""
+import asyncio
+import heapq
+import logging
+import math
+import re
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, Optional
+
+from bson import ObjectId
+
+import database as db_module
+from config import settings
+from crud import dashboard as dashboard_crud
+from utils.background import run_in_pool, spawn
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Common words that carry no retrieval signal
+STOP_WORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "do", "does", "for", "from", "has", "have",
+    "how", "i", "in", "is", "it", "of", "on", "or", "our", "that", "the", "this", "to", "was",
+    "we", "what", "when", "where", "which", "who", "why", "will", "with", "you"
+}
+
+# Longest snippet indexed; longer document text is split into chunks of this size
+SNIPPET_MAX_CHARS = 1200
+MAX_DOCUMENT_CHUNKS = 20
+
+FINANCES_RECORD = "finances:summary"
+
+# Records handed to the worker pool per call during a full rebuild
+REBUILD_BATCH_SIZE = 200
+
+
+@dataclass
+class Snippet:
+    """A unit of retrievable text."""
+
+    id: str
+    label: str
+    text: str
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Split text into lowercase index terms, dropping stop words.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of terms
+    """
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the model token count of text (about four characters per token)."""
+    return len(text) // 4 + 1
+
+
+class RetrievalIndex:
+    """In-memory TF-IDF index with per-record incremental updates."""
+
+    def __init__(self):
+        self._snippets: dict[str, Snippet] = {}
+        self._weights: dict[str, dict[str, float]] = {}
+        self._postings: dict[str, dict[str, float]] = defaultdict(dict)
+        self._record_snippets: dict[str, list[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._snippets)
+
+    def _add(self, snippet: Snippet) -> None:
+        counts = Counter(tokenize(snippet.text))
+        if not counts:
+            return
+
+        # Sublinear term frequency, L2-normalized so long snippets do not dominate
+        weights = {term: 1 + math.log(count) for term, count in counts.items()}
+        norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+        weights = {term: weight / norm for term, weight in weights.items()}
+
+        self._snippets[snippet.id] = snippet
+        self._weights[snippet.id] = weights
+        for term, weight in weights.items():
+            self._postings[term][snippet.id] = weight
+
+    def _remove(self, snippet_id: str) -> None:
+        self._snippets.pop(snippet_id, None)
+        for term in self._weights.pop(snippet_id, {}):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(snippet_id, None)
+                if not postings:
+                    del self._postings[term]
+
+    def replace_record(self, record_key: str, snippets: list[Snippet]) -> None:
+        """
+        Replace every snippet of a record.
+
+        Args:
+            record_key: Record key (e.g., 'project:<id>')
+            snippets: New snippets (empty removes the record)
+        """
+        for snippet_id in self._record_snippets.pop(record_key, []):
+            self._remove(snippet_id)
+
+        for snippet in snippets:
+            self._add(snippet)
+        if snippets:
+            self._record_snippets[record_key] = [snippet.id for snippet in snippets]
+
+    def add_records(self, records: list[tuple[str, Callable[..., list[Snippet]], tuple]]) -> None:
+        """
+        Build and index snippets for a batch of records (blocking).
+
+        Args:
+            records: (record key, snippet builder, builder arguments) tuples
+        """
+        for record_key, build_snippets, args in records:
+            self.replace_record(record_key, build_snippets(*args))
+
+    def search(self, query: str, top_k: int) -> list[tuple[float, Snippet]]:
+        """
+        Find the snippets most similar to a query.
+
+        Args:
+            query: Question text
+            top_k: Maximum number of results
+
+        Returns:
+            List of (score, snippet) pairs, best first
+        """
+        snippet_count = len(self._snippets)
+        scores: dict[str, float] = defaultdict(float)
+
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log((1 + snippet_count) / (1 + len(postings))) + 1
+            for snippet_id, weight in postings.items():
+                scores[snippet_id] += weight * idf
+
+        best = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+        return [(score, self._snippets[snippet_id]) for snippet_id, score in best]
+
+
+def _truncate(text: str, max_chars: int = SNIPPET_MAX_CHARS) -> str:
+    text = re.sub(r"\s+", " ", text).strip()
+    return text if len(text) <= max_chars else text[:max_chars].rsplit(" ", 1)[0] + "..."
+
+
+def _project_snippets(doc: dict) -> list[Snippet]:
+    project_id = str(doc["_id"])
+    text = (
+        f"Project {doc.get('name', '')} ({doc.get('status', '')}), budget ${doc.get('budget', 0):,.2f}, "
+        f"starts {doc.get('startDate', '')}: {doc.get('description', '')}"
+    )
+    return [Snippet(f"project:{project_id}", "Project", _truncate(text))]
+
+
+def _proposal_snippets(doc: dict) -> list[Snippet]:
+    proposal_id = str(doc["_id"])
+    text = (
+        f"Proposal from {doc.get('vendorName', '')} for ${doc.get('bidAmount', 0):,.2f} "
+        f"({doc.get('status', '')}), timeline {doc.get('timeline', '')}, "
+        f"warranty {doc.get('warranty', '')}: {doc.get('scopeSummary', '')}"
+    )
+    return [Snippet(f"proposal:{proposal_id}", "Vendor proposal", _truncate(text))]
+
+
+def _document_snippets(doc: dict, text: Optional[str]) -> list[Snippet]:
+    document_id = str(doc["_id"])
+    header = f"Document '{doc.get('title', '')}' ({doc.get('category', '')})"
+    description = doc.get("description") or ""
+    snippets = [Snippet(f"document:{document_id}", "Document", _truncate(f"{header}: {description}"))]
+
+    if text:
+        for number in range(min(MAX_DOCUMENT_CHUNKS, math.ceil(len(text) / SNIPPET_MAX_CHARS))):
+            chunk = text[number * SNIPPET_MAX_CHARS:(number + 1) * SNIPPET_MAX_CHARS]
+            snippets.append(Snippet(f"document:{document_id}:{number}", header, _truncate(chunk)))
+
+    return snippets
+
+
+async def _finance_snippets() -> list[Snippet]:
+    """Summarize totals using the dashboard aggregations."""
+    year_start = f"{date.today().year}-01-01"
+    year_match = dashboard_crud.build_date_match(start_date=year_start)
+
+    total_income = await dashboard_crud.get_collection_total("income")
+    total_expenses = await dashboard_crud.get_collection_total("expenses")
+    year_income = await dashboard_crud.get_collection_total("income", year_match)
+    year_expenses = await dashboard_crud.get_collection_total("expenses", year_match)
+    year_categories = await dashboard_crud.get_expense_category_totals(year_match)
+
+    overview = (
+        f"Finances overview (income, expenses, spending, balance): all-time income ${total_income:,.2f}, "
+        f"expenses ${total_expenses:,.2f}, balance ${total_income - total_expenses:,.2f}. "
+        f"Since {year_start}: income ${year_income:,.2f}, expenses ${year_expenses:,.2f}."
+    )
+    categories = "; ".join(
+        f"{item['category']} ${item['total']:,.2f} ({item['count']} expenses)"
+        for item in year_categories
+    )
+
+    snippets = [Snippet(FINANCES_RECORD, "Finances", overview)]
+    if categories:
+        snippets.append(Snippet(
+            f"{FINANCES_RECORD}:categories",
+            "Finances",
+            _truncate(f"Spending by expense category since {year_start}: {categories}")
+        ))
+    return snippets
+
+
+async def _load_record(record_key: str) -> list[Snippet]:
+    """Read one record's current snippets from the database (empty if gone or archived)."""
+    if record_key == FINANCES_RECORD:
+        return await _finance_snippets()
+
+    kind, record_id = record_key.split(":", 1)
+    if not ObjectId.is_valid(record_id):
+        return []
+    query = {"_id": ObjectId(record_id), "archivedAt": None}
+
+    if kind == "project":
+        doc = await db_module.database.projects.find_one(query)
+        return _project_snippets(doc) if doc else []
+    if kind == "proposal":
+        doc = await db_module.database.proposals.find_one(query)
+        return _proposal_snippets(doc) if doc else []
+    if kind == "document":
+        doc = await db_module.database.documents.find_one(query)
+        if not doc:
+            return []
+        text_doc = await db_module.database.document_text.find_one({"_id": record_id}, {"text": 1})
+        return _document_snippets(doc, text_doc["text"] if text_doc else None)
+    return []
+
+
+_index = RetrievalIndex()
+_dirty_records: set[str] = set()
+_built_at: Optional[float] = None
+_lock = asyncio.Lock()
+# Records changed while a rebuild runs (None when no rebuild is running)
+_changed_during_rebuild: Optional[set[str]] = None
+
+
+def mark_record_changed(kind: str, record_id: str) -> None:
+    """
+    Queue a record for re-indexing before the next question.
+
+    Args:
+        kind: 'project', 'proposal' or 'document'
+        record_id: Record ID
+    """
+    _dirty_records.add(f"{kind}:{record_id}")
+
+
+def mark_finances_changed() -> None:
+    """Queue the financial summary for recomputation before the next question."""
+    _dirty_records.add(FINANCES_RECORD)
+
+
+async def _index_in_pool(index: RetrievalIndex, records: list) -> None:
+    await run_in_pool("retrieval", 1, index.add_records, records)
+
+
+async def rebuild_index() -> int:
+    """
+    Rebuild the whole index from the database and swap it in.
+
+    Records are read on the event loop and tokenized in the worker pool in
+    batches; the current index keeps serving questions until the swap.
+    Text of archived documents is not read.
+
+    Returns:
+        Number of snippets indexed
+    """
+    global _index, _built_at, _changed_during_rebuild
+    if _changed_during_rebuild is not None:
+        raise RuntimeError("AI retrieval index rebuild already running")
+
+    _changed_during_rebuild = set()
+    try:
+        index = RetrievalIndex()
+        active_filter = {"archivedAt": None}
+        batch = []
+
+        async for doc in db_module.database.projects.find(active_filter).batch_size(500):
+            batch.append((f"project:{doc['_id']}", _project_snippets, (doc,)))
+            if len(batch) >= REBUILD_BATCH_SIZE:
+                await _index_in_pool(index, batch)
+                batch = []
+
+        async for doc in db_module.database.proposals.find(active_filter).batch_size(500):
+            batch.append((f"proposal:{doc['_id']}", _proposal_snippets, (doc,)))
+            if len(batch) >= REBUILD_BATCH_SIZE:
+                await _index_in_pool(index, batch)
+                batch = []
+        await _index_in_pool(index, batch)
+
+        # Extracted text is read only for the active documents of each batch
+        documents = {}
+        async for doc in db_module.database.documents.find(active_filter).batch_size(100):
+            documents[str(doc["_id"])] = doc
+            if len(documents) >= 100:
+                await _index_documents(index, documents)
+                documents = {}
+        await _index_documents(index, documents)
+
+        index.replace_record(FINANCES_RECORD, await _finance_snippets())
+    except BaseException:
+        _changed_during_rebuild = None
+        raise
+
+    # Swap in the new index in one step so searches never see a partial build;
+    # records changed during the build may predate it, so re-read them
+    _dirty_records.update(_changed_during_rebuild)
+    _changed_during_rebuild = None
+    _index = index
+    _built_at = time.monotonic()
+    logger.info(f"Built AI retrieval index with {len(index)} snippets")
+    return len(index)
+
+
+async def _index_documents(index: RetrievalIndex, documents: dict[str, dict]) -> None:
+    """Index a batch of active documents with their extracted text."""
+    if not documents:
+        return
+
+    texts = {}
+    cursor = db_module.database.document_text.find({"_id": {"$in": list(documents)}}, {"text": 1})
+    async for text_doc in cursor:
+        texts[text_doc["_id"]] = text_doc["text"]
+
+    await _index_in_pool(index, [
+        (f"document:{document_id}", _document_snippets, (doc, texts.get(document_id)))
+        for document_id, doc in documents.items()
+    ])
+
+
+async def run_index_rebuilds_periodically() -> None:
+    """Build the index, then rebuild it every ai_retrieval_rebuild_interval seconds."""
+    while True:
+        try:
+            await rebuild_index()
+        except Exception as e:
+            logger.warning(f"AI retrieval index rebuild failed: {e}")
+        await asyncio.sleep(settings.ai_retrieval_rebuild_interval)
+
+
+async def refresh_index() -> None:
+    """
+    Re-read the records changed since the last question into the index.
+
+    If no index has been built yet and no rebuild is running (the app was
+    started without its lifespan task), a rebuild is started in the
+    background; the question is answered without retrieved records.
+    """
+    if _built_at is None and _changed_during_rebuild is None:
+        spawn(rebuild_index(), "AI retrieval index build")
+        return
+
+    async with _lock:
+        while _dirty_records:
+            record_key = _dirty_records.pop()
+            if _changed_during_rebuild is not None:
+                _changed_during_rebuild.add(record_key)
+            try:
+                _index.replace_record(record_key, await _load_record(record_key))
+            except Exception:
+                _dirty_records.add(record_key)
+                raise
+
+
+async def build_context(question: str) -> str:
+    """
+    Select HOA records relevant to a question, within the retrieval token budget.
+
+    Args:
+        question: User's message
+
+    Returns:
+        Bulleted snippets for the system prompt, or an empty string if
+        retrieval is disabled, unavailable or found nothing relevant
+    """
+    if not settings.ai_retrieval_enabled or db_module.database is None:
+        return ""
+
+    try:
+        await refresh_index()
+    except Exception as e:
+        logger.warning(f"AI retrieval index refresh failed: {e}")
+
+    budget = settings.ai_retrieval_token_budget
+    lines = []
+    for _, snippet in _index.search(question, settings.ai_retrieval_top_k):
+        line = f"- [{snippet.label}] {snippet.text}"
+        cost = estimate_tokens(line)
+        if cost > budget:
+            # Fit a shortened first result rather than returning nothing
+            if lines or budget < 32:
+                break
+            line = _truncate(line, budget * 4)
+            cost = budget
+        lines.append(line)
+        budget -= cost
+
+    return "\n".join(lines)
@@ -0,0 +1,213 @@
+"""
+Functions the AI assistant can call to answer financial questions exactly.
+
+Each tool runs one of the aggregations behind the dashboard and project
+detail pages and returns a compact JSON result, so the model never needs
+raw records in its prompt. Results are cached briefly per (tool, arguments).
+"""
+import json
+import logging
+import re
+from typing import Optional
+
+from config import settings
+from crud import dashboard as dashboard_crud
+from crud import project as project_crud
+from utils.ai_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Projects considered when a name matches several
+MAX_MATCHED_PROJECTS = 3
+
+TOOL_DEFINITIONS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "get_expense_totals_by_category",
+            "description": "Total HOA expenses per category, optionally limited to a date range or a single category.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "start_date": {"type": "string", "description": "Inclusive start date, YYYY-MM-DD"},
+                    "end_date": {"type": "string", "description": "Inclusive end date, YYYY-MM-DD"},
+                    "category": {"type": "string", "description": "Only this expense category, e.g. Landscaping"}
+                }
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_project_budget_status",
+            "description": "Budget, actual spending and remaining budget of HOA projects matching a name.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "project_name": {"type": "string", "description": "Full or partial project name"}
+                },
+                "required": ["project_name"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "compare_vendor_bids",
+            "description": "Compare vendor proposals (bid amount, timeline, warranty, status) for HOA projects matching a name.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "project_name": {"type": "string", "description": "Full or partial project name"}
+                },
+                "required": ["project_name"]
+            }
+        }
+    }
+]
+
+_result_cache = LRUCache(256, settings.ai_tool_cache_ttl)
+
+
+async def get_expense_totals_by_category(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    category: Optional[str] = None
+) -> dict:
+    """Total expenses per category within optional date and category filters."""
+    match = dashboard_crud.build_date_match(start_date, end_date)
+    if category:
+        match["category"] = {"$regex": f"^{re.escape(category)}$", "$options": "i"}
+
+    categories = await dashboard_crud.get_expense_category_totals(match)
+    return {
+        "startDate": start_date,
+        "endDate": end_date,
+        "categories": [
+            {**item, "total": round(item["total"], 2)}
+            for item in categories
+        ],
+        "total": round(sum(item["total"] for item in categories), 2)
+    }
+
+
+async def _get_matching_project_details(project_name: str) -> list[dict]:
+    """Get aggregated details of active projects whose name contains project_name."""
+    projects, _ = await project_crud.get_projects(search=re.escape(project_name), limit=MAX_MATCHED_PROJECTS)
+    details = []
+    for project in projects:
+        result = await project_crud.get_project_with_aggregations(project.id)
+        if result:
+            details.append(result)
+    return details
+
+
+async def get_project_budget_status(project_name: str) -> dict:
+    """Budget versus actual spending for projects matching a name."""
+    projects = []
+    for result in await _get_matching_project_details(project_name):
+        project = result["project"]
+        actual_spent = result["actualSpent"]
+        projects.append({
+            "name": project.name,
+            "status": project.status,
+            "budget": round(project.budget, 2),
+            "actualSpent": round(actual_spent, 2),
+            "remaining": round(project.budget - actual_spent, 2),
+            "percentUsed": round(actual_spent / project.budget * 100, 1) if project.budget else None,
+            "expenseCount": len(result["expenses"])
+        })
+    return {"projects": projects}
+
+
+async def compare_vendor_bids(project_name: str) -> dict:
+    """Vendor proposals, lowest bid first, for projects matching a name."""
+    projects = []
+    for result in await _get_matching_project_details(project_name):
+        project = result["project"]
+        bids = sorted(
+            (
+                {
+                    "vendorName": proposal.get("vendorName"),
+                    "bidAmount": proposal.get("bidAmount"),
+                    "timeline": proposal.get("timeline"),
+                    "warranty": proposal.get("warranty"),
+                    "status": proposal.get("status")
+                }
+                for proposal in result["proposals"]
+            ),
+            key=lambda bid: bid["bidAmount"] or 0
+        )
+        projects.append({
+            "name": project.name,
+            "budget": round(project.budget, 2),
+            "bids": bids
+        })
+    return {"projects": projects}
+
+
+TOOLS = {
+    "get_expense_totals_by_category": get_expense_totals_by_category,
+    "get_project_budget_status": get_project_budget_status,
+    "compare_vendor_bids": compare_vendor_bids
+}
+
+
+async def run_tool_call(name: str, arguments: str) -> str:
+    """
+    Execute a tool call requested by the model.
+
+    Errors are returned to the model as JSON rather than raised, so it can
+    answer without the data.
+
+    Args:
+        name: Tool name
+        arguments: JSON-encoded arguments from the model
+
+    Returns:
+        JSON-encoded result
+    """
+    tool = TOOLS.get(name)
+    if tool is None:
+        return json.dumps({"error": f"Unknown tool: {name}"})
+
+    try:
+        parsed = json.loads(arguments or "{}")
+        if not isinstance(parsed, dict):
+            raise ValueError("arguments must be an object")
+    except ValueError as e:
+        return json.dumps({"error": f"Invalid arguments: {e}"})
+
+    cache_key = f"{name}:{json.dumps(parsed, sort_keys=True)}"
+    cached = _result_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    try:
+        result = json.dumps(await tool(**parsed), default=str)
+    except TypeError as e:
+        return json.dumps({"error": f"Invalid arguments: {e}"})
+    except Exception as e:
+        logger.warning(f"AI tool {name} failed: {e}")
+        return json.dumps({"error": "The data could not be retrieved"})
+
+    _result_cache.set(cache_key, result)
+    return result
+
+
+async def append_tool_results(messages: list, assistant_message: dict) -> None:
+    """
+    Run the tool calls of an assistant message and append the conversation turns.
+
+    Args:
+        messages: Chat messages sent to the model (extended in place)
+        assistant_message: Assistant message containing tool_calls
+    """
+    messages.append(assistant_message)
+    for call in assistant_message["tool_calls"]:
+        function = call.get("function", {})
+        messages.append({
+            "role": "tool",
+            "tool_call_id": call.get("id"),
+            "content": await run_tool_call(function.get("name", ""), function.get("arguments", ""))
+        })
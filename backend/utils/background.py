@@ -0,0 +1,60 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Coroutine
+
+logger = logging.getLogger(__name__)
+
+# Named worker pools for blocking post-upload work (thumbnails, text extraction, ...)
+_executors: dict[str, ThreadPoolExecutor] = {}
+_pending_tasks: set[asyncio.Task] = set()
+
+
+async def run_in_pool(pool_name: str, max_workers: int, func: Callable, *args: Any) -> Any:
+    """
+    Run a blocking function in a named worker pool.
+
+    Args:
+        pool_name: Pool name; the pool is created on first use
+        max_workers: Worker count used when creating the pool
+        func: Blocking function to run
+        *args: Arguments for func
+
+    Returns:
+        The function's return value
+    """
+    executor = _executors.get(pool_name)
+    if executor is None:
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=pool_name)
+        _executors[pool_name] = executor
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, func, *args)
+
+
+def spawn(coro: Coroutine, description: str) -> None:
+    """
+    Run a coroutine in the background without awaiting it.
+
+    A reference is kept until the task finishes, and failures are logged.
+
+    Args:
+        coro: Coroutine to run
+        description: Short description used in log messages
+    """
+    async def _guarded():
+        try:
+            await coro
+        except Exception as e:
+            logger.warning(f"Background task failed ({description}): {e}")
+
+    task = asyncio.create_task(_guarded())
+    _pending_tasks.add(task)
+    task.add_done_callback(_pending_tasks.discard)
+
+
+def shutdown_worker_pools() -> None:
+    """Stop all worker pools, dropping queued work."""
+    for executor in _executors.values():
+        executor.shutdown(wait=False, cancel_futures=True)
+    _executors.clear()
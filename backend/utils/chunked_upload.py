@@ -0,0 +1,272 @@
+from contextlib import asynccontextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import AsyncIterator, Optional
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+
+from config import settings
+from crud import upload as upload_crud
+from models.upload import UploadSessionInDB, UploadSessionResponse
+from models.user import UserInDB
+from utils.file_upload import build_upload_key
+from utils.storage import WRITE_CHUNK_SIZE
+from utils.storage_codec import store_local_file
+
+
+def get_staging_path(session_id: str) -> Path:
+    """
+    Get the staging file path for an upload session.
+
+    Args:
+        session_id: Upload session ID
+
+    Returns:
+        Path to the partial file in the staging area
+    """
+    return Path(settings.upload_staging_dir) / f"{session_id}.part"
+
+
+def _create_sized_file(path: Path, size: int) -> None:
+    """Create a file of the given length (blocking)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as buffer:
+        buffer.truncate(size)
+
+
+async def allocate_staging_file(session_id: str, size: int) -> None:
+    """
+    Create the staging file for a session, sized to the final file length.
+
+    Pre-allocating lets chunks be written at any offset and in any order.
+
+    Args:
+        session_id: Upload session ID
+        size: Total file size in bytes
+    """
+    await run_in_threadpool(_create_sized_file, get_staging_path(session_id), size)
+
+
+def discard_staging_file(session_id: str) -> None:
+    """
+    Remove the staging file for a session if it exists.
+
+    Args:
+        session_id: Upload session ID
+    """
+    staging_path = get_staging_path(session_id)
+    if staging_path.exists():
+        staging_path.unlink()
+
+
+def merge_ranges(ranges: list[list[int]]) -> list[list[int]]:
+    """
+    Merge overlapping or adjacent byte ranges.
+
+    Args:
+        ranges: List of [start, end) byte ranges
+
+    Returns:
+        Sorted list of disjoint [start, end) ranges
+    """
+    merged: list[list[int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def missing_ranges(ranges: list[list[int]], size: int) -> list[list[int]]:
+    """
+    Compute the byte ranges not yet received.
+
+    Args:
+        ranges: List of received [start, end) byte ranges
+        size: Total file size in bytes
+
+    Returns:
+        List of missing [start, end) ranges
+    """
+    missing = []
+    position = 0
+    for start, end in merge_ranges(ranges):
+        if start > position:
+            missing.append([position, start])
+        position = max(position, end)
+    if position < size:
+        missing.append([position, size])
+    return missing
+
+
+def build_session_response(session: UploadSessionInDB) -> UploadSessionResponse:
+    """
+    Build the API response for an upload session, including resume offsets.
+
+    Args:
+        session: Upload session from database
+
+    Returns:
+        Upload session response
+    """
+    merged = merge_ranges(session.receivedRanges)
+    upload_offset = merged[0][1] if merged and merged[0][0] == 0 else 0
+
+    return UploadSessionResponse(
+        id=session.id,
+        filename=session.filename,
+        size=session.size,
+        subdirectory=session.subdirectory,
+        status=session.status,
+        uploadOffset=upload_offset,
+        receivedBytes=sum(end - start for start, end in merged),
+        missingRanges=missing_ranges(session.receivedRanges, session.size),
+        maxChunkSize=settings.upload_chunk_max_size,
+        expiresAt=session.expiresAt
+    )
+
+
+async def write_chunk(
+    session: UploadSessionInDB,
+    offset: int,
+    stream: AsyncIterator[bytes]
+) -> int:
+    """
+    Write a streamed chunk into the session's staging file at an offset.
+
+    Args:
+        session: Upload session the chunk belongs to
+        offset: Byte offset where the chunk starts
+        stream: Async iterator over the request body
+
+    Returns:
+        Number of bytes written
+
+    Raises:
+        HTTPException: If the chunk exceeds the chunk size limit or file size
+    """
+    limit = min(settings.upload_chunk_max_size, session.size - offset)
+    staging_path = get_staging_path(session.id)
+
+    if not staging_path.exists():
+        raise HTTPException(status_code=410, detail="Upload staging data no longer exists")
+
+    written = 0
+    pending = bytearray()
+    buffer = await run_in_threadpool(open, staging_path, "r+b")
+    try:
+        await run_in_threadpool(buffer.seek, offset)
+        # Body pieces are batched into threadpool writes to keep the event loop free
+        async for data in stream:
+            if not data:
+                continue
+            written += len(data)
+            if written > limit:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Chunk exceeds maximum size of {limit} bytes at offset {offset}"
+                )
+            pending += data
+            if len(pending) >= WRITE_CHUNK_SIZE:
+                await run_in_threadpool(buffer.write, bytes(pending))
+                pending.clear()
+        await run_in_threadpool(buffer.write, bytes(pending))
+    finally:
+        await run_in_threadpool(buffer.close)
+
+    return written
+
+
+def get_owned_session_or_raise(session: Optional[UploadSessionInDB], current_user: UserInDB) -> UploadSessionInDB:
+    """
+    Check that an upload session exists, belongs to the user and has not expired.
+
+    Args:
+        session: Upload session from database (or None)
+        current_user: Current authenticated user
+
+    Returns:
+        The upload session
+
+    Raises:
+        HTTPException: If session is missing, owned by another user or expired
+    """
+    if not session or session.createdBy != current_user.id:
+        raise HTTPException(status_code=404, detail="Upload session not found")
+
+    if session.status == "open" and session.expiresAt < datetime.utcnow():
+        raise HTTPException(status_code=410, detail="Upload session has expired")
+
+    return session
+
+
+@asynccontextmanager
+async def finalize_upload_session(
+    session_id: str,
+    subdirectory: str,
+    current_user: UserInDB
+) -> AsyncIterator[tuple[str, str, int]]:
+    """
+    Promote a fully received upload session into permanent storage.
+
+    The session is marked completed only when the block creating the
+    record exits cleanly. If it raises, the stored file is kept and the
+    session is left "stored", so finalizing can be retried until the
+    session expires without uploading the file again.
+
+    Args:
+        session_id: Upload session ID
+        subdirectory: Expected upload target (e.g., 'proposals', 'documents')
+        current_user: Current authenticated user
+
+    Yields:
+        Tuple of (relative file URL, original filename, size in bytes)
+
+    Raises:
+        HTTPException: If the session is missing, incomplete or already finalized
+    """
+    session = get_owned_session_or_raise(
+        await upload_crud.get_upload_session(session_id),
+        current_user
+    )
+
+    if session.subdirectory != subdirectory:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Upload session was created for {session.subdirectory}, not {subdirectory}"
+        )
+
+    if session.status == "stored":
+        if session.expiresAt < datetime.utcnow():
+            raise HTTPException(status_code=410, detail="Upload session has expired")
+        # A previous finalize stored the file but failed to create its record
+        if not await upload_crud.set_upload_status(session_id, "stored", "finalizing"):
+            raise HTTPException(status_code=409, detail="Upload session is not open")
+        file_url = session.fileUrl
+    else:
+        missing = missing_ranges(session.receivedRanges, session.size)
+        if missing:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Upload is incomplete; {sum(end - start for start, end in missing)} bytes missing"
+            )
+
+        # Claim the session so concurrent finalize calls cannot promote it twice
+        if not await upload_crud.set_upload_status(session_id, "open", "finalizing"):
+            raise HTTPException(status_code=409, detail="Upload session is not open")
+
+        try:
+            key, file_url = build_upload_key(subdirectory, session.fileType)
+            await store_local_file(get_staging_path(session_id), key)
+        except Exception as e:
+            await upload_crud.set_upload_status(session_id, "finalizing", "open")
+            raise HTTPException(status_code=500, detail=f"Failed to finalize upload: {str(e)}")
+
+    try:
+        yield file_url, session.filename, session.size
+    except BaseException:
+        await upload_crud.set_upload_status(session_id, "finalizing", "stored", file_url=file_url)
+        raise
+
+    await upload_crud.set_upload_status(session_id, "finalizing", "completed", file_url=file_url)
@@ -0,0 +1,80 @@
+"""
+Weak ETags for polled JSON endpoints.
+
+The ETag of a response is a hash of the request (path and query string) and
+a version tuple read with a small metadata query (crud.version) before the
+records themselves. A client sending the ETag back in If-None-Match gets an
+empty 304 when the version has not changed, so polling costs one tiny query.
+"""
+import hashlib
+
+from fastapi import Request, Response
+
+# Authenticated data: browsers may store it but must revalidate on each use
+CACHE_CONTROL = "private, no-cache"
+
+
+def compute_etag(request: Request, version: tuple) -> str:
+    """
+    Compute the weak ETag of a response.
+
+    Args:
+        request: Incoming request (path and query parameters are hashed)
+        version: Version tuple from crud.version
+
+    Returns:
+        Weak ETag header value
+    """
+    query = sorted(request.query_params.multi_items())
+    digest = hashlib.blake2b(repr((request.url.path, query, version)).encode("utf-8"), digest_size=12)
+    return f'W/"{digest.hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Check an ETag against the request's If-None-Match header (weak comparison).
+
+    Args:
+        request: Incoming request
+        etag: Current ETag
+
+    Returns:
+        True if the client already has this version
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque_tag = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque_tag for tag in if_none_match.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    """
+    Build an empty 304 response for an unchanged resource.
+
+    Args:
+        etag: Current ETag
+
+    Returns:
+        304 response
+    """
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+def with_etag(response: Response, etag: str) -> Response:
+    """
+    Attach an ETag to a response.
+
+    Args:
+        response: Response to send
+        etag: Current ETag
+
+    Returns:
+        The same response
+    """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return response
@@ -5,6 +5,8 @@ from typing import Optional
 from fastapi import UploadFile, HTTPException
 
 from config import settings
+from utils.storage import get_storage
+from utils.storage_codec import find_stored_object, store_stream
 
 
 # Allowed file extensions for proposals
@@ -47,27 +49,54 @@ def validate_file(file: UploadFile) -> None:
     if not file or not file.filename:
         raise HTTPException(status_code=400, detail="No file provided")
     
-    # Check file extension
-    extension = get_file_extension(file.filename)
+    validate_filename(file.filename)
+    
+    # Note: File size validation happens during read in save_file function
+
+
+def validate_filename(filename: str) -> None:
+    """
+    Validate that a filename has an allowed extension.
+    
+    Args:
+        filename: Original filename
+        
+    Raises:
+        HTTPException: If file type is not allowed
+    """
+    extension = get_file_extension(filename)
     if extension not in ALLOWED_EXTENSIONS:
         raise HTTPException(
             status_code=400,
             detail=f"File type not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS.keys())}"
         )
+
+
+def build_upload_key(subdirectory: str, extension: str) -> tuple[str, str]:
+    """
+    Pick a unique storage key for a new upload.
     
-    # Note: File size validation happens during read in save_file function
+    Args:
+        subdirectory: Upload category (e.g., 'proposals', 'documents')
+        extension: File extension (lowercase, without dot)
+        
+    Returns:
+        Tuple of (storage key, relative file URL)
+    """
+    key = f"{subdirectory}/{uuid.uuid4()}.{extension}"
+    return key, f"/uploads/{key}"
 
 
-async def save_file(file: UploadFile, subdirectory: str = "proposals") -> str:
+async def save_upload(file: UploadFile, subdirectory: str = "proposals") -> tuple[str, int]:
     """
-    Save uploaded file to disk and return the file URL.
+    Save uploaded file to storage and return its URL and size.
     
     Args:
         file: Uploaded file
-        subdirectory: Subdirectory within upload_dir (e.g., 'proposals', 'documents')
+        subdirectory: Upload category (e.g., 'proposals', 'documents')
         
     Returns:
-        Relative file URL path
+        Tuple of (relative file URL path, file size in bytes)
         
     Raises:
         HTTPException: If file save fails or exceeds size limit
@@ -75,50 +104,72 @@ async def save_file(file: UploadFile, subdirectory: str = "proposals") -> str:
     # Validate file
     validate_file(file)
     
-    # Create upload directory if it doesn't exist
-    upload_path = Path(settings.upload_dir) / subdirectory
-    upload_path.mkdir(parents=True, exist_ok=True)
-    
-    # Generate unique filename
+    # Generate unique storage key
     extension = get_file_extension(file.filename)
-    unique_filename = f"{uuid.uuid4()}.{extension}"
-    file_path = upload_path / unique_filename
+    key, file_url = build_upload_key(subdirectory, extension)
     
-    # Save file with size validation
-    try:
+    async def read_chunks():
         file_size = 0
-        with open(file_path, "wb") as buffer:
-            while chunk := await file.read(8192):  # Read in 8KB chunks
-                file_size += len(chunk)
-                
-                # Check if file size exceeds limit
-                if file_size > settings.max_file_size:
-                    # Remove partial file
-                    buffer.close()
-                    if file_path.exists():
-                        file_path.unlink()
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"File size exceeds maximum allowed size of {settings.max_file_size / (1024 * 1024):.1f}MB"
-                    )
-                
-                buffer.write(chunk)
-        
-        # Return relative URL path
-        return f"/uploads/{subdirectory}/{unique_filename}"
+        while chunk := await file.read(8192):  # Read in 8KB chunks
+            file_size += len(chunk)
+            
+            # Check if file size exceeds limit
+            if file_size > settings.max_file_size:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"File size exceeds maximum allowed size of {settings.max_file_size / (1024 * 1024):.1f}MB"
+                )
+            
+            yield chunk
+    
+    # Save file with size validation; the backend discards partial writes
+    try:
+        file_size = await store_stream(key, read_chunks(), size=file.size)
+        return file_url, file_size
     
     except HTTPException:
         raise
     except Exception as e:
-        # Clean up file if it was created
-        if file_path.exists():
-            file_path.unlink()
         raise HTTPException(status_code=500, detail=f"Failed to save file: {str(e)}")
 
 
-def delete_file(file_url: str) -> bool:
+async def save_file(file: UploadFile, subdirectory: str = "proposals") -> str:
+    """
+    Save uploaded file to storage and return the file URL.
+    
+    Args:
+        file: Uploaded file
+        subdirectory: Upload category (e.g., 'proposals', 'documents')
+        
+    Returns:
+        Relative file URL path
+        
+    Raises:
+        HTTPException: If file save fails or exceeds size limit
+    """
+    file_url, _ = await save_upload(file, subdirectory)
+    return file_url
+
+
+def get_upload_relative_path(file_url: str) -> str:
+    """
+    Strip the '/uploads/' prefix from a relative file URL.
+    
+    Args:
+        file_url: Relative file URL (e.g., '/uploads/proposals/abc123.pdf')
+        
+    Returns:
+        Storage key (e.g., 'proposals/abc123.pdf')
+    """
+    relative_path = file_url.lstrip("/")
+    if relative_path.startswith("uploads/"):
+        relative_path = relative_path[len("uploads/"):]
+    return relative_path
+
+
+async def delete_file(file_url: str) -> bool:
     """
-    Delete a file from disk.
+    Delete a file from storage.
     
     Args:
         file_url: Relative file URL (e.g., '/uploads/proposals/abc123.pdf')
@@ -127,13 +178,10 @@ def delete_file(file_url: str) -> bool:
         True if file was deleted, False otherwise
     """
     try:
-        # Remove leading slash and construct full path
-        relative_path = file_url.lstrip("/")
-        file_path = Path(relative_path)
+        stored, _ = await find_stored_object(get_upload_relative_path(file_url))
         
-        if file_path.exists() and file_path.is_file():
-            file_path.unlink()
-            return True
+        if stored:
+            return await get_storage().delete(stored.key)
     except Exception:
         pass
     
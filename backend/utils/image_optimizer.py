@@ -0,0 +1,108 @@
+import tempfile
+from pathlib import Path
+
+from config import settings
+from utils.background import run_in_pool
+from utils.file_upload import get_upload_relative_path
+from utils.storage import get_storage
+from utils.storage_codec import find_stored_object, iter_original, local_copy, store_stream
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow not installed: receipts are stored as uploaded
+    Image = None
+    ImageOps = None
+
+# Receipt formats that are re-encoded on upload
+OPTIMIZABLE_EXTENSIONS = {"jpg", "jpeg", "png"}
+
+
+def get_original_copy_key(key: str) -> str:
+    """
+    Get the storage key the untouched upload is kept at when originals are retained.
+
+    Args:
+        key: Storage key of the uploaded file
+
+    Returns:
+        Key like 'receipts/abc123.orig.png' for 'receipts/abc123.png'
+    """
+    stem, _, extension = key.rpartition(".")
+    return f"{stem}.orig.{extension}"
+
+
+def optimize_receipt_image(file_path: Path, output_path: Path) -> int:
+    """
+    Downscale and re-encode a receipt photo as a metadata-free JPEG.
+
+    EXIF orientation is applied before metadata is dropped.
+
+    Args:
+        file_path: Path to a plain local copy of the uploaded image
+        output_path: Path to write the JPEG to
+
+    Returns:
+        Size of the written JPEG in bytes
+    """
+    max_size = (settings.receipt_max_dimension, settings.receipt_max_dimension)
+
+    with Image.open(file_path) as image:
+        image.draft("RGB", max_size)
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail(max_size)
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        # No exif/icc arguments are passed, so metadata is stripped
+        image.save(
+            output_path,
+            format="JPEG",
+            quality=settings.receipt_jpeg_quality,
+            optimize=True,
+            progressive=True
+        )
+
+    return output_path.stat().st_size
+
+
+async def optimize_receipt(file_url: str, original_size: int) -> tuple[str, int, int]:
+    """
+    Optimize an uploaded receipt in the worker pool.
+
+    If re-encoding would not make the file smaller, the upload is left unchanged.
+
+    Args:
+        file_url: Relative URL of the saved receipt
+        original_size: Size of the upload in bytes
+
+    Returns:
+        Tuple of (final receipt URL, original size, stored size)
+    """
+    key = get_upload_relative_path(file_url)
+    stored, codec = await find_stored_object(key)
+    if stored is None:
+        return file_url, 0, 0
+
+    if Image is None or key.rsplit(".", 1)[-1].lower() not in OPTIMIZABLE_EXTENSIONS:
+        return file_url, original_size, stored.size
+
+    storage = get_storage()
+    optimized_key = f"{key.rsplit('.', 1)[0]}.jpg"
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        optimized_path = Path(tmpdir) / "optimized.jpg"
+        async with local_copy(key) as file_path:
+            optimized_size = await run_in_pool(
+                "receipt-optimizer", settings.receipt_workers, optimize_receipt_image, file_path, optimized_path
+            )
+
+        if optimized_size >= original_size:
+            return file_url, original_size, stored.size
+
+        if settings.receipt_keep_original:
+            await store_stream(get_original_copy_key(key), iter_original(stored, codec))
+        await storage.put_file(optimized_key, optimized_path)
+
+    if stored.key != optimized_key:
+        await storage.delete(stored.key)
+
+    return f"/uploads/{optimized_key}", original_size, optimized_size
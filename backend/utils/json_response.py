@@ -0,0 +1,111 @@
+"""
+Application-wide JSON response class.
+
+Response models are converted to JSON-compatible data by FastAPI (pydantic's
+JSON mode, which applies each model's json_encoders and formats datetimes);
+this class only turns that data into bytes. It uses orjson when installed,
+which is several times faster than the standard library encoder on large
+lists, and falls back to the standard library encoder otherwise.
+
+List endpoints also use the helpers below to skip repeated model
+validation: records read from the database are copied into response models
+without validating them again, and the response model is encoded directly
+instead of being dumped and re-validated by FastAPI.
+"""
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Optional, TypeVar
+
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # orjson not installed: use the standard library encoder
+    orjson = None
+
+ResponseModel = TypeVar("ResponseModel", bound=BaseModel)
+
+
+def _encode_default(value: Any) -> Any:
+    """Encode values that are not JSON types (content passed to the response directly)."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_json(content: Any) -> bytes:
+    """
+    Encode content to compact JSON bytes, with orjson when available.
+
+    Args:
+        content: JSON-compatible data (datetimes, ObjectIds and models are converted)
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is None:
+        return json.dumps(
+            content,
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":"),
+            default=_encode_default
+        ).encode("utf-8")
+
+    # orjson writes naive datetimes like datetime.isoformat(), without a UTC offset
+    return orjson.dumps(content, default=_encode_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when available."""
+
+    def render(self, content: Any) -> bytes:
+        return encode_json(content)
+
+
+def to_response_model(model_class: type[ResponseModel], record: BaseModel, **overrides: Any) -> ResponseModel:
+    """
+    Copy a stored record into a response model without validating it again.
+
+    Fields the response model does not declare are dropped.
+
+    Args:
+        model_class: Response model class
+        record: Record read from the database (e.g., ExpenseInDB)
+        **overrides: Field values to set instead of the record's
+
+    Returns:
+        Response model instance
+    """
+    return model_class.model_construct(**{**record.__dict__, **overrides})
+
+
+def model_response(model: BaseModel, status_code: int = 200, include: Optional[dict] = None) -> FastJSONResponse:
+    """
+    Encode a response model directly.
+
+    Returning a model from a route makes FastAPI dump it and validate the
+    result against the response_model before encoding; returning this
+    response skips that second pass. Keep response_model on the route for
+    the OpenAPI schema.
+
+    Args:
+        model: Response model instance
+        status_code: HTTP status code
+        include: Only encode these fields (model_dump include filter)
+
+    Returns:
+        JSON response
+    """
+    return FastJSONResponse(model.model_dump(mode="json", include=include), status_code=status_code)
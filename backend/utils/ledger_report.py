@@ -0,0 +1,186 @@
+"""
+Ledger spreadsheet reports (XLSX and CSV).
+
+Rows come from crud.report.iter_ledger_rows, which merges the income and
+expense cursors, so no report is ever held in memory:
+
+- CSV is written batch by batch and streamed as it is produced.
+- XLSX is written with openpyxl's write-only mode, which spools the sheet
+  to disk, in a worker thread while the next batch is read. The finished
+  workbook is streamed from a temporary file that the route removes once
+  the response ends.
+"""
+import asyncio
+import csv
+import io
+from datetime import date
+from pathlib import Path
+from typing import AsyncIterable, AsyncIterator, Optional
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+from config import settings
+from utils.background import run_in_pool
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+CSV_MEDIA_TYPE = "text/csv; charset=utf-8"
+
+LEDGER_COLUMNS = ["Date", "Type", "Category / Source", "Vendor", "Description", "Income", "Expense"]
+COLUMN_WIDTHS = [12, 10, 18, 28, 50, 14, 14]
+AMOUNT_FORMAT = "#,##0.00"
+
+
+def ledger_values(row: dict) -> list:
+    """
+    Get the spreadsheet cells of a ledger row.
+
+    Args:
+        row: Row from iter_ledger_rows
+
+    Returns:
+        Cell values in LEDGER_COLUMNS order
+    """
+    is_income = row["type"] == "Income"
+    return [
+        row["date"],
+        row["type"],
+        row["category"],
+        row["vendor"],
+        row["description"],
+        row["amount"] if is_income else None,
+        None if is_income else row["amount"]
+    ]
+
+
+class LedgerTotals:
+    """Running income and expense totals for the report's last row."""
+
+    def __init__(self):
+        self.income = 0.0
+        self.expenses = 0.0
+
+    def add(self, row: dict) -> None:
+        if row["type"] == "Income":
+            self.income += row["amount"] or 0.0
+        else:
+            self.expenses += row["amount"] or 0.0
+
+    def values(self) -> list:
+        return ["Total", None, None, None, None, round(self.income, 2), round(self.expenses, 2)]
+
+
+async def iter_ledger_csv(rows: AsyncIterable[dict], rows_per_chunk: int) -> AsyncIterator[bytes]:
+    """
+    Write ledger rows as CSV.
+
+    Args:
+        rows: Rows from iter_ledger_rows
+        rows_per_chunk: Rows written per yielded chunk
+
+    Yields:
+        Chunks of UTF-8 CSV (with a byte order mark so Excel detects the encoding)
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    totals = LedgerTotals()
+
+    buffer.write("\ufeff")
+    writer.writerow(LEDGER_COLUMNS)
+    pending = 0
+
+    async for row in rows:
+        writer.writerow(ledger_values(row))
+        totals.add(row)
+        pending += 1
+        if pending >= rows_per_chunk:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+
+    writer.writerow(totals.values())
+    yield buffer.getvalue().encode("utf-8")
+
+
+class LedgerWorkbook:
+    """Write-only XLSX workbook with a single ledger sheet."""
+
+    def __init__(self):
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet("Ledger")
+        self.totals = LedgerTotals()
+
+        self.sheet.freeze_panes = "A2"
+        for index, width in enumerate(COLUMN_WIDTHS):
+            self.sheet.column_dimensions[chr(ord("A") + index)].width = width
+
+        self.sheet.append([self._bold(title) for title in LEDGER_COLUMNS])
+
+    def _bold(self, value) -> WriteOnlyCell:
+        cell = WriteOnlyCell(self.sheet, value=value)
+        cell.font = Font(bold=True)
+        return cell
+
+    def append_rows(self, rows: list[dict]) -> None:
+        """Append ledger rows (blocking)."""
+        for row in rows:
+            values = ledger_values(row)
+            # Real dates let Excel sort and filter by date
+            try:
+                values[0] = date.fromisoformat(values[0])
+            except (TypeError, ValueError):
+                pass
+            self.sheet.append(values)
+            self.totals.add(row)
+
+    def save(self, path: Path) -> None:
+        """Append the totals row and write the workbook (blocking)."""
+        totals = []
+        for index, value in enumerate(self.totals.values()):
+            cell = self._bold(value)
+            if index >= 5:
+                cell.number_format = AMOUNT_FORMAT
+            totals.append(cell)
+        self.sheet.append(totals)
+        self.workbook.save(path)
+
+
+async def write_ledger_xlsx(rows: AsyncIterable[dict], path: Path, rows_per_batch: int) -> None:
+    """
+    Write ledger rows to an XLSX file.
+
+    Each batch is appended in the report worker pool while the next batch
+    is read from the database.
+
+    Args:
+        rows: Rows from iter_ledger_rows
+        path: File to write
+        rows_per_batch: Rows handed to the worker at a time
+    """
+    workbook = LedgerWorkbook()
+    appending: Optional[asyncio.Future] = None
+    batch = []
+
+    try:
+        async for row in rows:
+            batch.append(row)
+            if len(batch) >= rows_per_batch:
+                if appending is not None:
+                    await appending
+                appending = asyncio.ensure_future(
+                    run_in_pool("reports", settings.report_workers, workbook.append_rows, batch)
+                )
+                batch = []
+
+        if appending is not None:
+            await appending
+    except BaseException:
+        if appending is not None:
+            appending.cancel()
+        raise
+
+    await run_in_pool("reports", settings.report_workers, workbook.append_rows, batch)
+    await run_in_pool("reports", settings.report_workers, workbook.save, path)
+
@@ -0,0 +1,41 @@
+"""
+Newline-delimited JSON streaming for full-ledger exports.
+
+Rows are encoded straight from the raw Mongo documents of a single cursor,
+one JSON object per line, and sent in chunks of rows so memory stays flat
+however many records are exported.
+"""
+from typing import AsyncIterable, AsyncIterator, Iterable
+
+from utils.json_response import encode_json
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+async def iter_ndjson(docs: AsyncIterable[dict], fields: Iterable[str], rows_per_chunk: int) -> AsyncIterator[bytes]:
+    """
+    Encode stored records as NDJSON lines shaped like their response model.
+
+    Args:
+        docs: Raw documents (with _id) read from the database
+        fields: Response fields to write; id is taken from _id
+        rows_per_chunk: Lines joined into each yielded chunk
+
+    Yields:
+        Chunks of NDJSON lines
+    """
+    fields = [field for field in fields if field != "id"]
+    lines = []
+
+    async for doc in docs:
+        row = {"id": str(doc["_id"])}
+        for field in fields:
+            row[field] = doc.get(field)
+        lines.append(encode_json(row))
+
+        if len(lines) >= rows_per_chunk:
+            yield b"\n".join(lines) + b"\n"
+            lines = []
+
+    if lines:
+        yield b"\n".join(lines) + b"\n"
@@ -0,0 +1,224 @@
+"""
+Response compression middleware.
+
+Text responses (JSON, NDJSON, CSV, HTML) larger than
+RESPONSE_COMPRESSION_MIN_SIZE are compressed with the best coding the client
+accepts out of RESPONSE_COMPRESSION (zstd, br, gzip). Responses that already
+carry a Content-Encoding (stored compressed downloads), binary types that are
+compressed already (images, PDFs, Office files, zips) and server-sent events
+(flushed token by token) pass through unchanged.
+
+Streaming responses are compressed chunk by chunk, with each chunk flushed so
+the client receives data as it is produced.
+"""
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config import settings
+from utils.storage_codec import GZIP_WBITS, zstandard
+
+try:
+    import brotli
+except ImportError:  # brotli not installed: br is not offered
+    brotli = None
+
+# Media types worth compressing (prefix match); everything else passes through
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+# Flushed per event to keep streaming latency low; compression gains little
+EXCLUDED_TYPES = ("text/event-stream",)
+
+
+class _Compressor:
+    """Incremental compressor for one response body."""
+
+    def __init__(self, codec: str):
+        self.codec = codec
+        if codec == "zstd":
+            self._compressor = zstandard.ZstdCompressor(level=settings.response_zstd_level).compressobj()
+        elif codec == "br":
+            self._compressor = brotli.Compressor(quality=settings.response_brotli_quality)
+        else:
+            self._compressor = zlib.compressobj(settings.response_gzip_level, zlib.DEFLATED, GZIP_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk and flush it so the client can decode it right away."""
+        if self.codec == "zstd":
+            return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        if self.codec == "br":
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        """Compress the last chunk and end the stream."""
+        if self.codec == "zstd":
+            return self._compressor.compress(data) + self._compressor.flush()
+        if self.codec == "br":
+            return self._compressor.process(data) + self._compressor.finish()
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+def get_available_encodings() -> list[str]:
+    """
+    Get the configured response codings whose libraries are installed.
+
+    Returns:
+        Content coding tokens in order of preference
+    """
+    available = {"gzip": True, "br": brotli is not None, "zstd": zstandard is not None}
+    codings = [coding.strip().lower() for coding in settings.response_compression.split(",")]
+    return [coding for coding in codings if available.get(coding)]
+
+
+def choose_encoding(accept_encoding: str, encodings: list[str]) -> Optional[str]:
+    """
+    Pick the response coding for an Accept-Encoding header.
+
+    The client's quality values win; ties go to the server's order.
+
+    Args:
+        accept_encoding: Accept-Encoding request header value
+        encodings: Codings the server offers, in order of preference
+
+    Returns:
+        Content coding token, or None to send the response uncompressed
+    """
+    qualities = {}
+    for item in accept_encoding.lower().split(","):
+        token, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[token.strip()] = quality
+
+    best, best_quality = None, 0.0
+    for coding in encodings:
+        quality = qualities.get(coding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def is_compressible(headers: Headers) -> bool:
+    """
+    Check whether a response should be compressed, based on its headers.
+
+    Args:
+        headers: Response headers
+
+    Returns:
+        True for uncompressed text responses
+    """
+    if "content-encoding" in headers or "content-range" in headers:
+        return False
+    media_type = headers.get("content-type", "").split(";", 1)[0].strip().lower()
+    if media_type.startswith(EXCLUDED_TYPES):
+        return False
+    return media_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing text responses with zstd, brotli or gzip."""
+
+    def __init__(self, app: ASGIApp, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = settings.response_compression_min_size if minimum_size is None else minimum_size
+        self.encodings = get_available_encodings()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.encodings:
+            await self.app(scope, receive, send)
+            return
+
+        coding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        await _CompressionResponder(self.app, coding, self.minimum_size)(scope, receive, send)
+
+
+class _CompressionResponder:
+    """Compresses the body of a single response."""
+
+    def __init__(self, app: ASGIApp, coding: Optional[str], minimum_size: int):
+        self.app = app
+        self.coding = coding
+        self.minimum_size = minimum_size
+        self.send: Optional[Send] = None
+        self.start_message: Optional[Message] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Hold the headers until the first body chunk shows how to send it
+            self.start_message = message
+            return
+
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        if self.passthrough:
+            await self.send(message)
+            return
+
+        if self.compressor is not None:
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            message["body"] = self.compressor.compress(body) if more_body else self.compressor.finish(body)
+            await self.send(message)
+            return
+
+        await self._start(message)
+
+    async def _start(self, message: Message) -> None:
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not is_compressible(headers):
+            self.passthrough = True
+            await self.send(self.start_message)
+            await self.send(message)
+            return
+
+        # The representation depends on Accept-Encoding even when sent as-is
+        headers.add_vary_header("Accept-Encoding")
+
+        declared_size = headers.get("content-length")
+        too_small = len(body) < self.minimum_size if not more_body else (
+            declared_size is not None and int(declared_size) < self.minimum_size
+        )
+        if self.coding is None or too_small:
+            self.passthrough = True
+            await self.send(self.start_message)
+            await self.send(message)
+            return
+
+        self.compressor = _Compressor(self.coding)
+        headers["Content-Encoding"] = self.coding
+        if more_body:
+            del headers["Content-Length"]
+            message["body"] = self.compressor.compress(body)
+        else:
+            message["body"] = self.compressor.finish(body)
+            headers["Content-Length"] = str(len(message["body"]))
+
+        await self.send(self.start_message)
+        await self.send(message)
@@ -0,0 +1,92 @@
+"""
+Sparse fieldsets for list endpoints.
+
+A `fields=id,date,amount` query parameter limits both the Mongo projection
+(bytes read from the database) and the response body (bytes sent to the
+browser) to the named response fields. The id is always included.
+"""
+from typing import Optional
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+FIELDS_QUERY_DESCRIPTION = "Comma-separated response fields to return (e.g., id,date,amount); all fields if omitted"
+
+
+def parse_fields(fields: Optional[str], response_model: type[BaseModel]) -> Optional[set[str]]:
+    """
+    Parse and validate a fields query parameter.
+
+    Args:
+        fields: Comma-separated field names, or None
+        response_model: Response model of one list item
+
+    Returns:
+        Set of requested field names (always including id), or None for all fields
+
+    Raises:
+        HTTPException: 400 if a field is not part of the response model
+    """
+    if not fields:
+        return None
+
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(response_model.model_fields)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}. "
+                   f"Allowed: {', '.join(response_model.model_fields)}"
+        )
+
+    return requested | {"id"}
+
+
+def select_fields(response_model: type[BaseModel], field_names: Optional[set[str]]) -> list[str]:
+    """
+    List the response fields to write, in model order.
+
+    Args:
+        response_model: Response model of one item
+        field_names: Fields from parse_fields, or None for all fields
+
+    Returns:
+        Field names
+    """
+    return [name for name in response_model.model_fields if field_names is None or name in field_names]
+
+
+def build_projection(field_names: Optional[set[str]], stored_names: Optional[dict[str, str]] = None) -> Optional[dict]:
+    """
+    Build the Mongo projection for requested response fields.
+
+    Args:
+        field_names: Fields from parse_fields, or None for all fields
+        stored_names: Response fields stored under another name (e.g., fileSizeBytes -> fileSize)
+
+    Returns:
+        Projection dict, or None to read whole documents
+    """
+    if field_names is None:
+        return None
+
+    stored_names = stored_names or {}
+    # id is read from _id, which Mongo always returns
+    projection = {stored_names.get(name, name): 1 for name in field_names if name != "id"}
+    return projection or {"_id": 1}
+
+
+def build_include(list_field: str, field_names: Optional[set[str]]) -> Optional[dict]:
+    """
+    Build the model_dump include filter for a list response.
+
+    Args:
+        list_field: Name of the list attribute (e.g., 'expenses')
+        field_names: Fields from parse_fields, or None for all fields
+
+    Returns:
+        Include dict, or None to dump every field
+    """
+    if field_names is None:
+        return None
+    return {list_field: {"__all__": field_names}, "total": True}
@@ -0,0 +1,568 @@
+"""
+Pluggable storage backends for uploaded files.
+
+Files are addressed by key: their path relative to the upload root, which is
+also the tail of their URL ('/uploads/<key>'). STORAGE_BACKEND selects the
+driver:
+
+- local: files under UPLOAD_DIR, sharded into subdirectories taken from the
+  start of the filename ('documents/ab/cd/abcd1234.pdf') so no directory
+  grows large enough to slow down lookups. Files written before sharding are
+  still found at their flat path; move them with:
+      python -m utils.storage --reshard
+- s3: an S3-compatible bucket. Set S3_ENDPOINT_URL to use a local stand-in
+  such as MinIO instead of AWS.
+"""
+import asyncio
+import os
+import shutil
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterable, AsyncIterator, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from config import settings
+
+try:
+    import boto3
+    from botocore.exceptions import ClientError
+except ImportError:  # boto3 not installed: only the local backend is available
+    boto3 = None
+    ClientError = None
+
+READ_CHUNK_SIZE = 65536
+
+# Data gathered before each local file write
+WRITE_CHUNK_SIZE = 262144
+
+# Multipart part size for S3 uploads (S3 requires at least 5MB per part)
+S3_PART_SIZE = 8 * 1024 * 1024
+
+
+@dataclass
+class StoredObject:
+    """Metadata of a stored file."""
+
+    key: str
+    size: int
+    modified: float  # Unix timestamp
+
+
+def is_valid_key(key: str) -> bool:
+    """
+    Check that a key is a plain relative path that stays inside the store.
+
+    Args:
+        key: Storage key (e.g., 'documents/abc123.pdf')
+
+    Returns:
+        True if the key has no empty, '.' or '..' components
+    """
+    parts = key.split("/")
+    return bool(key) and all(part not in ("", ".", "..") for part in parts)
+
+
+async def iter_file_chunks(file_path: Path) -> AsyncIterator[bytes]:
+    """
+    Read a local file in chunks without blocking the event loop.
+
+    Args:
+        file_path: File to read
+
+    Yields:
+        Chunks of file data
+    """
+    with open(file_path, "rb") as buffer:
+        while chunk := await run_in_threadpool(buffer.read, READ_CHUNK_SIZE):
+            yield chunk
+
+
+class StorageBackend(ABC):
+    """Interface every storage driver implements."""
+
+    @abstractmethod
+    async def put_stream(self, key: str, chunks: AsyncIterable[bytes]) -> int:
+        """
+        Store a file from a stream of chunks, replacing any existing file.
+
+        The file only becomes visible once the stream completes; if the
+        stream raises, nothing is stored.
+
+        Args:
+            key: Storage key
+            chunks: Async iterable of file data
+
+        Returns:
+            Number of bytes stored
+        """
+
+    @abstractmethod
+    def get_stream(self, key: str) -> AsyncIterator[bytes]:
+        """
+        Stream a stored file.
+
+        Args:
+            key: Storage key
+
+        Yields:
+            Chunks of file data
+
+        Raises:
+            FileNotFoundError: If the key does not exist
+        """
+
+    @abstractmethod
+    async def stat(self, key: str) -> Optional[StoredObject]:
+        """
+        Get metadata of a stored file.
+
+        Args:
+            key: Storage key
+
+        Returns:
+            StoredObject, or None if the key does not exist
+        """
+
+    @abstractmethod
+    async def delete(self, key: str) -> bool:
+        """
+        Delete a stored file.
+
+        Args:
+            key: Storage key
+
+        Returns:
+            True if a file was deleted, False if it did not exist
+        """
+
+    @abstractmethod
+    def list(self, prefix: str = "") -> AsyncIterator[StoredObject]:
+        """
+        Stream metadata of every stored file whose key starts with prefix.
+
+        Args:
+            prefix: Key prefix (e.g., 'documents/')
+
+        Yields:
+            StoredObject for each file, in no particular order
+        """
+
+    async def put_file(self, key: str, source_path: Path) -> int:
+        """
+        Move a fully written local file into storage.
+
+        Args:
+            key: Storage key
+            source_path: Local file to store (removed afterwards)
+
+        Returns:
+            Number of bytes stored
+        """
+        size = await self.put_stream(key, iter_file_chunks(source_path))
+        source_path.unlink(missing_ok=True)
+        return size
+
+    def local_path(self, key: str) -> Optional[Path]:
+        """
+        Get the on-disk path of a stored file, for backends that have one.
+
+        Args:
+            key: Storage key
+
+        Returns:
+            Path to the file, or None if it does not exist or is not local
+        """
+        return None
+
+    async def compact(self, dry_run: bool = False) -> int:
+        """
+        Remove housekeeping leftovers such as empty directories.
+
+        Args:
+            dry_run: Count without removing
+
+        Returns:
+            Number of items found (and removed unless dry_run)
+        """
+        return 0
+
+
+class LocalStorageBackend(StorageBackend):
+    """Stores files on local disk under a sharded directory layout."""
+
+    def __init__(self, root: Path, shard_depth: int = 2):
+        self.root = root
+        self.shard_depth = shard_depth
+
+    def _sharded_path(self, key: str) -> Path:
+        """Get the sharded on-disk path a key is written to."""
+        directory, _, name = key.rpartition("/")
+        shards = [name[level * 2:level * 2 + 2] for level in range(self.shard_depth)]
+        return self.root.joinpath(directory, *[shard for shard in shards if shard], name)
+
+    def _flat_path(self, key: str) -> Path:
+        """Get the legacy unsharded path of a key."""
+        return self.root / key
+
+    def local_path(self, key: str) -> Optional[Path]:
+        if not is_valid_key(key):
+            return None
+        for path in (self._sharded_path(key), self._flat_path(key)):
+            if path.is_file():
+                return path
+        return None
+
+    async def put_stream(self, key: str, chunks: AsyncIterable[bytes]) -> int:
+        if not is_valid_key(key):
+            raise ValueError(f"Invalid storage key: {key}")
+
+        file_path = self._sharded_path(key)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write beside the target and rename, so readers never see a partial file
+        temp_path = file_path.with_name(f".{file_path.name}.{uuid.uuid4().hex}.part")
+
+        size = 0
+        pending = bytearray()
+        try:
+            buffer = await run_in_threadpool(open, temp_path, "wb")
+            try:
+                # Writes are batched and run in the threadpool to keep the event loop free
+                async for chunk in chunks:
+                    pending += chunk
+                    size += len(chunk)
+                    if len(pending) >= WRITE_CHUNK_SIZE:
+                        await run_in_threadpool(buffer.write, bytes(pending))
+                        pending.clear()
+                await run_in_threadpool(buffer.write, bytes(pending))
+            finally:
+                await run_in_threadpool(buffer.close)
+            await run_in_threadpool(os.replace, temp_path, file_path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+        self._remove_flat_copy(key, file_path)
+        return size
+
+    async def put_file(self, key: str, source_path: Path) -> int:
+        if not is_valid_key(key):
+            raise ValueError(f"Invalid storage key: {key}")
+
+        file_path = self._sharded_path(key)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        size = source_path.stat().st_size
+        await run_in_threadpool(shutil.move, source_path, file_path)
+
+        self._remove_flat_copy(key, file_path)
+        return size
+
+    def _remove_flat_copy(self, key: str, file_path: Path) -> None:
+        """Drop a legacy flat file that a newly written sharded file replaces."""
+        flat_path = self._flat_path(key)
+        if flat_path != file_path:
+            flat_path.unlink(missing_ok=True)
+
+    async def get_stream(self, key: str) -> AsyncIterator[bytes]:
+        file_path = self.local_path(key)
+        if file_path is None:
+            raise FileNotFoundError(key)
+
+        async for chunk in iter_file_chunks(file_path):
+            yield chunk
+
+    async def stat(self, key: str) -> Optional[StoredObject]:
+        file_path = self.local_path(key)
+        if file_path is None:
+            return None
+
+        stat = file_path.stat()
+        return StoredObject(key=key, size=stat.st_size, modified=stat.st_mtime)
+
+    async def delete(self, key: str) -> bool:
+        file_path = self.local_path(key)
+        if file_path is None:
+            return False
+
+        try:
+            file_path.unlink()
+        except FileNotFoundError:
+            return False
+        return True
+
+    def _scan_directory(self, directory: Path) -> list[tuple[str, bool, int, float]]:
+        """List one directory as (name, is_dir, size, mtime) tuples."""
+        items = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        items.append((entry.name, True, 0, 0.0))
+                    elif entry.is_file(follow_symlinks=False):
+                        stat = entry.stat(follow_symlinks=False)
+                        items.append((entry.name, False, stat.st_size, stat.st_mtime))
+        except FileNotFoundError:
+            pass
+        return items
+
+    async def list(self, prefix: str = "") -> AsyncIterator[StoredObject]:
+        # Keys are '<top-level directory>/<filename>'; shard directories are not part of them
+        top_level = prefix.split("/", 1)[0] if "/" in prefix else ""
+        stack = [(self.root / top_level, top_level)] if top_level else [(self.root, "")]
+
+        while stack:
+            directory, key_directory = stack.pop()
+            # One directory per worker call keeps the event loop responsive on large trees
+            for name, is_dir, size, modified in await run_in_threadpool(self._scan_directory, directory):
+                if is_dir:
+                    # Hidden top-level directories (e.g., upload staging) are not part of the store
+                    if directory == self.root and name.startswith("."):
+                        continue
+                    stack.append((directory / name, key_directory or name))
+                    continue
+
+                key = f"{key_directory}/{name}" if key_directory else name
+                if key.startswith(prefix):
+                    yield StoredObject(key=key, size=size, modified=modified)
+
+    def _remove_empty_directories(self, dry_run: bool) -> int:
+        """Remove empty shard directories below the top-level upload subdirectories."""
+        removed = 0
+        for dirpath, dirnames, filenames in os.walk(self.root, topdown=False):
+            path = Path(dirpath)
+            if path == self.root or path.parent == self.root:
+                continue
+            if not filenames and not any((path / name).exists() for name in dirnames):
+                removed += 1
+                if not dry_run:
+                    try:
+                        path.rmdir()
+                    except OSError:
+                        pass
+        return removed
+
+    async def compact(self, dry_run: bool = False) -> int:
+        if not self.root.exists():
+            return 0
+        return await run_in_threadpool(self._remove_empty_directories, dry_run)
+
+    def reshard(self) -> int:
+        """
+        Move files stored at their legacy flat path into the sharded layout.
+
+        Returns:
+            Number of files moved
+        """
+        moved = 0
+        if not self.root.exists():
+            return moved
+
+        for directory in self.root.iterdir():
+            if not directory.is_dir() or directory.name.startswith("."):
+                continue
+            for entry in os.scandir(directory):
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                key = f"{directory.name}/{entry.name}"
+                target = self._sharded_path(key)
+                if target == Path(entry.path):
+                    continue
+                target.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(entry.path, target)
+                moved += 1
+        return moved
+
+
+class S3StorageBackend(StorageBackend):
+    """Stores files in an S3-compatible bucket."""
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        access_key_id: Optional[str] = None,
+        secret_access_key: Optional[str] = None
+    ):
+        if boto3 is None:
+            raise RuntimeError("boto3 is required for the s3 storage backend")
+        if not bucket:
+            raise RuntimeError("S3_BUCKET must be set for the s3 storage backend")
+
+        self.bucket = bucket
+        self.prefix = prefix
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url or None,
+            region_name=region or None,
+            aws_access_key_id=access_key_id or None,
+            aws_secret_access_key=secret_access_key or None
+        )
+
+    def _object_key(self, key: str) -> str:
+        if not is_valid_key(key):
+            raise ValueError(f"Invalid storage key: {key}")
+        return f"{self.prefix}{key}"
+
+    @staticmethod
+    def _is_not_found(error: Exception) -> bool:
+        code = error.response.get("Error", {}).get("Code", "")
+        return code in ("404", "NoSuchKey", "NotFound")
+
+    async def put_stream(self, key: str, chunks: AsyncIterable[bytes]) -> int:
+        object_key = self._object_key(key)
+        buffer = bytearray()
+        upload_id = None
+        parts = []
+        size = 0
+
+        async def upload_part(data: bytes) -> None:
+            part_number = len(parts) + 1
+            response = await asyncio.to_thread(
+                self.client.upload_part,
+                Bucket=self.bucket, Key=object_key, UploadId=upload_id,
+                PartNumber=part_number, Body=data
+            )
+            parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+
+        try:
+            async for chunk in chunks:
+                buffer += chunk
+                size += len(chunk)
+                if len(buffer) >= S3_PART_SIZE:
+                    # Files larger than one part switch to a multipart upload
+                    if upload_id is None:
+                        response = await asyncio.to_thread(
+                            self.client.create_multipart_upload, Bucket=self.bucket, Key=object_key
+                        )
+                        upload_id = response["UploadId"]
+                    await upload_part(bytes(buffer))
+                    buffer.clear()
+
+            if upload_id is None:
+                await asyncio.to_thread(
+                    self.client.put_object, Bucket=self.bucket, Key=object_key, Body=bytes(buffer)
+                )
+            else:
+                if buffer:
+                    await upload_part(bytes(buffer))
+                await asyncio.to_thread(
+                    self.client.complete_multipart_upload,
+                    Bucket=self.bucket, Key=object_key, UploadId=upload_id,
+                    MultipartUpload={"Parts": parts}
+                )
+        except BaseException:
+            if upload_id is not None:
+                await asyncio.shield(asyncio.to_thread(
+                    self.client.abort_multipart_upload,
+                    Bucket=self.bucket, Key=object_key, UploadId=upload_id
+                ))
+            raise
+
+        return size
+
+    async def get_stream(self, key: str) -> AsyncIterator[bytes]:
+        try:
+            response = await asyncio.to_thread(
+                self.client.get_object, Bucket=self.bucket, Key=self._object_key(key)
+            )
+        except ClientError as e:
+            if self._is_not_found(e):
+                raise FileNotFoundError(key) from e
+            raise
+
+        body = response["Body"]
+        try:
+            while chunk := await asyncio.to_thread(body.read, READ_CHUNK_SIZE):
+                yield chunk
+        finally:
+            body.close()
+
+    async def stat(self, key: str) -> Optional[StoredObject]:
+        if not is_valid_key(key):
+            return None
+        try:
+            response = await asyncio.to_thread(
+                self.client.head_object, Bucket=self.bucket, Key=self._object_key(key)
+            )
+        except ClientError as e:
+            if self._is_not_found(e):
+                return None
+            raise
+
+        return StoredObject(
+            key=key,
+            size=response["ContentLength"],
+            modified=response["LastModified"].timestamp()
+        )
+
+    async def delete(self, key: str) -> bool:
+        # DeleteObject succeeds for missing keys, so check first to report it
+        if await self.stat(key) is None:
+            return False
+        await asyncio.to_thread(self.client.delete_object, Bucket=self.bucket, Key=self._object_key(key))
+        return True
+
+    async def list(self, prefix: str = "") -> AsyncIterator[StoredObject]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        pages = iter(paginator.paginate(Bucket=self.bucket, Prefix=f"{self.prefix}{prefix}"))
+
+        # Each page is fetched lazily, so pull them one at a time off the event loop
+        while page := await asyncio.to_thread(next, pages, None):
+            for item in page.get("Contents", []):
+                yield StoredObject(
+                    key=item["Key"][len(self.prefix):],
+                    size=item["Size"],
+                    modified=item["LastModified"].timestamp()
+                )
+
+
+_storage: Optional[StorageBackend] = None
+
+
+def get_storage() -> StorageBackend:
+    """
+    Get the configured storage backend, creating it on first use.
+
+    Returns:
+        StorageBackend instance
+
+    Raises:
+        RuntimeError: If the backend is unknown or misconfigured
+    """
+    global _storage
+    if _storage is None:
+        backend = settings.storage_backend.lower()
+        if backend == "local":
+            _storage = LocalStorageBackend(Path(settings.upload_dir), settings.storage_shard_depth)
+        elif backend == "s3":
+            _storage = S3StorageBackend(
+                bucket=settings.s3_bucket,
+                prefix=settings.s3_prefix,
+                endpoint_url=settings.s3_endpoint_url,
+                region=settings.s3_region,
+                access_key_id=settings.s3_access_key_id,
+                secret_access_key=settings.s3_secret_access_key
+            )
+        else:
+            raise RuntimeError(f"Unknown storage backend: {settings.storage_backend}")
+    return _storage
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Storage backend maintenance")
+    parser.add_argument("--reshard", action="store_true", help="Move flat local uploads into shard directories")
+    args = parser.parse_args()
+
+    if args.reshard:
+        storage = get_storage()
+        if not isinstance(storage, LocalStorageBackend):
+            parser.error("--reshard only applies to the local storage backend")
+        print(f"Moved {storage.reshard()} files")
+    else:
+        parser.print_help()
@@ -0,0 +1,336 @@
+"""
+Optional compression codec for stored uploads.
+
+When STORAGE_COMPRESSION is set, files of compressible types are written
+through zstd (or gzip) and stored under their key plus a '.zst'/'.gz'
+suffix. File URLs do not change; readers locate the stored file with
+find_stored_object and read through iter_original/local_copy.
+"""
+import tempfile
+import zlib
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterable, AsyncIterator, Optional
+
+from config import settings
+from utils.background import run_in_pool
+from utils.storage import StoredObject, get_storage, iter_file_chunks
+
+try:
+    import zstandard
+except ImportError:  # zstandard not installed: gzip is used instead
+    zstandard = None
+
+# Codec name (also the HTTP Content-Encoding token) -> stored file suffix
+CODEC_SUFFIXES = {
+    "zstd": ".zst",
+    "gzip": ".gz"
+}
+
+# zlib window bits selecting the gzip container
+GZIP_WBITS = 31
+
+# Upload data gathered before each compression call in the worker pool
+COMPRESS_BATCH_SIZE = 262144
+
+
+def get_codec() -> Optional[str]:
+    """
+    Get the configured storage codec, falling back to gzip if zstd is unavailable.
+
+    Returns:
+        'zstd', 'gzip', or None if compression is disabled
+    """
+    codec = settings.storage_compression.lower()
+    if codec == "zstd" and zstandard is None:
+        return "gzip"
+    return codec if codec in CODEC_SUFFIXES else None
+
+
+def get_codec_for(extension: str) -> Optional[str]:
+    """
+    Get the codec to store a file type with.
+
+    Args:
+        extension: File extension (lowercase, without dot)
+
+    Returns:
+        Codec name, or None if this type is stored uncompressed
+    """
+    compressible = {ext.strip().lower() for ext in settings.storage_compression_types.split(",")}
+    return get_codec() if extension in compressible else None
+
+
+def get_stored_key(key: str, codec: Optional[str]) -> str:
+    """
+    Get the storage key of a file stored with a codec.
+
+    Args:
+        key: Logical storage key (matching the file URL)
+        codec: Codec name, or None for plain storage
+
+    Returns:
+        Key with the codec suffix appended
+    """
+    if codec is None:
+        return key
+    return key + CODEC_SUFFIXES[codec]
+
+
+def strip_codec_suffix(name: str) -> str:
+    """
+    Remove a codec suffix from a stored filename.
+
+    Args:
+        name: Stored filename or storage key
+
+    Returns:
+        Logical filename or key
+    """
+    for suffix in CODEC_SUFFIXES.values():
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+async def find_stored_object(key: str) -> tuple[Optional[StoredObject], Optional[str]]:
+    """
+    Locate the stored file for a logical key, plain or compressed.
+
+    Args:
+        key: Logical storage key (matching the file URL)
+
+    Returns:
+        Tuple of (stored object, codec), or (None, None) if not found
+    """
+    storage = get_storage()
+    for codec in (None, *CODEC_SUFFIXES):
+        stored = await storage.stat(get_stored_key(key, codec))
+        if stored is not None:
+            return stored, codec
+    return None, None
+
+
+def _finish_compression(compressor, data: bytes) -> bytes:
+    """Compress the last input and flush the compressor (blocking)."""
+    return compressor.compress(data) + compressor.flush()
+
+
+async def compress_chunks(
+    chunks: AsyncIterable[bytes],
+    codec: Optional[str],
+    size: Optional[int] = None
+) -> AsyncIterator[bytes]:
+    """
+    Compress a stream of chunks with a codec.
+
+    Args:
+        chunks: Original file data
+        codec: Codec name, or None to pass chunks through unchanged
+        size: Original size in bytes, if known (recorded in zstd frame headers)
+
+    Yields:
+        Chunks of stored data
+    """
+    if codec == "zstd":
+        compressor = zstandard.ZstdCompressor(level=settings.storage_compression_level).compressobj(
+            size=size if size is not None else -1
+        )
+    elif codec == "gzip":
+        compressor = zlib.compressobj(min(settings.storage_compression_level, 9), zlib.DEFLATED, GZIP_WBITS)
+    else:
+        async for chunk in chunks:
+            yield chunk
+        return
+
+    # Compress batches of input in the worker pool to keep the event loop free
+    pending = bytearray()
+    async for chunk in chunks:
+        pending += chunk
+        if len(pending) >= COMPRESS_BATCH_SIZE:
+            data = await run_in_pool("compression", settings.storage_compression_workers, compressor.compress, bytes(pending))
+            pending.clear()
+            if data:
+                yield data
+    yield await run_in_pool("compression", settings.storage_compression_workers, _finish_compression, compressor, bytes(pending))
+
+
+async def decompress_chunks(chunks: AsyncIterable[bytes], codec: Optional[str]) -> AsyncIterator[bytes]:
+    """
+    Decompress a stream of stored chunks.
+
+    Args:
+        chunks: Stored file data
+        codec: Codec the file was stored with, or None
+
+    Yields:
+        Chunks of original data
+    """
+    if codec == "zstd":
+        decompressor = zstandard.ZstdDecompressor().decompressobj()
+    elif codec == "gzip":
+        decompressor = zlib.decompressobj(GZIP_WBITS)
+    else:
+        async for chunk in chunks:
+            yield chunk
+        return
+
+    async for chunk in chunks:
+        data = decompressor.decompress(chunk)
+        if data:
+            yield data
+    data = decompressor.flush()
+    if data:
+        yield data
+
+
+def iter_original(stored: StoredObject, codec: Optional[str]) -> AsyncIterator[bytes]:
+    """
+    Stream the original bytes of a stored file.
+
+    Args:
+        stored: Stored object returned by find_stored_object
+        codec: Codec the file was stored with, or None
+
+    Returns:
+        Async iterator of decompressed chunks
+    """
+    return decompress_chunks(get_storage().get_stream(stored.key), codec)
+
+
+async def get_original_size(stored: StoredObject, codec: Optional[str]) -> int:
+    """
+    Get the uncompressed size of a stored file.
+
+    Reads the size from the zstd frame header when available, otherwise
+    decompresses the file to count bytes.
+
+    Args:
+        stored: Stored object returned by find_stored_object
+        codec: Codec the file was stored with, or None
+
+    Returns:
+        Original size in bytes
+    """
+    if codec is None:
+        return stored.size
+
+    if codec == "zstd":
+        header = b""
+        stream = get_storage().get_stream(stored.key)
+        try:
+            async for chunk in stream:
+                header = chunk
+                break
+        finally:
+            await stream.aclose()
+        content_size = zstandard.frame_content_size(header[:18]) if len(header) >= 18 else -1
+        if content_size >= 0:
+            return content_size
+
+    size = 0
+    async for chunk in iter_original(stored, codec):
+        size += len(chunk)
+    return size
+
+
+async def store_stream(key: str, chunks: AsyncIterable[bytes], size: Optional[int] = None) -> int:
+    """
+    Store a file, compressing it if its type is configured for compression.
+
+    Args:
+        key: Logical storage key (matching the file URL)
+        chunks: Original file data
+        size: Original size in bytes, if known
+
+    Returns:
+        Original size in bytes
+    """
+    codec = get_codec_for(key.rsplit(".", 1)[-1].lower())
+    original_size = 0
+
+    async def counted() -> AsyncIterator[bytes]:
+        nonlocal original_size
+        async for chunk in chunks:
+            original_size += len(chunk)
+            yield chunk
+
+    await get_storage().put_stream(get_stored_key(key, codec), compress_chunks(counted(), codec, size))
+    return original_size
+
+
+async def store_local_file(source_path: Path, key: str) -> int:
+    """
+    Move a fully written local file into storage, compressing it if needed.
+
+    Args:
+        source_path: Plain file to store (removed afterwards)
+        key: Logical storage key (matching the file URL)
+
+    Returns:
+        Original size in bytes
+    """
+    codec = get_codec_for(key.rsplit(".", 1)[-1].lower())
+    if codec is None:
+        return await get_storage().put_file(key, source_path)
+
+    size = await store_stream(key, iter_file_chunks(source_path), size=source_path.stat().st_size)
+    source_path.unlink()
+    return size
+
+
+@asynccontextmanager
+async def local_copy(key: str) -> AsyncIterator[Optional[Path]]:
+    """
+    Provide a plain on-disk copy of a stored file for tools that need a path.
+
+    Plain files on the local backend are used in place; anything else is
+    written to a temporary file (keeping the filename) that is removed on exit.
+
+    Args:
+        key: Logical storage key (matching the file URL)
+
+    Yields:
+        Path to the plain file, or None if the file does not exist
+    """
+    stored, codec = await find_stored_object(key)
+    if stored is None:
+        yield None
+        return
+
+    local_path = get_storage().local_path(stored.key) if codec is None else None
+    if local_path is not None:
+        yield local_path
+        return
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        temp_path = Path(tmpdir) / key.rsplit("/", 1)[-1]
+        with open(temp_path, "wb") as buffer:
+            async for chunk in iter_original(stored, codec):
+                buffer.write(chunk)
+        yield temp_path
+
+
+def accepts_encoding(accept_encoding: str, codec: str) -> bool:
+    """
+    Check whether an Accept-Encoding header allows a content coding.
+
+    Args:
+        accept_encoding: Accept-Encoding request header value
+        codec: Content coding token (e.g., 'gzip', 'zstd')
+
+    Returns:
+        True if the client accepts the coding with a non-zero quality
+    """
+    for item in accept_encoding.lower().split(","):
+        token, _, params = item.strip().partition(";")
+        if token.strip() not in (codec, "*"):
+            continue
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                return float(quality[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
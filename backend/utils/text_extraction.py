@@ -0,0 +1,127 @@
+import re
+import shutil
+import subprocess
+import zipfile
+from pathlib import Path
+from typing import Optional
+from xml.etree import ElementTree
+
+from config import settings
+from crud import document_text as document_text_crud
+from utils.ai_retrieval import mark_record_changed
+from utils.background import run_in_pool, spawn
+from utils.file_upload import get_upload_relative_path
+from utils.storage_codec import local_copy
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # pypdf not installed: fall back to pdftotext if present
+    PdfReader = None
+
+# WordprocessingML namespace used in DOCX document.xml
+WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+def _extract_pdf(file_path: Path) -> str:
+    """Extract text from a PDF with pypdf, or poppler's pdftotext if installed."""
+    if PdfReader is not None:
+        reader = PdfReader(str(file_path))
+        return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+    pdftotext = shutil.which("pdftotext")
+    if pdftotext:
+        result = subprocess.run(
+            [pdftotext, "-q", str(file_path), "-"],
+            check=True,
+            capture_output=True,
+            timeout=60
+        )
+        return result.stdout.decode("utf-8", errors="ignore")
+
+    return ""
+
+
+def _extract_docx(file_path: Path) -> str:
+    """Extract paragraph text from a DOCX file's main document part."""
+    with zipfile.ZipFile(file_path) as archive:
+        with archive.open("word/document.xml") as document_xml:
+            tree = ElementTree.parse(document_xml)
+
+    paragraphs = []
+    for paragraph in tree.iter(f"{WORD_NAMESPACE}p"):
+        text = "".join(node.text or "" for node in paragraph.iter(f"{WORD_NAMESPACE}t"))
+        if text:
+            paragraphs.append(text)
+    return "\n".join(paragraphs)
+
+
+def _extract_xlsx(file_path: Path) -> str:
+    """Extract cell values from every sheet of an XLSX workbook."""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        lines = []
+        for sheet in workbook.worksheets:
+            for row in sheet.iter_rows(values_only=True):
+                values = [str(value) for value in row if value is not None]
+                if values:
+                    lines.append(" ".join(values))
+        return "\n".join(lines)
+    finally:
+        workbook.close()
+
+
+EXTRACTORS = {
+    "pdf": _extract_pdf,
+    "docx": _extract_docx,
+    "xlsx": _extract_xlsx
+}
+
+
+def extract_text(file_path: Path) -> Optional[str]:
+    """
+    Extract searchable text from an uploaded file.
+
+    Runs synchronously; call through schedule_text_extraction to use the worker pool.
+
+    Args:
+        file_path: Path to a plain local copy of the uploaded file
+
+    Returns:
+        Normalized text (truncated to document_text_max_chars), or None if the
+        file type is not supported or contains no text
+    """
+    extractor = EXTRACTORS.get(file_path.suffix.lstrip(".").lower())
+    if extractor is None:
+        return None
+
+    text = re.sub(r"\s+", " ", extractor(file_path)).strip()
+    return text[:settings.document_text_max_chars] or None
+
+
+async def _run_text_extraction(document_id: str, file_url: str) -> None:
+    """Extract text in the worker pool and store it for search."""
+    if file_url.rsplit(".", 1)[-1].lower() not in EXTRACTORS:
+        return
+
+    async with local_copy(get_upload_relative_path(file_url)) as file_path:
+        if file_path is None:
+            return
+        text = await run_in_pool(
+            "text-extraction", settings.text_extraction_workers, extract_text, file_path
+        )
+    if text:
+        await document_text_crud.save_document_text(document_id, text)
+        mark_record_changed("document", document_id)
+
+
+def schedule_text_extraction(document_id: str, file_url: str) -> None:
+    """
+    Queue background text extraction for an uploaded document.
+
+    Args:
+        document_id: Document ID the text belongs to
+        file_url: Relative URL of the saved file
+    """
+    spawn(_run_text_extraction(document_id, file_url), f"text extraction for {file_url}")
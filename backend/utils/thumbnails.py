@@ -0,0 +1,171 @@
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+from config import settings
+from utils.background import run_in_pool, spawn
+from utils.file_upload import get_upload_relative_path
+from utils.storage import get_storage
+from utils.storage_codec import local_copy
+
+try:
+    from PIL import Image, features
+except ImportError:  # Pillow not installed: thumbnails are skipped
+    Image = None
+    features = None
+
+# Extensions Pillow can open directly
+IMAGE_EXTENSIONS = {"jpg", "jpeg", "png"}
+
+
+def get_thumbnail_format() -> str:
+    """
+    Get the thumbnail image format, falling back to JPEG if WebP is unavailable.
+
+    Returns:
+        Pillow format name ('WEBP' or 'JPEG')
+    """
+    if settings.thumbnail_format.lower() == "webp" and features and features.check("webp"):
+        return "WEBP"
+    return "JPEG"
+
+
+def get_thumbnail_key(key: str) -> str:
+    """
+    Get the storage key of the thumbnail kept next to an uploaded file.
+
+    Args:
+        key: Storage key of the original file
+
+    Returns:
+        Thumbnail key (e.g., 'documents/abc123.thumb.webp' for 'documents/abc123.pdf')
+    """
+    extension = "webp" if get_thumbnail_format() == "WEBP" else "jpg"
+    return f"{key.rsplit('.', 1)[0]}.thumb.{extension}"
+
+
+def can_thumbnail(extension: str) -> bool:
+    """
+    Check whether thumbnails can be generated for a file type.
+
+    Args:
+        extension: File extension (lowercase, without dot)
+
+    Returns:
+        True for images, and for PDFs when a renderer is installed
+    """
+    if extension in IMAGE_EXTENSIONS:
+        return True
+    return extension == "pdf" and shutil.which("pdftoppm") is not None
+
+
+def _render_pdf_first_page(file_path: Path, output_dir: str) -> Optional[Path]:
+    """
+    Render the first page of a PDF to PNG using poppler's pdftoppm, if installed.
+
+    Args:
+        file_path: Path to the PDF
+        output_dir: Directory for the rendered page
+
+    Returns:
+        Path to the rendered PNG, or None if no renderer is available
+    """
+    pdftoppm = shutil.which("pdftoppm")
+    if not pdftoppm:
+        return None
+
+    output_prefix = Path(output_dir) / "page"
+    subprocess.run(
+        [
+            pdftoppm, "-f", "1", "-l", "1", "-singlefile", "-png",
+            "-scale-to", str(settings.thumbnail_max_size * 2),
+            str(file_path), str(output_prefix)
+        ],
+        check=True,
+        capture_output=True,
+        timeout=30
+    )
+    rendered = output_prefix.with_suffix(".png")
+    return rendered if rendered.exists() else None
+
+
+def generate_thumbnail(file_path: Path, thumbnail_path: Path) -> bool:
+    """
+    Generate a small thumbnail for an image or the first page of a PDF.
+
+    Runs synchronously; call through schedule_thumbnail to use the worker pool.
+
+    Args:
+        file_path: Path to a plain local copy of the original file
+        thumbnail_path: Path to write the thumbnail to
+
+    Returns:
+        True if a thumbnail was written, False if the type is not supported
+    """
+    if Image is None:
+        return False
+
+    extension = file_path.suffix.lstrip(".").lower()
+    max_size = (settings.thumbnail_max_size, settings.thumbnail_max_size)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        if extension in IMAGE_EXTENSIONS:
+            source = file_path
+        elif extension == "pdf":
+            source = _render_pdf_first_page(file_path, tmpdir)
+        else:
+            source = None
+
+        if source is None:
+            return False
+
+        with Image.open(source) as image:
+            # Let the JPEG decoder downscale while decoding
+            image.draft("RGB", max_size)
+            image.thumbnail(max_size)
+            if image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            image.save(thumbnail_path, format=get_thumbnail_format(), quality=settings.thumbnail_quality)
+
+    return True
+
+
+async def _run_thumbnail(file_url: str, on_ready: Callable[[str], Awaitable[object]]) -> None:
+    """Generate a thumbnail in the worker pool, store it and report its URL."""
+    key = get_upload_relative_path(file_url)
+    thumbnail_key = get_thumbnail_key(key)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        thumbnail_path = Path(tmpdir) / thumbnail_key.rsplit("/", 1)[-1]
+        async with local_copy(key) as file_path:
+            if file_path is None:
+                return
+            created = await run_in_pool(
+                "thumbnail", settings.thumbnail_workers, generate_thumbnail, file_path, thumbnail_path
+            )
+        if not created:
+            return
+        await get_storage().put_file(thumbnail_key, thumbnail_path)
+
+    await on_ready(f"/uploads/{thumbnail_key}")
+
+
+def schedule_thumbnail(file_url: str, on_ready: Callable[[str], Awaitable[object]]) -> None:
+    """
+    Queue background thumbnail generation for a saved upload.
+
+    Args:
+        file_url: Relative URL of the saved file
+        on_ready: Coroutine function called with the thumbnail URL once written
+    """
+    if Image is None:
+        return
+
+    # Skip fetching files (possibly from S3) that can never get a thumbnail
+    extension = file_url.rsplit(".", 1)[-1].lower() if "." in file_url else ""
+    if not can_thumbnail(extension):
+        return
+
+    spawn(_run_thumbnail(file_url, on_ready), f"thumbnail for {file_url}")
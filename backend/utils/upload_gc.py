@@ -0,0 +1,282 @@
+"""
+Orphaned upload garbage collector.
+
+Reclaims stored uploads that no database record references: files
+left behind by failed creates, abandoned resumable uploads and (optionally)
+files of records archived longer than the retention window.
+
+Run a one-off report with:
+    python -m utils.upload_gc --dry-run
+"""
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+import database as db_module
+from config import settings
+from utils.background import run_in_pool
+from utils.file_upload import get_upload_relative_path
+from utils.storage import get_storage
+from utils.storage_codec import strip_codec_suffix
+
+logger = logging.getLogger(__name__)
+
+# (collection, URL fields) pairs that can reference uploaded files
+REFERENCE_FIELDS = [
+    ("documents", ["fileUrl", "thumbnailUrl"]),
+    ("proposals", ["fileUrl", "thumbnailUrl"]),
+    ("expenses", ["receiptUrl"])
+]
+
+# Collections with soft delete, where archived records may release their files
+ARCHIVABLE_COLLECTIONS = {"documents", "proposals"}
+
+# Tags of files derived from an upload and kept next to it
+SIDECAR_TAGS = {"thumb", "orig"}
+
+# Number of orphan paths listed in a report
+REPORT_SAMPLE_SIZE = 100
+
+
+async def collect_referenced_paths() -> set[str]:
+    """
+    Build the set of upload paths referenced by database records.
+
+    Includes files of upload sessions that were stored but are still
+    waiting for their record, so a retried finalize can use them. Uses
+    projection-only cursors so only URL fields are transferred.
+
+    Returns:
+        Set of storage keys (e.g., 'documents/abc123.pdf')
+    """
+    referenced: set[str] = set()
+    archived_cutoff = None
+    if settings.upload_gc_archived_retention_days > 0:
+        archived_cutoff = datetime.utcnow() - timedelta(days=settings.upload_gc_archived_retention_days)
+
+    for collection_name, fields in REFERENCE_FIELDS:
+        query = {}
+        if archived_cutoff and collection_name in ARCHIVABLE_COLLECTIONS:
+            query["$or"] = [
+                {"archivedAt": None},
+                {"archivedAt": {"$gt": archived_cutoff}}
+            ]
+
+        projection = {field: 1 for field in fields}
+        projection["_id"] = 0
+
+        cursor = db_module.database[collection_name].find(query, projection).batch_size(1000)
+        async for doc in cursor:
+            for field in fields:
+                url = doc.get(field)
+                if url and url.startswith("/uploads/"):
+                    referenced.add(get_upload_relative_path(url))
+
+    # Files of unexpired sessions whose record creation failed are kept for a retried finalize
+    cursor = db_module.database.upload_sessions.find(
+        {
+            "status": {"$in": ["stored", "finalizing"]},
+            "fileUrl": {"$ne": None},
+            "expiresAt": {"$gt": datetime.utcnow()}
+        },
+        {"fileUrl": 1, "_id": 0}
+    )
+    async for doc in cursor:
+        referenced.add(get_upload_relative_path(doc["fileUrl"]))
+
+    return referenced
+
+
+async def collect_active_upload_sessions() -> set[str]:
+    """
+    Get IDs of resumable upload sessions that are still open and unexpired.
+
+    Returns:
+        Set of upload session IDs whose staging files must be kept
+    """
+    cursor = db_module.database.upload_sessions.find(
+        {"status": "open", "expiresAt": {"$gt": datetime.utcnow()}},
+        {"_id": 1}
+    )
+    return {str(doc["_id"]) async for doc in cursor}
+
+
+def get_sidecar_owner(relative_path: str) -> Optional[str]:
+    """
+    Get the stem of the file a derived sidecar belongs to.
+
+    Sidecars (thumbnails, kept receipt originals) are named
+    '<stem>.<tag>.<ext>' next to the file they were derived from.
+
+    Args:
+        relative_path: Storage key
+
+    Returns:
+        '<dir>/<stem>' of the owning file, or None if not a sidecar
+    """
+    parts = relative_path.rsplit(".", 2)
+    if len(parts) == 3 and parts[1] in SIDECAR_TAGS:
+        return parts[0]
+    return None
+
+
+def _record_orphan(report: dict, name: str, size: int) -> None:
+    """Count an orphaned file in a sweep report."""
+    report["orphanedFiles"] += 1
+    report["orphanedBytes"] += size
+    if len(report["orphans"]) < REPORT_SAMPLE_SIZE:
+        report["orphans"].append(name)
+
+
+def sweep_staging_dir(active_sessions: set[str], cutoff: float, dry_run: bool, report: dict) -> None:
+    """
+    Reclaim staging files of resumable uploads that are no longer open.
+
+    Args:
+        active_sessions: IDs of open upload sessions
+        cutoff: Files modified after this Unix timestamp are kept
+        dry_run: Report orphans without deleting them
+        report: Sweep report to update
+    """
+    staging_dir = Path(settings.upload_staging_dir)
+    try:
+        entries = list(os.scandir(staging_dir))
+    except FileNotFoundError:
+        return
+
+    for entry in entries:
+        if not entry.is_file(follow_symlinks=False):
+            continue
+        report["scannedFiles"] += 1
+
+        if Path(entry.name).stem in active_sessions:
+            report["referencedFiles"] += 1
+            continue
+
+        stat = entry.stat(follow_symlinks=False)
+        if stat.st_mtime > cutoff:
+            report["recentFiles"] += 1
+            continue
+
+        _record_orphan(report, f"{staging_dir.name}/{entry.name}", stat.st_size)
+        if not dry_run:
+            try:
+                os.unlink(entry.path)
+            except FileNotFoundError:
+                pass
+
+
+async def sweep_upload_tree(
+    referenced: set[str],
+    active_sessions: set[str],
+    dry_run: bool
+) -> dict:
+    """
+    List the storage backend and reclaim files no record references.
+
+    Files modified within the grace period are always kept so uploads whose
+    database record is still being created are not removed.
+
+    Args:
+        referenced: Referenced storage keys
+        active_sessions: IDs of open upload sessions
+        dry_run: Report orphans without deleting them
+
+    Returns:
+        Report dict with counts, reclaimable bytes and a sample of orphan keys
+    """
+    storage = get_storage()
+    referenced_stems = {key.rsplit(".", 1)[0] for key in referenced}
+    cutoff = time.time() - settings.upload_gc_grace_period
+
+    report = {
+        "dryRun": dry_run,
+        "scannedFiles": 0,
+        "referencedFiles": 0,
+        "recentFiles": 0,
+        "orphanedFiles": 0,
+        "orphanedBytes": 0,
+        "removedDirectories": 0,
+        "orphans": []
+    }
+
+    await run_in_pool("upload-gc", 1, sweep_staging_dir, active_sessions, cutoff, dry_run, report)
+
+    async for stored in storage.list():
+        report["scannedFiles"] += 1
+
+        key = strip_codec_suffix(stored.key)
+        if key in referenced or get_sidecar_owner(key) in referenced_stems:
+            report["referencedFiles"] += 1
+            continue
+
+        if stored.modified > cutoff:
+            report["recentFiles"] += 1
+            continue
+
+        _record_orphan(report, stored.key, stored.size)
+        if not dry_run:
+            await storage.delete(stored.key)
+
+    report["removedDirectories"] = await storage.compact(dry_run)
+    return report
+
+
+async def collect_orphaned_uploads(dry_run: bool = False) -> dict:
+    """
+    Run one garbage collection pass over stored uploads.
+
+    Args:
+        dry_run: Report orphans without deleting them
+
+    Returns:
+        Report dict (see sweep_upload_tree)
+
+    Raises:
+        RuntimeError: If database is not connected
+    """
+    if db_module.database is None:
+        raise RuntimeError("Database connection not established")
+
+    referenced = await collect_referenced_paths()
+    active_sessions = await collect_active_upload_sessions()
+
+    report = await sweep_upload_tree(referenced, active_sessions, dry_run)
+    logger.info(
+        f"Upload GC {'(dry run) ' if dry_run else ''}scanned {report['scannedFiles']} files, "
+        f"{report['orphanedFiles']} orphaned ({report['orphanedBytes']} bytes)"
+    )
+    return report
+
+
+async def run_upload_gc_periodically() -> None:
+    """Run collect_orphaned_uploads every upload_gc_interval seconds."""
+    while True:
+        await asyncio.sleep(settings.upload_gc_interval)
+        try:
+            await collect_orphaned_uploads()
+        except Exception as e:
+            logger.warning(f"Upload GC failed: {e}")
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Reclaim orphaned uploaded files")
+    parser.add_argument("--dry-run", action="store_true", help="Report orphans without deleting them")
+    args = parser.parse_args()
+
+    async def _main():
+        await db_module.connect_to_mongo()
+        try:
+            print(json.dumps(await collect_orphaned_uploads(dry_run=args.dry_run), indent=2))
+        finally:
+            await db_module.close_mongo_connection()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main())
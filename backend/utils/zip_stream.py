@@ -0,0 +1,83 @@
+import io
+import re
+import zipfile
+from datetime import datetime
+from typing import AsyncIterator, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from utils.storage import StoredObject
+from utils.storage_codec import iter_original
+
+# Formats that are already compressed; deflating them again only costs CPU
+STORED_EXTENSIONS = {"jpg", "jpeg", "png", "webp", "docx", "xlsx", "zip", "gz", "zst"}
+
+
+class _ZipOutputBuffer(io.RawIOBase):
+    """Unseekable sink that collects zip output until it is drained."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def safe_archive_name(name: str) -> str:
+    """
+    Make a string safe to use as a zip entry name component.
+
+    Args:
+        name: Raw name (e.g., vendor name)
+
+    Returns:
+        Name with path separators and unusual characters replaced
+    """
+    return re.sub(r"[^A-Za-z0-9._ -]+", "_", name).strip(" .") or "file"
+
+
+async def iter_zip(entries: list[tuple[str, StoredObject, Optional[str]]]) -> AsyncIterator[bytes]:
+    """
+    Stream a zip archive built on the fly from stored files.
+
+    Entries are written with data descriptors, so no temp file or seeking is
+    needed and at most one read chunk per file is held in memory. Chunks
+    are compressed in the threadpool.
+
+    Args:
+        entries: List of (archive name, stored object, codec) tuples
+
+    Yields:
+        Chunks of the zip archive
+    """
+    buffer = _ZipOutputBuffer()
+    with zipfile.ZipFile(buffer, mode="w", allowZip64=True) as archive:
+        for arcname, stored, codec in entries:
+            info = zipfile.ZipInfo(arcname, date_time=datetime.fromtimestamp(stored.modified).timetuple()[:6])
+            extension = arcname.rsplit(".", 1)[-1].lower() if "." in arcname else ""
+            info.compress_type = zipfile.ZIP_STORED if extension in STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+
+            with archive.open(info, mode="w") as entry:
+                async for chunk in iter_original(stored, codec):
+                    # Deflating is CPU-bound; keep it off the event loop
+                    await run_in_threadpool(entry.write, chunk)
+                    data = buffer.drain()
+                    if data:
+                        yield data
+
+            data = buffer.drain()
+            if data:
+                yield data
+
+    data = buffer.drain()
+    if data:
+        yield data